@@ -3,7 +3,7 @@ AI Interview Agents using Autogen framework
 """
 from autogen_agentchat.agents import AssistantAgent
 from autogen_ext.models.openai import OpenAIChatCompletionClient
-from typing import Dict, List, Tuple
+from typing import Dict, List, Optional, Tuple
 import os
 from dotenv import load_dotenv
 
@@ -34,6 +34,10 @@ class InterviewAgents:
         self.scores = []
         self.feedbacks = []
         
+        # Bumped whenever an answer is recorded; the summary is cached per version
+        self.history_version = 0
+        self.summary_cache: Optional[Tuple[int, str]] = None
+        
         self._setup_agents()
     
     def _setup_agents(self):
@@ -237,6 +241,7 @@ Please evaluate and score this answer."""
         self.interview_history.append(qa_record)
         self.scores.append(score)
         self.feedbacks.append(feedback)
+        self.history_version += 1
         
         return qa_record
     
@@ -244,6 +249,9 @@ Please evaluate and score this answer."""
         """
         Get overall interview summary
         
+        The assessment is generated once per history version, so Streamlit
+        reruns of the summary page cost no model calls.
+        
         Returns:
             Dictionary with overall statistics and summary
         """
@@ -259,6 +267,9 @@ Please evaluate and score this answer."""
         
         avg_score = sum(self.scores) / len(self.scores)
         
+        if self.summary_cache and self.summary_cache[0] == self.history_version:
+            return self._summary_result(avg_score, self.summary_cache[1])
+        
         summary_prompt = f"""
 Based on this interview for {self.position} position on {self.technology}:
 - Total questions: {len(self.scores)}
@@ -275,7 +286,11 @@ Include strengths and areas for improvement."""
         )
         
         overall_feedback = response.chat_message.content
+        self.summary_cache = (self.history_version, overall_feedback)
         
+        return self._summary_result(avg_score, overall_feedback)
+    
+    def _summary_result(self, avg_score: float, overall_feedback: str) -> Dict:
         return {
             'average_score': round(avg_score, 2),
             'total_questions': len(self.scores),
@@ -1,51 +1,231 @@
 """
 AI Interview Agents using Autogen framework
 """
-from autogen_agentchat.agents import AssistantAgent
-from autogen_ext.models.openai import OpenAIChatCompletionClient
-from typing import Dict, List, Tuple
+from types import SimpleNamespace
+from typing import TYPE_CHECKING, Callable, Dict, List, Optional, Tuple
+import asyncio
+import json
 import os
+import random
+import time
 from dotenv import load_dotenv
 
+from app.config import Config
+from app.services.admission import UpstreamOverloaded, admission
+from app.services.llm_pool import llm_pool
+from app.services.metrics import (
+    evaluation_fallbacks, llm_calls, llm_failures, llm_request_duration, llm_retries,
+    llm_time_to_first_token, llm_timeouts, summary_cache_hits,
+)
+from app.services.token_budget import TokenUsage, estimate_tokens, truncate_to_tokens
+
+if TYPE_CHECKING:
+    from autogen_agentchat.agents import AssistantAgent
+
 load_dotenv()
 
+# Receives (agent_name, text_delta) for every streamed model token
+TokenCallback = Callable[[str, str], None]
+
+# Upstream failures worth another attempt; anything else fails immediately.
+# The openai errors are added by load_autogen().
+RETRYABLE_ERRORS: tuple = (asyncio.TimeoutError,)
+
+_autogen: Optional[SimpleNamespace] = None
+
+
+def load_autogen() -> SimpleNamespace:
+    """
+    Import autogen and openai on first use
+    
+    They account for most of the backend's import time, so they are loaded
+    when the first agents are built (or by the startup warmup) rather than
+    when the app boots.
+    """
+    global _autogen, RETRYABLE_ERRORS
+    if _autogen is None:
+        import openai
+        from autogen_agentchat.agents import AssistantAgent
+        from autogen_agentchat.base import Response
+        from autogen_agentchat.messages import ModelClientStreamingChunkEvent, TextMessage
+        from autogen_core import CancellationToken
+        
+        RETRYABLE_ERRORS = (
+            asyncio.TimeoutError,
+            openai.APITimeoutError,
+            openai.APIConnectionError,
+            openai.RateLimitError,
+            openai.InternalServerError,
+        )
+        _autogen = SimpleNamespace(
+            AssistantAgent=AssistantAgent,
+            CancellationToken=CancellationToken,
+            ModelClientStreamingChunkEvent=ModelClientStreamingChunkEvent,
+            Response=Response,
+            TextMessage=TextMessage,
+        )
+    return _autogen
+
+
+class AgentTimeoutError(TimeoutError):
+    """An agent call ran out of its time budget"""
+
+
+class EvaluationFormatError(ValueError):
+    """The combined evaluator's reply wasn't the JSON object we asked for"""
+
+
+# Keys the combined evaluator must return
+EVALUATION_FIELDS = ('strengths', 'improvements', 'ideal_answer_approach', 'score', 'justification')
+
+
+class AgentCallStats:
+    """Per-role view of the agent call counters kept in the metrics registry"""
+
+    COUNTERS = {
+        'calls': llm_calls,
+        'retries': llm_retries,
+        'timeouts': llm_timeouts,
+        'failures': llm_failures,
+    }
+
+    def incr(self, role: str, field: str, n: int = 1):
+        self.COUNTERS[field].inc(n, agent=role)
+
+    def stats(self) -> Dict:
+        """Counters and mean latency for this worker, keyed by agent role"""
+        roles = sorted({labels[0] for counter in self.COUNTERS.values() for labels, _ in counter.samples()})
+        stats = {
+            role: {field: counter.value(agent=role) for field, counter in self.COUNTERS.items()}
+            for role in roles
+        }
+        # Successful calls only, per model, so a role's models can be compared
+        for (role, model, outcome), buckets in llm_request_duration.samples():
+            if outcome == 'ok' and role in stats:
+                count = sum(buckets[:-1])
+                stats[role].setdefault('mean_latency_ms', {})[model] = round(buckets[-1] / count * 1000, 1)
+        return stats
+
+    def reset(self):
+        for counter in self.COUNTERS.values():
+            counter.reset()
+
+
+# Global counters (one set per worker process)
+agent_call_stats = AgentCallStats()
+
+
+class QARecord:
+    """One evaluated answer in an interview's history"""
+
+    FIELDS = (
+        'question_number', 'question', 'answer', 'feedback',
+        'feedback_available', 'score', 'score_details', 'score_available'
+    )
+    __slots__ = FIELDS
+
+    def __init__(self, question_number: int, question: str, answer: str, feedback: str,
+                 feedback_available: bool, score: Optional[int], score_details: str, score_available: bool):
+        self.question_number = question_number
+        self.question = question
+        self.answer = answer
+        self.feedback = feedback
+        self.feedback_available = feedback_available
+        self.score = score
+        self.score_details = score_details
+        self.score_available = score_available
+
+    @classmethod
+    def from_dict(cls, item: Dict) -> 'QARecord':
+        # Records saved before availability flags existed are complete answers
+        return cls(item['question_number'], item['question'], item['answer'], item['feedback'],
+                   item.get('feedback_available', True), item.get('score'), item.get('score_details', ''),
+                   item.get('score_available', True))
+
+    def to_dict(self) -> Dict:
+        return {field: getattr(self, field) for field in self.FIELDS}
+
+    def to_row(self) -> List:
+        """Compact form for session stores, in FIELDS order"""
+        return [getattr(self, field) for field in self.FIELDS]
+
 
 class InterviewAgents:
     """Manages all AI agents for the interview process"""
     
-    def __init__(self, technology: str, position: str):
+    def __init__(self, technology: str, position: str, concurrent_evaluation: Optional[bool] = None,
+                 evaluation_mode: Optional[str] = None):
         self.technology = technology
         self.position = position
-        
-        # Create model client for OpenRouter with Mistral AI
-        self.model_client = OpenAIChatCompletionClient(
-            model=os.getenv("MODEL", "mistralai/mistral-small-creative"),
-            api_key=os.getenv("OPENROUTER_API_KEY"),
-            base_url=os.getenv("OPENROUTER_BASE_URL", "https://openrouter.ai/api/v1"),
-            model_info={
-                "vision": False,
-                "function_calling": True,
-                "json_output": True,
-                "structured_output": False,
-                "family": "unknown",
-            }
+        self.concurrent_evaluation = (
+            Config.CONCURRENT_EVALUATION if concurrent_evaluation is None else concurrent_evaluation
         )
+        # 'separate': Coach + Scorer calls; 'combined': one Evaluator call returning JSON
+        self.evaluation_mode = evaluation_mode or Config.EVALUATION_MODE
         
-        self.interview_history = []
-        self.scores = []
-        self.feedbacks = []
+        # Model used by each agent, for metrics (agent name -> model)
+        self.agent_models: Dict[str, str] = {}
         
-        self._setup_agents()
+        # The single source of truth for answers, plus running score aggregates
+        self.interview_history: List[QARecord] = []
+        self.score_total = 0
+        self.scored_count = 0
+        self.usage = TokenUsage()
+        
+        # (history_version, text) of the last overall assessment
+        self.summary_cache: Optional[Tuple[int, str]] = None
+        
+        # The AssistantAgents are built by _setup_agents on first use (see __getattr__)
+    
+    # Attributes created by _setup_agents
+    LAZY_ATTRIBUTES = ('interviewer', 'coach', 'scorer', 'summarizer', 'evaluator', 'system_prompts',
+                       '_system_tokens')
+    
+    def __getattr__(self, name: str):
+        # Only reached while an attribute is missing, i.e. before the agents exist
+        if name in InterviewAgents.LAZY_ATTRIBUTES:
+            self._setup_agents()
+            return self.__dict__[name]
+        raise AttributeError(f"{type(self).__name__!r} object has no attribute {name!r}")
+    
+    @property
+    def history_version(self) -> int:
+        """Grows with every recorded answer; the summary is cached per version"""
+        return len(self.interview_history)
+    
+    @property
+    def scores(self) -> List[int]:
+        return [item.score for item in self.interview_history if item.score_available]
+    
+    @property
+    def feedbacks(self) -> List[str]:
+        return [item.feedback for item in self.interview_history]
+    
+    @property
+    def average_score(self) -> float:
+        return self.score_total / self.scored_count if self.scored_count else 0
+    
+    def _client_for(self, role: str, agent_name: str):
+        """Borrow the worker's shared model client configured for a role"""
+        settings = Config.ROLE_MODELS[role]
+        self.agent_models[agent_name] = settings['model']
+        return llm_pool.get_client(
+            model=settings['model'],
+            base_url=os.getenv("OPENROUTER_BASE_URL", "https://openrouter.ai/api/v1"),
+            api_key=os.getenv("OPENROUTER_API_KEY"),
+            temperature=settings['temperature'],
+            max_tokens=settings['max_tokens'],
+        )
     
     def _setup_agents(self):
         """Initialize all agents with their specific roles"""
+        AssistantAgent = load_autogen().AssistantAgent
+        
+        # System prompt of each agent, by name (also used to count prompt tokens)
+        self.system_prompts: Dict[str, str] = {}
         
         # 1. Interviewer Agent - Asks questions
-        self.interviewer = AssistantAgent(
-            name="Interviewer",
-            model_client=self.model_client,
-            description=f"Technical interviewer for {self.position} position focusing on {self.technology}",
-            system_message=f"""You are an experienced technical interviewer conducting an interview for a {self.position} position focusing on {self.technology}.
+        self.system_prompts["Interviewer"] = f"""You are an experienced technical interviewer conducting an interview for a {self.position} position focusing on {self.technology}.
 
 Your responsibilities:
 - Ask ONE relevant technical question at a time
@@ -57,15 +237,17 @@ Your responsibilities:
 
 IMPORTANT: Only ask ONE question per response. Wait for the answer before asking the next question.
 Do not provide answers or hints. Just ask the question and wait.
-Format: Simply state the question without extra commentary.""",
+Format: Simply state the question without extra commentary."""
+        self.interviewer = AssistantAgent(
+            name="Interviewer",
+            model_client=self._client_for('interviewer', "Interviewer"),
+            model_client_stream=True,
+            description=f"Technical interviewer for {self.position} position focusing on {self.technology}",
+            system_message=self.system_prompts["Interviewer"],
         )
         
         # 3. Coach Agent - Provides feedback on answers
-        self.coach = AssistantAgent(
-            name="Coach",
-            model_client=self.model_client,
-            description=f"Expert interview coach for {self.technology} and {self.position}",
-            system_message=f"""You are an expert interview coach specializing in {self.technology} and {self.position} roles.
+        self.system_prompts["Coach"] = f"""You are an expert interview coach specializing in {self.technology} and {self.position} roles.
 
 Your responsibilities:
 - Analyze the candidate's answer to each interview question
@@ -80,15 +262,18 @@ STRENGTHS: [What was good about the answer]
 IMPROVEMENTS: [What could be better]
 IDEAL ANSWER APPROACH: [How to structure a better response]
 
-Keep feedback concise but actionable.""",
+Keep feedback concise but actionable."""
+        
+        self.coach = AssistantAgent(
+            name="Coach",
+            model_client=self._client_for('coach', "Coach"),
+            model_client_stream=True,
+            description=f"Expert interview coach for {self.technology} and {self.position}",
+            system_message=self.system_prompts["Coach"],
         )
         
         # 4. Scorer Agent - Scores each answer
-        self.scorer = AssistantAgent(
-            name="Scorer",
-            model_client=self.model_client,
-            description=f"Objective evaluator for {self.position} interviews",
-            system_message=f"""You are an objective evaluator for {self.position} interviews focused on {self.technology}.
+        self.system_prompts["Scorer"] = f"""You are an objective evaluator for {self.position} interviews focused on {self.technology}.
 
 Your responsibilities:
 - Score each answer on a scale of 0-10
@@ -100,55 +285,218 @@ Format your response as:
 SCORE: [X/10]
 JUSTIFICATION: [Brief explanation of the score]
 
-Be consistent in your scoring criteria.""",
+Be consistent in your scoring criteria."""
+        self.scorer = AssistantAgent(
+            name="Scorer",
+            model_client=self._client_for('scorer', "Scorer"),
+            model_client_stream=True,
+            description=f"Objective evaluator for {self.position} interviews",
+            system_message=self.system_prompts["Scorer"],
         )
+        
+        # Summary Agent - the Coach, unless the summary role is routed to different model settings
+        self.summarizer = self.coach
+        if Config.ROLE_MODELS['summary'] != Config.ROLE_MODELS['coach']:
+            self.system_prompts["Summarizer"] = self.system_prompts["Coach"]
+            self.summarizer = AssistantAgent(
+                name="Summarizer",
+                model_client=self._client_for('summary', "Summarizer"),
+                model_client_stream=True,
+                description=f"Writes the overall assessment for {self.position} interviews",
+                system_message=self.system_prompts["Summarizer"],
+            )
+        
+        # 5. Evaluator Agent - Feedback and score in one structured reply (combined mode)
+        self.evaluator = None
+        if self.evaluation_mode == 'combined':
+            self.system_prompts["Evaluator"] = f"""You are an expert interview coach and objective evaluator for {self.position} interviews focused on {self.technology}.
+
+For each answer:
+- Identify strengths and areas for improvement, and describe how a strong answer would be structured
+- Score the answer from 0 to 10 considering accuracy, completeness, depth, clarity, and practical understanding
+- Be constructive, fair, and consistent, with standards appropriate for {self.position}
+
+Respond with ONLY a JSON object, no other text, in exactly this form:
+{{"strengths": "...", "improvements": "...", "ideal_answer_approach": "...", "score": <integer 0-10>, "justification": "..."}}"""
+            self.evaluator = AssistantAgent(
+                name="Evaluator",
+                model_client=self._client_for('evaluator', "Evaluator"),
+                model_client_stream=True,
+                description=f"Interview coach and evaluator for {self.position} interviews",
+                system_message=self.system_prompts["Evaluator"],
+            )
+        
+        # System prompts are sent with every call; count them once for budget checks
+        self._system_tokens = {name: estimate_tokens(prompt) for name, prompt in self.system_prompts.items()}
+    
+    @staticmethod
+    def _attempt_timeout(agent: 'AssistantAgent') -> float:
+        """Per-attempt deadline for an agent's role"""
+        return {
+            'Interviewer': Config.INTERVIEWER_TIMEOUT,
+            'Coach': Config.COACH_TIMEOUT,
+            'Scorer': Config.SCORER_TIMEOUT,
+            'Evaluator': Config.COACH_TIMEOUT,
+            'Summarizer': Config.COACH_TIMEOUT,
+        }.get(agent.name, Config.AGENT_TIMEOUT)
+    
+    @staticmethod
+    def _backoff_delay(attempt: int) -> float:
+        """Exponential backoff with full jitter for the given retry number (1-based)"""
+        ceiling = min(Config.AGENT_RETRY_MAX_DELAY, Config.AGENT_RETRY_BASE_DELAY * 2 ** (attempt - 1))
+        return random.uniform(0, ceiling)
     
-    async def get_next_question(self, question_number: int) -> str:
+    def _estimate_prompt_tokens(self, agent: 'AssistantAgent', prompt: str) -> int:
+        return self._system_tokens.get(agent.name, 0) + estimate_tokens(prompt)
+    
+    async def _ask_once(self, agent: 'AssistantAgent', prompt: str, role: str, cancellation_token,
+                        on_token: Optional[TokenCallback], streamed: list) -> str:
+        """Run one attempt of a prompt, streaming tokens as they arrive"""
+        autogen = load_autogen()
+        
+        started = time.perf_counter()
+        await agent.on_reset(cancellation_token)
+        async for event in agent.on_messages_stream(
+            [autogen.TextMessage(content=prompt, source="user")],
+            cancellation_token
+        ):
+            if isinstance(event, autogen.ModelClientStreamingChunkEvent):
+                if not streamed[0]:
+                    llm_time_to_first_token.observe(time.perf_counter() - started, agent=role,
+                                                    model=self.agent_models.get(agent.name, ''))
+                streamed[0] = True
+                if on_token:
+                    on_token(agent.name, event.content)
+            elif isinstance(event, autogen.Response):
+                reply = event.chat_message.content
+                usage = event.chat_message.models_usage
+                if usage and usage.prompt_tokens + usage.completion_tokens:
+                    self.usage.record(role, usage.prompt_tokens, usage.completion_tokens)
+                else:
+                    self.usage.record(role, self._estimate_prompt_tokens(agent, prompt),
+                                      estimate_tokens(reply), estimated=True)
+                return reply
+        
+        raise RuntimeError(f"{agent.name} returned no response")
+    
+    async def _ask(self, agent: 'AssistantAgent', prompt: str, on_token: Optional[TokenCallback] = None,
+                   role: Optional[str] = None) -> str:
+        """
+        Send a single prompt to a fresh agent conversation
+        
+        The call is refused up front if it would break the session's token
+        budgets, then waits for an upstream slot from the admission
+        controller (UpstreamOverloaded if none frees up). Each attempt
+        gets the role's deadline; when it passes, the in-flight completion
+        is cancelled. Retryable upstream errors are retried with
+        jittered exponential backoff while the overall AGENT_TIMEOUT budget
+        lasts. An attempt that already streamed tokens is not retried, since
+        the client has seen part of that reply.
+        
+        Args:
+            agent: The agent to ask
+            prompt: The user prompt
+            on_token: Optional callback invoked with (agent name, delta) as tokens arrive
+            role: Label for metrics and counters (defaults to the agent's name)
+            
+        Returns:
+            The agent's complete reply
+        """
+        role = role or agent.name.lower()
+        self.usage.check(role, self._estimate_prompt_tokens(agent, prompt))
+        
+        # The slot is held through retries, so backoff eases the load on the provider
+        async with admission.slot():
+            started = time.perf_counter()
+            outcome = 'error'
+            try:
+                reply = await self._ask_with_retries(agent, prompt, role, on_token)
+                outcome = 'ok'
+                return reply
+            except AgentTimeoutError:
+                outcome = 'timeout'
+                raise
+            finally:
+                llm_request_duration.observe(time.perf_counter() - started, agent=role,
+                                             model=self.agent_models.get(agent.name, ''), outcome=outcome)
+    
+    async def _ask_with_retries(self, agent: 'AssistantAgent', prompt: str, role: str,
+                                on_token: Optional[TokenCallback]) -> str:
+        """Attempt loop behind _ask: per-attempt deadline, backoff, overall budget"""
+        CancellationToken = load_autogen().CancellationToken
+        
+        deadline = time.monotonic() + Config.AGENT_TIMEOUT
+        attempt = 0
+        agent_call_stats.incr(role, 'calls')
+        
+        while True:
+            remaining = deadline - time.monotonic()
+            cancellation_token = CancellationToken()
+            streamed = [False]
+            try:
+                return await asyncio.wait_for(
+                    self._ask_once(agent, prompt, role, cancellation_token, on_token, streamed),
+                    timeout=min(self._attempt_timeout(agent), remaining)
+                )
+            except RETRYABLE_ERRORS as e:
+                cancellation_token.cancel()
+                timed_out = isinstance(e, asyncio.TimeoutError)
+                if timed_out:
+                    agent_call_stats.incr(role, 'timeouts')
+                
+                attempt += 1
+                delay = self._backoff_delay(attempt)
+                if (attempt > Config.AGENT_MAX_RETRIES or streamed[0]
+                        or time.monotonic() + delay >= deadline):
+                    agent_call_stats.incr(role, 'failures')
+                    if timed_out:
+                        raise AgentTimeoutError(f"{agent.name} did not respond in time") from e
+                    raise
+                
+                print(f"⚠️  {agent.name} attempt {attempt} failed ({e!r}), retrying in {delay:.2f}s")
+                agent_call_stats.incr(role, 'retries')
+                await asyncio.sleep(delay)
+            except Exception:
+                cancellation_token.cancel()
+                agent_call_stats.incr(role, 'failures')
+                raise
+    
+    async def get_next_question(self, question_number: int, on_token: Optional[TokenCallback] = None) -> str:
         """
         Get the next interview question
         
         Args:
             question_number: The current question number
+            on_token: Optional callback for streamed tokens
             
         Returns:
             The interview question as a string
         """
-        from autogen_core import CancellationToken
-        from autogen_agentchat.messages import TextMessage
-        
         context = ""
         if self.interview_history:
             context = f"\nPrevious questions and answers context (for follow-up):\n"
             for i, item in enumerate(self.interview_history[-2:], 1):  # Last 2 Q&A for context
-                context += f"Q{i}: {item['question']}\nA{i}: {item['answer'][:100]}...\n"
+                context += f"Q{i}: {item.question}\nA{i}: {item.answer[:100]}...\n"
         
         prompt = f"""This is question #{question_number} for the {self.position} position interview on {self.technology}.
 {context}
 Please ask ONE clear, relevant technical question. Just state the question directly."""
         
         # Get question from interviewer
-        await self.interviewer.on_reset(CancellationToken())
-        response = await self.interviewer.on_messages(
-            [TextMessage(content=prompt, source="user")],
-            CancellationToken()
-        )
-        
-        return response.chat_message.content
+        return await self._ask(self.interviewer, prompt, on_token)
     
-    async def get_feedback(self, question: str, answer: str) -> str:
+    async def get_feedback(self, question: str, answer: str, on_token: Optional[TokenCallback] = None) -> str:
         """
         Get coaching feedback on the answer
         
         Args:
             question: The interview question
             answer: The candidate's answer
+            on_token: Optional callback for streamed tokens
             
         Returns:
             Feedback from the coach
         """
-        from autogen_core import CancellationToken
-        from autogen_agentchat.messages import TextMessage
-        
         prompt = f"""
 Question asked: {question}
 
@@ -156,28 +504,20 @@ Candidate's answer: {answer}
 
 Please provide constructive feedback on this answer."""
         
-        await self.coach.on_reset(CancellationToken())
-        response = await self.coach.on_messages(
-            [TextMessage(content=prompt, source="user")],
-            CancellationToken()
-        )
-        
-        return response.chat_message.content
+        return await self._ask(self.coach, prompt, on_token)
     
-    async def get_score(self, question: str, answer: str) -> Tuple[int, str]:
+    async def get_score(self, question: str, answer: str, on_token: Optional[TokenCallback] = None) -> Tuple[int, str]:
         """
         Get score for the answer
         
         Args:
             question: The interview question
             answer: The candidate's answer
+            on_token: Optional callback for streamed tokens
             
         Returns:
             Tuple of (score, justification)
         """
-        from autogen_core import CancellationToken
-        from autogen_agentchat.messages import TextMessage
-        
         prompt = f"""
 Question: {question}
 
@@ -185,13 +525,7 @@ Answer: {answer}
 
 Please evaluate and score this answer."""
         
-        await self.scorer.on_reset(CancellationToken())
-        response = await self.scorer.on_messages(
-            [TextMessage(content=prompt, source="user")],
-            CancellationToken()
-        )
-        
-        score_response = response.chat_message.content
+        score_response = await self._ask(self.scorer, prompt, on_token)
         
         # Parse score from response
         score = 0
@@ -207,7 +541,100 @@ Please evaluate and score this answer."""
         
         return score, score_response
     
-    async def process_answer(self, question: str, answer: str, question_number: int) -> Dict:
+    @staticmethod
+    def parse_evaluation(reply: str) -> Dict:
+        """
+        Parse and validate the combined evaluator's JSON reply
+        
+        Raises:
+            EvaluationFormatError: If the reply isn't a complete evaluation
+        """
+        start, end = reply.find('{'), reply.rfind('}')
+        if start < 0 or end < start:
+            raise EvaluationFormatError("Evaluator reply contains no JSON object")
+        try:
+            data = json.loads(reply[start:end + 1])
+        except ValueError as e:
+            raise EvaluationFormatError(f"Evaluator reply is not valid JSON: {e}") from e
+        
+        missing = [field for field in EVALUATION_FIELDS if field not in data]
+        if missing:
+            raise EvaluationFormatError(f"Evaluator reply is missing {', '.join(missing)}")
+        try:
+            score = int(round(float(data['score'])))
+        except (TypeError, ValueError) as e:
+            raise EvaluationFormatError(f"Evaluator score is not a number: {data['score']!r}") from e
+        if not 0 <= score <= 10:
+            raise EvaluationFormatError(f"Evaluator score out of range: {score}")
+        
+        def text(value) -> str:
+            return '; '.join(map(str, value)) if isinstance(value, list) else str(value).strip()
+        
+        evaluation = {field: text(data[field]) for field in EVALUATION_FIELDS if field != 'score'}
+        evaluation['score'] = score
+        return evaluation
+    
+    async def get_evaluation(self, question: str, answer: str,
+                             on_token: Optional[TokenCallback] = None) -> Tuple[str, int, str]:
+        """
+        Get feedback and score from a single Evaluator call
+        
+        Args:
+            question: The interview question
+            answer: The candidate's answer
+            on_token: Optional callback; receives the formatted feedback and
+                score once the JSON reply has been validated
+            
+        Returns:
+            Tuple of (feedback, score, score details), formatted like the
+            Coach and Scorer replies
+        """
+        prompt = f"""
+Question: {question}
+
+Candidate's answer: {answer}
+
+Evaluate this answer and reply with the JSON object."""
+        
+        # Raw JSON tokens aren't useful to stream; send the formatted text instead
+        evaluation = self.parse_evaluation(await self._ask(self.evaluator, prompt))
+        
+        feedback = (
+            f"STRENGTHS: {evaluation['strengths']}\n"
+            f"IMPROVEMENTS: {evaluation['improvements']}\n"
+            f"IDEAL ANSWER APPROACH: {evaluation['ideal_answer_approach']}"
+        )
+        score_details = f"SCORE: {evaluation['score']}/10\nJUSTIFICATION: {evaluation['justification']}"
+        if on_token:
+            on_token(self.coach.name, feedback)
+            on_token(self.scorer.name, score_details)
+        return feedback, evaluation['score'], score_details
+    
+    def load_history(self, history: List):
+        """Restore previously processed Q&A records or dicts (e.g. from a session store)"""
+        self.interview_history = [
+            item if isinstance(item, QARecord) else QARecord.from_dict(item) for item in history
+        ]
+        scored = [item.score for item in self.interview_history if item.score_available]
+        self.score_total = sum(scored)
+        self.scored_count = len(scored)
+        self.summary_cache = None
+    
+    def reset(self):
+        """Forget the history, summary and token usage so the agents can serve another candidate"""
+        self.load_history([])
+        self.usage = TokenUsage()
+    
+    @staticmethod
+    async def _settle(coro):
+        """Await a coroutine, returning its exception instead of raising it"""
+        try:
+            return await coro
+        except Exception as e:
+            return e
+    
+    async def process_answer(self, question: str, answer: str, question_number: int,
+                             on_token: Optional[TokenCallback] = None) -> Dict:
         """
         Process a complete Q&A cycle: get feedback and score
         
@@ -215,73 +642,171 @@ Please evaluate and score this answer."""
             question: The interview question
             answer: The candidate's answer
             question_number: Current question number
+            on_token: Optional callback for streamed Coach and Scorer tokens
             
         Returns:
-            Dictionary containing feedback, score, and justification
+            Dictionary containing feedback, score, and justification.
+            If only one of the Coach/Scorer fails, the record is still returned
+            with `feedback_available` / `score_available` set to False.
         """
-        # Get feedback from coach
-        feedback = await self.get_feedback(question, answer)
-        
-        # Get score from scorer
-        score, score_details = await self.get_score(question, answer)
-        
-        # Store in history
-        qa_record = {
-            'question_number': question_number,
-            'question': question,
-            'answer': answer,
-            'feedback': feedback,
-            'score': score,
-            'score_details': score_details
-        }
+        if self.evaluator is not None:
+            try:
+                feedback, score, score_details = await self.get_evaluation(question, answer, on_token)
+                return self._record_answer(question, answer, question_number,
+                                           feedback, True, score, score_details, True)
+            except EvaluationFormatError as e:
+                # Malformed JSON: answer through the Coach and Scorer instead
+                print(f"⚠️  Combined evaluation unusable for question #{question_number}: {e}; "
+                      f"falling back to Coach + Scorer")
+                evaluation_fallbacks.inc()
+        
+        if self.concurrent_evaluation:
+            # Coach and Scorer don't depend on each other, so run them side by side
+            feedback, score_result = await asyncio.gather(
+                self.get_feedback(question, answer, on_token),
+                self.get_score(question, answer, on_token),
+                return_exceptions=True
+            )
+        else:
+            feedback = await self._settle(self.get_feedback(question, answer, on_token))
+            score_result = await self._settle(self.get_score(question, answer, on_token))
+        
+        # Overload fails the whole answer so the client can retry it later
+        for result in (feedback, score_result):
+            if isinstance(result, UpstreamOverloaded):
+                raise result
+        
+        feedback_available = not isinstance(feedback, BaseException)
+        score_available = not isinstance(score_result, BaseException)
+        
+        if not feedback_available and not score_available:
+            raise feedback
+        
+        # A single failed agent shouldn't cost the candidate the whole answer
+        if not feedback_available:
+            print(f"⚠️  Coach failed for question #{question_number}: {feedback!r}")
+            feedback = "Feedback is unavailable for this answer right now."
+        
+        if score_available:
+            score, score_details = score_result
+        else:
+            print(f"⚠️  Scorer failed for question #{question_number}: {score_result!r}")
+            score, score_details = None, "Score is unavailable for this answer right now."
+        
+        return self._record_answer(question, answer, question_number,
+                                   feedback, feedback_available, score, score_details, score_available)
+    
+    def _record_answer(self, question: str, answer: str, question_number: int, feedback: str,
+                       feedback_available: bool, score: Optional[int], score_details: str,
+                       score_available: bool) -> Dict:
+        """Store one evaluated answer in the history, returning it as a dict"""
+        qa_record = QARecord(question_number, question, answer, feedback,
+                             feedback_available, score, score_details, score_available)
         
         self.interview_history.append(qa_record)
-        self.scores.append(score)
-        self.feedbacks.append(feedback)
+        if score_available:
+            self.score_total += score
+            self.scored_count += 1
         
-        return qa_record
+        return qa_record.to_dict()
     
-    async def get_overall_summary(self) -> Dict:
+    async def get_overall_summary(self, on_token: Optional[TokenCallback] = None,
+                                  allow_stale: bool = False) -> Dict:
         """
         Get overall interview summary
         
+        The assessment is generated once per history version, so repeat
+        views cost no model calls until another answer is recorded. When an
+        earlier assessment exists only the newer answers are folded into it.
+        
+        Args:
+            on_token: Optional callback for streamed tokens (a cached summary arrives as one chunk)
+            allow_stale: Return the latest assessment even if newer answers aren't folded in yet
+        
         Returns:
             Dictionary with overall statistics and summary
         """
-        from autogen_core import CancellationToken
-        from autogen_agentchat.messages import TextMessage
-        
-        if not self.scores:
+        if not self.scored_count:
             return {
                 'average_score': 0,
                 'total_questions': 0,
                 'summary': 'No questions answered yet.'
             }
         
-        avg_score = sum(self.scores) / len(self.scores)
+        if self.summary_cache and (allow_stale or self.summary_cache[0] == self.history_version):
+            summary_cache_hits.inc()
+            if on_token:
+                on_token(self.summarizer.name, self.summary_cache[1])
+            return self._summary_result()
+        
+        await self.refresh_summary(on_token)
+        return self._summary_result()
+    
+    async def refresh_summary(self, on_token: Optional[TokenCallback] = None) -> str:
+        """
+        Bring the cached assessment up to date with the history
+        
+        Folds only the answers recorded since the last assessment into it,
+        so each refresh costs one short call however long the interview is.
         
-        summary_prompt = f"""
+        Args:
+            on_token: Optional callback for streamed tokens
+        
+        Returns:
+            The up-to-date assessment
+        """
+        version = self.history_version
+        if self.summary_cache and self.summary_cache[0] == version:
+            return self.summary_cache[1]
+        
+        avg_score = self.average_score
+        if self.summary_cache and self.summary_cache[0] < version:
+            covered, previous = self.summary_cache
+            new_answers = "\n\n".join(
+                self._describe_answer(item) for item in self.interview_history[covered:version]
+            )
+            summary_prompt = f"""
+Current assessment of a candidate for {self.position} position on {self.technology} after {covered} question(s):
+{previous}
+
+New answers since then:
+{new_answers}
+
+Overall: {version} question(s), average score {avg_score:.1f}/10.
+
+Update the overall assessment of the candidate's performance (2-3 sentences) to reflect the new answers.
+Include strengths and areas for improvement."""
+        else:
+            summary_prompt = f"""
 Based on this interview for {self.position} position on {self.technology}:
-- Total questions: {len(self.scores)}
+- Total questions: {self.scored_count}
 - Average score: {avg_score:.1f}/10
 - Scores: {self.scores}
 
 Provide a brief overall assessment of the candidate's performance (2-3 sentences).
 Include strengths and areas for improvement."""
         
-        await self.coach.on_reset(CancellationToken())
-        response = await self.coach.on_messages(
-            [TextMessage(content=summary_prompt, source="user")],
-            CancellationToken()
-        )
-        
-        overall_feedback = response.chat_message.content
-        
+        overall_feedback = await self._ask(self.summarizer, summary_prompt, on_token, role='summary')
+        # A slower refresh must not replace an assessment that already covers more answers
+        if not self.summary_cache or self.summary_cache[0] < version:
+            self.summary_cache = (version, overall_feedback)
+        return self.summary_cache[1]
+    
+    @staticmethod
+    def _describe_answer(item: QARecord) -> str:
+        """Short description of one Q&A record for the rolling assessment"""
+        answer, _ = truncate_to_tokens(item.answer, 150)
+        score = f"{item.score}/10" if item.score_available else "not scored"
+        return f"Q{item.question_number}: {item.question}\nAnswer: {answer}\nScore: {score}"
+    
+    def _summary_result(self) -> Dict:
+        covered, overall_feedback = self.summary_cache
         return {
-            'average_score': round(avg_score, 2),
-            'total_questions': len(self.scores),
+            'average_score': round(self.average_score, 2),
+            'total_questions': self.scored_count,
             'scores': self.scores,
             'summary': overall_feedback,
-            'history': self.interview_history
+            'summary_current': covered == self.history_version,
+            'history': [item.to_dict() for item in self.interview_history]
         }
 
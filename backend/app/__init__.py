@@ -9,9 +9,17 @@ from dotenv import load_dotenv
 load_dotenv()
 
 
+class InterviewFlask(Flask):
+    """Flask app that runs async views on the worker's long-lived event loop"""
+
+    def async_to_sync(self, func):
+        from app.services.event_loop import worker_loop
+        return worker_loop.async_to_sync(func)
+
+
 def create_app():
     """Create and configure the Flask application"""
-    app = Flask(__name__)
+    app = InterviewFlask(__name__)
     
     # Configuration
     app.config['SECRET_KEY'] = os.getenv('SECRET_KEY', 'dev-secret-key-change-in-production')
@@ -36,9 +44,11 @@ def create_app():
                          "Authorization",
                          "Accept",
                          "X-Requested-With",
-                         "Cache-Control"
+                         "Cache-Control",
+                         "Idempotency-Key",
+                         "If-None-Match"
                      ],
-                     "expose_headers": ["Content-Type"],
+                     "expose_headers": ["Content-Type", "Retry-After", "ETag"],
                      "supports_credentials": False,  # No cookies needed
                      "max_age": 3600
                  }
@@ -56,9 +66,11 @@ def create_app():
                          "Authorization",
                          "Accept",
                          "X-Requested-With",
-                         "Cache-Control"
+                         "Cache-Control",
+                         "Idempotency-Key",
+                         "If-None-Match"
                      ],
-                     "expose_headers": ["Content-Type"],
+                     "expose_headers": ["Content-Type", "Retry-After", "ETag"],
                      "supports_credentials": False,
                      "max_age": 3600
                  }
@@ -67,37 +79,28 @@ def create_app():
     # Register blueprints
     from app.routes.interview import interview_bp
     app.register_blueprint(interview_bp, url_prefix='/api')
+    from app.routes.grading import grading_bp
+    app.register_blueprint(grading_bp, url_prefix='/api')
     
-    # #region agent log
-    @app.before_request
-    def log_request():
-        try:
-            import json
-            log_data = {
-                "sessionId": "debug-session",
-                "runId": "run1",
-                "hypothesisId": "A",
-                "location": "app/__init__.py:before_request",
-                "message": "Incoming request",
-                "data": {
-                    "method": request.method,
-                    "path": request.path,
-                    "url": request.url,
-                    "endpoint": request.endpoint,
-                    "blueprint": request.blueprint if hasattr(request, 'blueprint') else None
-                },
-                "timestamp": __import__('time').time() * 1000
-            }
-            with open('/Volumes/Development/Practise/ai-interviewer/.cursor/debug.log', 'a') as f:
-                f.write(json.dumps(log_data) + '\n')
-        except Exception:
-            pass  # Don't fail if logging fails
-    # #endregion
+    # Structured request logging (queued, written by a background thread)
+    from app.services.request_log import request_log
+    request_log.init_app(app)
+    
+    # Prometheus metrics (per-route latency, agent calls, sessions) at /metrics
+    from app.services.metrics import metrics
+    metrics.init_app(app)
     
     # Health check endpoint
     @app.route('/health')
     def health():
-        return {'status': 'healthy', 'service': 'ai-interviewer-backend'}, 200
+        from app.services.warmup import warmup
+        status = warmup.status()
+        if status['state'] == 'warming':
+            # Keep the worker out of rotation until the first interview won't pay the cold start
+            return {'status': 'warming', 'service': 'ai-interviewer-backend'}, 503
+        if status['state'] == 'off':
+            return {'status': 'healthy', 'service': 'ai-interviewer-backend'}, 200
+        return {'status': 'healthy', 'service': 'ai-interviewer-backend', 'warmup': status}, 200
     
     # Test endpoint for production debugging
     @app.route('/api/test')
@@ -105,6 +108,12 @@ def create_app():
         """Test endpoint to verify backend configuration"""
         import sys
         from datetime import datetime
+        from app.services.admission import admission
+        from app.services.llm_pool import llm_pool
+        from app.services.interview_service import interview_service
+        from agents import agent_call_stats
+        from app.services.token_budget import worker_token_usage
+        from app.config import Config
         
         # Get CORS configuration (safe to expose)
         cors_origins = os.getenv('CORS_ORIGINS', '')
@@ -130,19 +139,32 @@ def create_app():
                 'endpoints': {
                     'health': '/health',
                     'test': '/api/test',
+                    'metrics': '/metrics',
                     'create_interview': '/api/interview/create',
                     'start_interview': '/api/interview/<session_id>/start',
                     'submit_answer': '/api/interview/<session_id>/answer',
                     'next_question': '/api/interview/<session_id>/next-question',
                     'end_interview': '/api/interview/<session_id>/end',
                     'get_session': '/api/interview/<session_id>',
+                    'streaming': '/api/interview/<session_id>/{start,answer,next-question,end}/stream',
+                    'websocket': '/api/interview/ws',
+                    'bulk_grading': '/api/grading/bulk',
                 }
             },
             'model': {
                 'provider': 'OpenRouter',
                 'model': os.getenv('MODEL', 'mistralai/mistral-small-creative'),
+                'roles': Config.ROLE_MODELS,
                 'api_key_configured': bool(os.getenv('OPENROUTER_API_KEY'))
-            }
+            },
+            'llm_pool': llm_pool.stats(),
+            'admission': admission.stats(),
+            'prefetch': interview_service.prefetch_stats(),
+            'question_cache': interview_service.question_cache.stats() if interview_service.question_cache else None,
+            'session_store': interview_service.store.stats() if hasattr(interview_service.store, 'stats') else None,
+            'request_log': request_log.stats(),
+            'agent_calls': agent_call_stats.stats(),
+            'token_usage': worker_token_usage()
         }), 200
     
     return app
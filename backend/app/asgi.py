@@ -0,0 +1,185 @@
+"""
+ASGI serving mode for the Flask application
+
+Serves the exact same Flask app (blueprints, CORS, hooks) from an ASGI
+server such as uvicorn. Async views are awaited directly on the server's
+event loop instead of being bridged through a thread, so a request that is
+waiting on the LLM holds no thread at all and one worker can keep many
+interviews in flight. It also serves the WebSocket interview channel
+(app/routes/ws.py), which the WSGI mode can't.
+"""
+import asyncio
+import io
+import sys
+
+from flask import Flask, request
+
+from app.config import Config
+from app.routes.sse import EventStream
+from app.routes.ws import WEBSOCKET_PATH, InterviewChannel, origin_allowed
+from app.services.event_loop import worker_loop
+from app.services.llm_pool import llm_pool
+from app.services.warmup import warmup
+
+
+def build_environ(scope: dict, body: bytes) -> dict:
+    """Build a WSGI environ from an ASGI HTTP scope and its request body"""
+    root_path = scope.get('root_path', '')
+    path = scope['path']
+    if root_path and path.startswith(root_path):
+        path = path[len(root_path):]
+
+    server_name, server_port = scope.get('server') or ('localhost', 80)
+    environ = {
+        'REQUEST_METHOD': scope['method'],
+        'SCRIPT_NAME': root_path.encode('utf8').decode('latin1'),
+        'PATH_INFO': path.encode('utf8').decode('latin1'),
+        'QUERY_STRING': scope.get('query_string', b'').decode('ascii'),
+        'SERVER_NAME': server_name,
+        'SERVER_PORT': str(server_port),
+        'SERVER_PROTOCOL': f"HTTP/{scope.get('http_version', '1.1')}",
+        'wsgi.version': (1, 0),
+        'wsgi.url_scheme': scope.get('scheme', 'http'),
+        'wsgi.input': io.BytesIO(body),
+        'wsgi.errors': sys.stderr,
+        'wsgi.multithread': False,
+        'wsgi.multiprocess': True,
+        'wsgi.run_once': False,
+    }
+    if scope.get('client'):
+        environ['REMOTE_ADDR'] = scope['client'][0]
+
+    for name, value in scope.get('headers', []):
+        name = name.decode('latin1')
+        if name == 'content-length':
+            key = 'CONTENT_LENGTH'
+        elif name == 'content-type':
+            key = 'CONTENT_TYPE'
+        else:
+            key = 'HTTP_' + name.upper().replace('-', '_')
+        value = value.decode('latin1')
+        environ[key] = f"{environ[key]},{value}" if key in environ else value
+    return environ
+
+
+class FlaskASGIApp:
+    """ASGI application that dispatches into a Flask app on one long-lived loop"""
+
+    def __init__(self, flask_app: Flask):
+        self.flask_app = flask_app
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] == 'lifespan':
+            await self._lifespan(receive, send)
+        elif scope['type'] == 'http':
+            await self._http(scope, receive, send)
+        elif scope['type'] == 'websocket':
+            await self._websocket(scope, receive, send)
+        else:
+            raise RuntimeError(f"Unsupported ASGI scope type: {scope['type']}")
+
+    async def _lifespan(self, receive, send):
+        while True:
+            message = await receive()
+            if message['type'] == 'lifespan.startup':
+                # Background work scheduled through the worker loop lands on
+                # the server's loop instead of a second one
+                worker_loop.attach(asyncio.get_running_loop())
+                if Config.WARMUP_ON_START:
+                    warmup.start()
+                await send({'type': 'lifespan.startup.complete'})
+            elif message['type'] == 'lifespan.shutdown':
+                await llm_pool.aclose()
+                await send({'type': 'lifespan.shutdown.complete'})
+                return
+
+    @staticmethod
+    async def _read_body(receive) -> bytes:
+        body = bytearray()
+        while True:
+            message = await receive()
+            if message['type'] == 'http.disconnect':
+                break
+            body.extend(message.get('body', b''))
+            if not message.get('more_body', False):
+                break
+        return bytes(body)
+
+    async def _dispatch_request(self):
+        """Async counterpart of Flask.dispatch_request"""
+        app = self.flask_app
+        if request.routing_exception is not None:
+            app.raise_routing_exception(request)
+        rule = request.url_rule
+        if getattr(rule, 'provide_automatic_options', False) and request.method == 'OPTIONS':
+            return app.make_default_options_response()
+        view = app.view_functions[rule.endpoint]
+        if asyncio.iscoroutinefunction(view):
+            return await view(**request.view_args)
+        return view(**request.view_args)
+
+    async def _full_dispatch(self):
+        """Async counterpart of Flask.full_dispatch_request, including error handling"""
+        app = self.flask_app
+        try:
+            try:
+                rv = app.preprocess_request()
+                if rv is None:
+                    rv = await self._dispatch_request()
+            except Exception as e:
+                rv = app.handle_user_exception(e)
+            return app.finalize_request(rv)
+        except Exception as e:
+            return app.handle_exception(e)
+
+    async def _http(self, scope, receive, send):
+        body = await self._read_body(receive)
+        environ = build_environ(scope, body)
+
+        with self.flask_app.request_context(environ):
+            response = await self._full_dispatch()
+            stream = response.response if isinstance(response.response, EventStream) else None
+            payload = b'' if stream else response.get_data()
+
+        await send({
+            'type': 'http.response.start',
+            'status': response.status_code,
+            'headers': [
+                (name.lower().encode('latin1'), value.encode('latin1'))
+                for name, value in response.headers.items()
+            ],
+        })
+
+        if stream is None:
+            await send({'type': 'http.response.body', 'body': payload})
+            return
+
+        # Push each event as soon as it is produced
+        try:
+            async for chunk in stream:
+                await send({'type': 'http.response.body', 'body': chunk.encode('utf-8'), 'more_body': True})
+            await send({'type': 'http.response.body', 'body': b''})
+        finally:
+            await stream.aclose()
+
+
+    @staticmethod
+    async def _websocket(scope, receive, send):
+        """Serve the interview channel; other paths and origins are refused"""
+        message = await receive()
+        if message['type'] != 'websocket.connect':
+            return
+        headers = dict(scope.get('headers', []))
+        origin = headers.get(b'origin', b'').decode('latin1') or None
+        if scope['path'].rstrip('/') != WEBSOCKET_PATH or not origin_allowed(origin):
+            # Closing before accepting answers the handshake with a 403
+            await send({'type': 'websocket.close', 'code': 1008})
+            return
+        await send({'type': 'websocket.accept'})
+        await InterviewChannel(receive, send).serve()
+
+
+def create_asgi_app() -> FlaskASGIApp:
+    """Create the ASGI application wrapping the regular Flask app"""
+    from app import create_app
+    return FlaskASGIApp(create_app())
@@ -6,6 +6,20 @@ from dotenv import load_dotenv
 
 load_dotenv()
 
+# Agent roles whose model can be configured separately
+AGENT_ROLES = ('interviewer', 'coach', 'scorer', 'evaluator', 'summary')
+
+
+def role_model_settings(role: str) -> dict:
+    """Model, temperature and max_tokens for a role (<ROLE>_MODEL etc.), defaulting to MODEL/TEMPERATURE/MAX_TOKENS"""
+    prefix = role.upper()
+    max_tokens = os.getenv(f'{prefix}_MAX_TOKENS') or os.getenv('MAX_TOKENS')
+    return {
+        'model': os.getenv(f'{prefix}_MODEL') or os.getenv('MODEL', 'mistralai/mistral-small-creative'),
+        'temperature': float(os.getenv(f'{prefix}_TEMPERATURE') or os.getenv('TEMPERATURE', '0.7')),
+        'max_tokens': int(max_tokens) if max_tokens else None,
+    }
+
 
 class Config:
     """Base configuration"""
@@ -20,20 +34,104 @@ class Config:
     # Model Configuration
     MODEL = os.getenv('MODEL', 'mistralai/mistral-small-creative')
     TEMPERATURE = float(os.getenv('TEMPERATURE', '0.7'))
+    # Per-role overrides, e.g. SCORER_MODEL, SCORER_TEMPERATURE, SCORER_MAX_TOKENS
+    ROLE_MODELS = {role: role_model_settings(role) for role in AGENT_ROLES}
+    
+    # Shared LLM client pool (per worker)
+    LLM_POOL_MAX_CONNECTIONS = int(os.getenv('LLM_POOL_MAX_CONNECTIONS', '100'))
+    LLM_POOL_MAX_KEEPALIVE = int(os.getenv('LLM_POOL_MAX_KEEPALIVE', '20'))
+    LLM_POOL_KEEPALIVE_EXPIRY = float(os.getenv('LLM_POOL_KEEPALIVE_EXPIRY', '60'))
+    # Import the agent stack and open upstream connections when a worker starts
+    WARMUP_ON_START = os.getenv('WARMUP_ON_START', 'False') == 'True'
+    WARMUP_TIMEOUT = float(os.getenv('WARMUP_TIMEOUT', '10'))
+    
+    # Request logging: sink is 'stdout', 'stderr', 'off' or a file path
+    REQUEST_LOG_SINK = os.getenv('REQUEST_LOG_SINK', 'stdout')
+    REQUEST_LOG_LEVEL = os.getenv('REQUEST_LOG_LEVEL', 'info')
+    REQUEST_LOG_SAMPLE_RATE = float(os.getenv('REQUEST_LOG_SAMPLE_RATE', '1.0'))
+    # Per-route overrides: 'endpoint=rate[:level],...'
+    REQUEST_LOG_ROUTES = os.getenv('REQUEST_LOG_ROUTES', 'health=0')
+    REQUEST_LOG_QUEUE_SIZE = int(os.getenv('REQUEST_LOG_QUEUE_SIZE', '10000'))
+    REQUEST_LOG_BATCH_SIZE = int(os.getenv('REQUEST_LOG_BATCH_SIZE', '200'))
+    REQUEST_LOG_FLUSH_INTERVAL = float(os.getenv('REQUEST_LOG_FLUSH_INTERVAL', '1.0'))
+    
+    # Metrics: with several workers, each writes snapshots to METRICS_DIR and
+    # /metrics merges them; leave empty for a single worker
+    METRICS_DIR = os.getenv('METRICS_DIR', '')
+    METRICS_SNAPSHOT_INTERVAL = float(os.getenv('METRICS_SNAPSHOT_INTERVAL', '5'))
     
     # CORS Configuration
     CORS_ORIGINS = os.getenv('CORS_ORIGINS', '*')
     
-    # Redis Configuration (if used)
+    # Redis Configuration (used when SESSION_BACKEND=redis)
     REDIS_URL = os.getenv('REDIS_URL', 'redis://localhost:6379/0')
     
     # Interview Settings
     DEFAULT_QUESTIONS_COUNT = int(os.getenv('DEFAULT_QUESTIONS_COUNT', '5'))
     MAX_QUESTIONS_COUNT = int(os.getenv('MAX_QUESTIONS_COUNT', '10'))
-    AGENT_TIMEOUT = int(os.getenv('AGENT_TIMEOUT', '120'))
+    # Overall budget in seconds for one agent call, including retries
+    AGENT_TIMEOUT = float(os.getenv('AGENT_TIMEOUT', '120'))
+    # Per-attempt deadlines by agent role; a late attempt is cancelled
+    INTERVIEWER_TIMEOUT = float(os.getenv('INTERVIEWER_TIMEOUT', '30'))
+    COACH_TIMEOUT = float(os.getenv('COACH_TIMEOUT', '45'))
+    SCORER_TIMEOUT = float(os.getenv('SCORER_TIMEOUT', '30'))
+    # Retries for timeouts, rate limits, connection and 5xx errors
+    AGENT_MAX_RETRIES = int(os.getenv('AGENT_MAX_RETRIES', '2'))
+    AGENT_RETRY_BASE_DELAY = float(os.getenv('AGENT_RETRY_BASE_DELAY', '0.5'))
+    AGENT_RETRY_MAX_DELAY = float(os.getenv('AGENT_RETRY_MAX_DELAY', '8'))
+    # Admission control for upstream calls (0 disables the limit). Calls beyond
+    # the limit queue; a full queue or a queue wait past the timeout gets a 503
+    ADMISSION_MAX_IN_FLIGHT = int(os.getenv('ADMISSION_MAX_IN_FLIGHT', '64'))
+    ADMISSION_QUEUE_SIZE = int(os.getenv('ADMISSION_QUEUE_SIZE', '256'))
+    ADMISSION_QUEUE_TIMEOUT = float(os.getenv('ADMISSION_QUEUE_TIMEOUT', '15'))
+    # 'worker' (limit per worker) or 'global' (also share a limit across workers via REDIS_URL)
+    ADMISSION_SCOPE = os.getenv('ADMISSION_SCOPE', 'worker')
+    ADMISSION_GLOBAL_MAX_IN_FLIGHT = int(os.getenv('ADMISSION_GLOBAL_MAX_IN_FLIGHT', '0'))
+    # Run the Coach and Scorer at the same time when processing an answer
+    CONCURRENT_EVALUATION = os.getenv('CONCURRENT_EVALUATION', 'True') == 'True'
+    # 'separate' (Coach + Scorer) or 'combined' (one JSON call for feedback and score)
+    EVALUATION_MODE = os.getenv('EVALUATION_MODE', 'separate')
+    # Generate question N+1 in the background while the candidate reads feedback
+    PREFETCH_NEXT_QUESTION = os.getenv('PREFETCH_NEXT_QUESTION', 'False') == 'True'
+    # Fold each answer into a rolling assessment in the background so /end returns at once
+    ROLLING_SUMMARY = os.getenv('ROLLING_SUMMARY', 'False') == 'True'
+    # Reuse opening questions across candidates with the same technology/position
+    QUESTION_CACHE_ENABLED = os.getenv('QUESTION_CACHE_ENABLED', 'True') == 'True'
+    QUESTION_CACHE_MAX_KEYS = int(os.getenv('QUESTION_CACHE_MAX_KEYS', '1000'))
+    QUESTION_CACHE_TTL = float(os.getenv('QUESTION_CACHE_TTL', '3600'))
+    QUESTION_CACHE_VARIANTS = int(os.getenv('QUESTION_CACHE_VARIANTS', '5'))
+    # Results of keyed (Idempotency-Key) requests replayed to retries, per session
+    IDEMPOTENCY_TTL = float(os.getenv('IDEMPOTENCY_TTL', '600'))
+    IDEMPOTENCY_MAX_KEYS = int(os.getenv('IDEMPOTENCY_MAX_KEYS', '16'))
+    # Long-polling GET /api/interview/<id>?wait=N (seconds, capped) for the next change
+    LONG_POLL_MAX_WAIT = float(os.getenv('LONG_POLL_MAX_WAIT', '30'))
+    LONG_POLL_INTERVAL = float(os.getenv('LONG_POLL_INTERVAL', '1'))
+    # Token budgets (estimated before each call; 0 disables a limit)
+    MAX_ANSWER_TOKENS = int(os.getenv('MAX_ANSWER_TOKENS', '1500'))
+    ANSWER_OVERFLOW = os.getenv('ANSWER_OVERFLOW', 'truncate')  # 'truncate' or 'reject'
+    MAX_PROMPT_TOKENS = int(os.getenv('MAX_PROMPT_TOKENS', '6000'))
+    SESSION_TOKEN_BUDGET = int(os.getenv('SESSION_TOKEN_BUDGET', '60000'))
+    
+    # Bulk grading (POST /api/grading/bulk and grade.py)
+    BULK_GRADING_CONCURRENCY = int(os.getenv('BULK_GRADING_CONCURRENCY', '8'))
+    BULK_GRADING_MAX_CONCURRENCY = int(os.getenv('BULK_GRADING_MAX_CONCURRENCY', '32'))
+    BULK_GRADING_MAX_RECORDS = int(os.getenv('BULK_GRADING_MAX_RECORDS', '5000'))
     
     # Session Configuration
     SESSION_TIMEOUT_HOURS = int(os.getenv('SESSION_TIMEOUT_HOURS', '2'))
+    # Background eviction of expired in-memory sessions
+    SESSION_REAPER_INTERVAL = float(os.getenv('SESSION_REAPER_INTERVAL', '60'))
+    SESSION_REAPER_BATCH = int(os.getenv('SESSION_REAPER_BATCH', '1000'))
+    # 'memory' (per worker), 'sqlite' (per worker, persisted to SESSION_DB_PATH)
+    # or 'redis' (shared across workers, uses REDIS_URL)
+    SESSION_BACKEND = os.getenv('SESSION_BACKEND', 'memory')
+    # Write-behind SQLite persistence (used when SESSION_BACKEND=sqlite)
+    SESSION_DB_PATH = os.getenv('SESSION_DB_PATH', 'data/sessions.db')
+    SESSION_DB_FLUSH_INTERVAL = float(os.getenv('SESSION_DB_FLUSH_INTERVAL', '0.5'))
+    SESSION_DB_BATCH_SIZE = int(os.getenv('SESSION_DB_BATCH_SIZE', '500'))
+    # In-process read-through cache in front of the Redis session store
+    SESSION_CACHE_SIZE = int(os.getenv('SESSION_CACHE_SIZE', '256'))
+    SESSION_CACHE_TTL = float(os.getenv('SESSION_CACHE_TTL', '30'))
 
 
 class DevelopmentConfig(Config):
@@ -0,0 +1,44 @@
+"""
+Bulk grading API routes
+"""
+from flask import Blueprint, Response, jsonify, request
+
+from app.config import Config
+from app.routes.interview import handle_errors
+from app.routes.sse import EventStream
+from app.services.bulk_grading import grade_jsonl
+
+# Create blueprint (CORS handled globally in app/__init__.py)
+grading_bp = Blueprint('grading', __name__)
+
+
+@grading_bp.route('/grading/bulk', methods=['POST', 'OPTIONS'])
+@handle_errors
+def bulk_grade():
+    """
+    Grade a JSONL body of {technology, position, question, answer} records
+
+    Query params:
+        order: 'input' (default) or 'completion'
+        concurrency: Records graded at once (capped at BULK_GRADING_MAX_CONCURRENCY)
+
+    Results stream back as JSONL, one line per record with its `index`.
+    """
+    # OPTIONS is handled by @handle_errors decorator
+    order = request.args.get('order', 'input')
+    if order not in ('input', 'completion'):
+        return jsonify({'error': "order must be 'input' or 'completion'"}), 400
+    concurrency = request.args.get('concurrency', type=int) or Config.BULK_GRADING_CONCURRENCY
+    concurrency = min(max(1, concurrency), Config.BULK_GRADING_MAX_CONCURRENCY)
+
+    lines = request.get_data(as_text=True).splitlines()
+    if not any(line.strip() for line in lines):
+        return jsonify({'error': 'Request body must contain JSONL records'}), 400
+    if len(lines) > Config.BULK_GRADING_MAX_RECORDS:
+        return jsonify({'error': f"At most {Config.BULK_GRADING_MAX_RECORDS} records per request"}), 400
+
+    return Response(
+        EventStream(grade_jsonl(lines, concurrency, order)),
+        mimetype='application/x-ndjson',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'},
+    )
@@ -1,15 +1,27 @@
 """
 Interview API routes
 """
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, request, jsonify, make_response
 from functools import wraps
 import asyncio
+from app.config import Config
+from app.services.admission import UpstreamOverloaded
+from app.services.idempotency import MAX_KEY_LENGTH
 from app.services.interview_service import interview_service
+from app.routes.sse import event_stream_response
 
 # Create blueprint (CORS handled globally in app/__init__.py)
 interview_bp = Blueprint('interview', __name__)
 
 
+def overloaded_response(e: UpstreamOverloaded):
+    """503 telling the client when to retry"""
+    response = jsonify({'error': 'Server is busy, please retry shortly', 'details': str(e),
+                        'retry_after': e.retry_after})
+    response.headers['Retry-After'] = str(e.retry_after)
+    return response, 503
+
+
 def handle_errors(f):
     """Decorator to handle errors consistently for sync & async routes"""
 
@@ -24,10 +36,14 @@ def handle_errors(f):
         try:
             result = await f(*args, **kwargs)
             return result
+        except UpstreamOverloaded as e:
+            return overloaded_response(e)
         except ValueError as e:
             import traceback
             traceback.print_exc()
             return jsonify({'error': str(e)}), 400
+        except TimeoutError as e:
+            return jsonify({'error': 'Upstream model timed out', 'details': str(e)}), 504
         except Exception as e:
             import traceback
             traceback.print_exc()
@@ -45,10 +61,14 @@ def handle_errors(f):
         
         try:
             return f(*args, **kwargs)
+        except UpstreamOverloaded as e:
+            return overloaded_response(e)
         except ValueError as e:
             import traceback
             traceback.print_exc()
             return jsonify({'error': str(e)}), 400
+        except TimeoutError as e:
+            return jsonify({'error': 'Upstream model timed out', 'details': str(e)}), 504
         except Exception as e:
             import traceback
             traceback.print_exc()
@@ -62,6 +82,14 @@ def handle_errors(f):
     return sync_wrapper
 
 
+def idempotency_key():
+    """The request's Idempotency-Key header, if any"""
+    key = request.headers.get('Idempotency-Key', '').strip()
+    if len(key) > MAX_KEY_LENGTH:
+        raise ValueError(f"Idempotency-Key is longer than {MAX_KEY_LENGTH} characters")
+    return key or None
+
+
 # -------------------- ROUTES -------------------- #
 
 @interview_bp.route('/interview/create', methods=['POST', 'OPTIONS'])
@@ -73,30 +101,6 @@ def create_interview():
     Flask-CORS handles OPTIONS automatically, but route must accept it
     """
     # OPTIONS is handled by @handle_errors decorator
-    # #region agent log
-    try:
-        import json
-        log_data = {
-            "sessionId": "debug-session",
-            "runId": "run1",
-            "hypothesisId": "B",
-            "location": "routes/interview.py:create_interview",
-            "message": "Route handler called",
-            "data": {
-                "method": request.method,
-                "path": request.path,
-                "url": request.url,
-                "endpoint": request.endpoint,
-                "blueprint": request.blueprint if hasattr(request, 'blueprint') else None
-            },
-            "timestamp": __import__('time').time() * 1000
-        }
-        with open('/Volumes/Development/Practise/ai-interviewer/.cursor/debug.log', 'a') as f:
-            f.write(json.dumps(log_data) + '\n')
-    except Exception:
-        pass  # Don't fail if logging fails
-    # #endregion
-    
     data = request.get_json()
 
     if not data or 'technology' not in data or 'position' not in data:
@@ -122,28 +126,6 @@ async def start_interview(session_id):
     Start an interview and get the first question
     """
     # OPTIONS is handled by @handle_errors decorator
-    # #region agent log
-    try:
-        import json
-        log_data = {
-            "sessionId": "debug-session",
-            "runId": "run1",
-            "hypothesisId": "C",
-            "location": "routes/interview.py:start_interview",
-            "message": "Start interview route called",
-            "data": {
-                "method": request.method,
-                "session_id": session_id,
-                "path": request.path
-            },
-            "timestamp": __import__('time').time() * 1000
-        }
-        with open('/Volumes/Development/Practise/ai-interviewer/.cursor/debug.log', 'a') as f:
-            f.write(json.dumps(log_data) + '\n')
-    except Exception:
-        pass
-    # #endregion
-        
     result = await interview_service.start_interview(session_id)
     return jsonify(result), 200
 
@@ -153,6 +135,10 @@ async def start_interview(session_id):
 async def submit_answer(session_id):
     """
     Submit an answer to the current question
+    
+    Headers:
+        Idempotency-Key: Optional; a retry with the same key gets the first
+            result without new model calls
     """
     # OPTIONS is handled by @handle_errors decorator
     data = request.get_json()
@@ -162,7 +148,8 @@ async def submit_answer(session_id):
 
     result = await interview_service.submit_answer(
         session_id,
-        data['answer']
+        data['answer'],
+        idempotency_key=idempotency_key()
     )
 
     return jsonify(result), 200
@@ -173,9 +160,13 @@ async def submit_answer(session_id):
 async def get_next_question(session_id):
     """
     Get the next question
+    
+    Headers:
+        Idempotency-Key: Optional; a retry with the same key gets the same
+            question instead of skipping to the one after it
     """
     # OPTIONS is handled by @handle_errors decorator
-    result = await interview_service.get_next_question(session_id)
+    result = await interview_service.get_next_question(session_id, idempotency_key=idempotency_key())
     return jsonify(result), 200
 
 
@@ -184,21 +175,104 @@ async def get_next_question(session_id):
 async def end_interview(session_id):
     """
     End the interview and return summary
+    
+    Query params:
+        refresh: 'true' to wait until the rolling summary covers every answer
     """
     # OPTIONS is handled by @handle_errors decorator
-    result = await interview_service.end_interview(session_id)
+    refresh = request.args.get('refresh', 'false').lower() == 'true'
+    result = await interview_service.end_interview(session_id, refresh=refresh)
     return jsonify(result), 200
 
 
+# -------------------- STREAMING ROUTES -------------------- #
+# Same operations as above, but tokens are pushed as Server-Sent Events
+# (`event: token`) while the agents generate them. The last event is
+# `result` carrying the same JSON as the non-streaming route, or `error`.
+# A keyed duplicate of a request that is running or done gets only `result`.
+
+@interview_bp.route('/interview/<session_id>/start/stream', methods=['POST', 'OPTIONS'])
+@handle_errors
+def start_interview_stream(session_id):
+    """
+    Start an interview, streaming the first question
+    """
+    return event_stream_response(
+        lambda on_token: interview_service.start_interview(session_id, on_token)
+    )
+
+
+@interview_bp.route('/interview/<session_id>/answer/stream', methods=['POST', 'OPTIONS'])
+@handle_errors
+def submit_answer_stream(session_id):
+    """
+    Submit an answer, streaming Coach feedback and Scorer output
+    """
+    data = request.get_json()
+
+    if not data or 'answer' not in data:
+        return jsonify({'error': 'Missing answer'}), 400
+
+    key = idempotency_key()
+    return event_stream_response(
+        lambda on_token: interview_service.submit_answer(session_id, data['answer'], on_token, key)
+    )
+
+
+@interview_bp.route('/interview/<session_id>/next-question/stream', methods=['POST', 'OPTIONS'])
+@handle_errors
+def get_next_question_stream(session_id):
+    """
+    Get the next question, streamed
+    """
+    key = idempotency_key()
+    return event_stream_response(
+        lambda on_token: interview_service.get_next_question(session_id, on_token, key)
+    )
+
+
+@interview_bp.route('/interview/<session_id>/end/stream', methods=['POST', 'OPTIONS'])
+@handle_errors
+def end_interview_stream(session_id):
+    """
+    End the interview, streaming the overall assessment
+    """
+    refresh = request.args.get('refresh', 'false').lower() == 'true'
+    return event_stream_response(
+        lambda on_token: interview_service.end_interview(session_id, on_token, refresh)
+    )
+
+
 @interview_bp.route('/interview/<session_id>', methods=['GET', 'OPTIONS'])
 @handle_errors
-def get_session_info(session_id):
+async def get_session_info(session_id):
     """
     Get session information
+    
+    The response carries an ETag (the session's version). A request whose
+    If-None-Match still matches gets an empty 304 instead.
+    
+    Query params:
+        wait: Seconds (capped at LONG_POLL_MAX_WAIT) to hold a matching
+            request open until the session changes; 304 if it doesn't
     """
     # OPTIONS is handled by @handle_errors decorator
-    info = interview_service.get_session_info(session_id)
-    return jsonify(info), 200
+    wait = min(max(0.0, request.args.get('wait', 0.0, type=float)), Config.LONG_POLL_MAX_WAIT)
+    version = interview_service.session_version(session_id)
+    if wait and request.if_none_match.contains_weak(str(version)):
+        version = await interview_service.wait_for_change(session_id, version, wait)
+    
+    if request.if_none_match.contains_weak(str(version)):
+        response = make_response('', 304)
+    else:
+        info = interview_service.get_session_info(session_id)
+        version = info['version']  # the version of the body actually sent
+        response = jsonify(info)
+    # Weak: last_activity can differ between responses for the same version
+    response.set_etag(str(version), weak=True)
+    # Let browsers cache it, but always revalidate
+    response.headers['Cache-Control'] = 'no-cache'
+    return response
 
 
 @interview_bp.route('/interview/<session_id>', methods=['DELETE', 'OPTIONS'])
@@ -0,0 +1,110 @@
+"""
+Server-Sent Events helpers for the streaming interview routes
+"""
+import asyncio
+import json
+import traceback
+
+from flask import Response
+
+from app.services.admission import UpstreamOverloaded, admission
+from app.services.event_loop import worker_loop
+
+
+def format_event(event: str, data) -> str:
+    """Format one SSE message"""
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+class EventStream:
+    """
+    Response body backed by an async generator of SSE messages.
+
+    Under WSGI the body is iterated synchronously, one step at a time on
+    the worker loop. The ASGI adapter iterates it natively with `async for`.
+    """
+
+    def __init__(self, events):
+        self.events = events
+
+    def __aiter__(self):
+        return self.events.__aiter__()
+
+    async def aclose(self):
+        await self.events.aclose()
+
+    def __iter__(self):
+        async def _next():
+            return await self.events.__anext__()
+
+        try:
+            while True:
+                try:
+                    yield worker_loop.run(_next()).encode('utf-8')
+                except StopAsyncIteration:
+                    return
+        finally:
+            worker_loop.run(self.events.aclose())
+
+
+async def _stream_operation(operation):
+    """
+    Run an operation that reports tokens through an on_token callback and
+    turn it into SSE messages: `token` events while it runs, then a final
+    `result` (the usual JSON payload) or `error` event.
+    """
+    queue = asyncio.Queue()
+
+    def on_token(agent: str, delta: str):
+        queue.put_nowait({'agent': agent, 'delta': delta})
+
+    task = asyncio.ensure_future(operation(on_token))
+    task.add_done_callback(lambda _: queue.put_nowait(None))
+
+    try:
+        while True:
+            item = await queue.get()
+            if item is None:
+                break
+            yield format_event('token', item)
+
+        try:
+            yield format_event('result', task.result())
+        except UpstreamOverloaded as e:
+            yield format_event('error', {'error': 'Server is busy, please retry shortly', 'details': str(e),
+                                         'retry_after': e.retry_after})
+        except ValueError as e:
+            yield format_event('error', {'error': str(e)})
+        except TimeoutError as e:
+            yield format_event('error', {'error': 'Upstream model timed out', 'details': str(e)})
+        except Exception as e:
+            traceback.print_exc()
+            yield format_event('error', {'error': 'Internal server error', 'details': str(e)})
+    finally:
+        # The client went away before the operation finished
+        if not task.done():
+            task.cancel()
+
+
+def event_stream_response(operation) -> Response:
+    """
+    Build a streaming SSE response
+
+    Args:
+        operation: Callable taking an on_token callback and returning the
+            coroutine whose result becomes the final `result` event
+
+    Raises:
+        UpstreamOverloaded: If the upstream queue is already full, so the
+            route can answer 503 instead of starting a stream
+    """
+    admission.check()
+    return Response(
+        EventStream(_stream_operation(operation)),
+        mimetype='text/event-stream',
+        headers={
+            'Cache-Control': 'no-cache',
+            # Stop nginx and similar proxies from buffering the stream
+            'X-Accel-Buffering': 'no',
+        },
+    )
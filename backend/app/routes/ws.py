@@ -0,0 +1,167 @@
+"""
+WebSocket interview channel (ASGI mode)
+
+Runs a whole interview over one connection at WEBSOCKET_PATH. The client
+sends JSON messages and the server pushes tokens and results as they are
+produced. Every operation goes through InterviewService, so a session
+created over REST can be continued here and vice versa.
+
+Client messages (an optional `id` is echoed on every reply to it):
+    {"type": "create", "technology": "...", "position": "..."}
+    {"type": "join", "session_id": "..."}
+    {"type": "start"}
+    {"type": "answer", "answer": "...", "next": true, "idempotency_key": "..."}
+    {"type": "next", "idempotency_key": "..."}
+    {"type": "end", "refresh": false}
+
+Server messages:
+    {"type": "session", ...}    after create/join: the session info
+    {"type": "token", "agent": "...", "delta": "..."}
+    {"type": "question", ...}   same JSON as /start and /next-question
+    {"type": "feedback", ...}   same JSON as /answer
+    {"type": "summary", ...}    same JSON as /end
+    {"type": "error", "error": "...", ...}
+
+With `"next": true` an answer is followed by the next question in the same
+exchange, saving the client a round trip per question.
+"""
+import asyncio
+import json
+import traceback
+from typing import Dict, Optional
+
+from app.config import Config
+from app.services.admission import UpstreamOverloaded
+from app.services.idempotency import MAX_KEY_LENGTH
+from app.services.interview_service import interview_service
+from app.services.metrics import ws_connections
+
+WEBSOCKET_PATH = '/api/interview/ws'
+
+
+def origin_allowed(origin: Optional[str]) -> bool:
+    """Apply the CORS origin list to WebSocket handshakes (browsers don't preflight them)"""
+    if not Config.CORS_ORIGINS or Config.CORS_ORIGINS == '*' or origin is None:
+        return True
+    return origin in [o.strip() for o in Config.CORS_ORIGINS.split(',')]
+
+
+class InterviewChannel:
+    """
+    One WebSocket connection driving one interview session.
+
+    Messages are handled one at a time, in order. Everything sent to the
+    client goes through an outbox drained by a single writer, so streamed
+    tokens and results keep their order. If the client disconnects, the
+    operation in progress is cancelled, as with the SSE routes.
+    """
+
+    def __init__(self, receive, send, service=None):
+        self.receive = receive
+        self.send = send
+        self.service = service or interview_service
+        self.session_id: Optional[str] = None
+        self.outbox: asyncio.Queue = asyncio.Queue()
+
+    async def serve(self):
+        """Run the connection until the client closes it"""
+        inbox: asyncio.Queue = asyncio.Queue()
+        writer = asyncio.ensure_future(self._write())
+        handler = asyncio.ensure_future(self._handle(inbox))
+        ws_connections.inc()
+        try:
+            while True:
+                message = await self.receive()
+                if message['type'] == 'websocket.disconnect':
+                    break
+                if message['type'] == 'websocket.receive':
+                    inbox.put_nowait(message.get('text') or (message.get('bytes') or b'').decode('utf-8'))
+        finally:
+            ws_connections.dec()
+            for task in (handler, writer):
+                task.cancel()
+            await asyncio.gather(handler, writer, return_exceptions=True)
+
+    async def _write(self):
+        while True:
+            message = await self.outbox.get()
+            await self.send({'type': 'websocket.send', 'text': json.dumps(message)})
+
+    def push(self, message_type: str, payload: Dict, request_id=None):
+        message = {'type': message_type, **payload}
+        if request_id is not None:
+            message['id'] = request_id
+        self.outbox.put_nowait(message)
+
+    async def _handle(self, inbox: asyncio.Queue):
+        while True:
+            raw = await inbox.get()
+            request_id = None
+            try:
+                message = json.loads(raw)
+                if not isinstance(message, dict):
+                    raise ValueError("Messages must be JSON objects")
+                request_id = message.get('id')
+                await self._dispatch(message, request_id)
+            except json.JSONDecodeError:
+                self.push('error', {'error': 'Messages must be JSON objects'})
+            except UpstreamOverloaded as e:
+                self.push('error', {'error': 'Server is busy, please retry shortly', 'details': str(e),
+                                    'retry_after': e.retry_after}, request_id)
+            except ValueError as e:
+                self.push('error', {'error': str(e)}, request_id)
+            except TimeoutError as e:
+                self.push('error', {'error': 'Upstream model timed out', 'details': str(e)}, request_id)
+            except Exception as e:
+                traceback.print_exc()
+                self.push('error', {'error': 'Internal server error', 'details': str(e)}, request_id)
+
+    @staticmethod
+    def _idempotency_key(message: Dict) -> Optional[str]:
+        key = str(message.get('idempotency_key') or '').strip()
+        if len(key) > MAX_KEY_LENGTH:
+            raise ValueError(f"idempotency_key is longer than {MAX_KEY_LENGTH} characters")
+        return key or None
+
+    def _session_id(self) -> str:
+        if self.session_id is None:
+            raise ValueError("No session: send 'create' or 'join' first")
+        return self.session_id
+
+    async def _dispatch(self, message: Dict, request_id):
+        kind = message.get('type')
+
+        def on_token(agent: str, delta: str):
+            self.push('token', {'agent': agent, 'delta': delta}, request_id)
+
+        if kind == 'create':
+            if not message.get('technology') or not message.get('position'):
+                raise ValueError("Missing technology or position")
+            self.session_id = self.service.create_session(message['technology'], message['position'])
+            self.push('session', self.service.get_session_info(self.session_id), request_id)
+        elif kind == 'join':
+            info = self.service.get_session_info(str(message.get('session_id')))
+            self.session_id = info['session_id']
+            self.push('session', info, request_id)
+        elif kind == 'start':
+            result = await self.service.start_interview(self._session_id(), on_token)
+            self.push('question', result, request_id)
+        elif kind == 'answer':
+            if 'answer' not in message:
+                raise ValueError("Missing answer")
+            key = self._idempotency_key(message)
+            result = await self.service.submit_answer(self._session_id(), message['answer'], on_token, key)
+            self.push('feedback', result, request_id)
+            if message.get('next'):
+                result = await self.service.get_next_question(
+                    self._session_id(), on_token, f"{key}:next" if key else None)
+                self.push('question', result, request_id)
+        elif kind == 'next':
+            result = await self.service.get_next_question(self._session_id(), on_token,
+                                                          self._idempotency_key(message))
+            self.push('question', result, request_id)
+        elif kind == 'end':
+            result = await self.service.end_interview(self._session_id(), on_token, bool(message.get('refresh')))
+            self.push('summary', result, request_id)
+        else:
+            raise ValueError(f"Unknown message type: {kind!r}")
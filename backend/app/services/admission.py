@@ -0,0 +1,243 @@
+"""
+Admission control for upstream model calls
+"""
+import asyncio
+import math
+import os
+import threading
+import time
+import uuid
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import Dict
+
+from app.config import Config
+from app.services.metrics import metrics, upstream_queue_wait, upstream_rejected
+
+
+class UpstreamOverloaded(Exception):
+    """Too many upstream calls are queued; the client should retry after `retry_after` seconds"""
+
+    def __init__(self, message: str, retry_after: int):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class AdmissionController:
+    """
+    Caps the agent calls in flight to the model provider.
+
+    Up to `max_in_flight` calls run at once; the rest wait in a FIFO queue
+    of at most `max_queue` calls. A call is refused with UpstreamOverloaded
+    when the queue is full or when it has waited `queue_timeout` seconds,
+    which the routes turn into 503 + Retry-After. A finished call hands
+    its slot straight to the oldest waiter.
+
+    With scope 'global' a call also needs one of `global_max_in_flight`
+    slots shared by every worker through Redis (a sorted set of leases that
+    expire if a worker dies holding one). Waiters poll for a free lease.
+
+    The slot bookkeeping is thread-safe and waiters may sit on any event
+    loop, so one controller serves the whole worker process.
+    """
+
+    KEY = 'interview:admission'
+    # Atomically drop expired leases and take a free one
+    ACQUIRE_SCRIPT = """
+redis.call('ZREMRANGEBYSCORE', KEYS[1], '-inf', ARGV[1])
+if redis.call('ZCARD', KEYS[1]) < tonumber(ARGV[3]) then
+    redis.call('ZADD', KEYS[1], ARGV[2], ARGV[4])
+    return 1
+end
+return 0
+"""
+
+    def __init__(self, max_in_flight: int = None, max_queue: int = None, queue_timeout: float = None,
+                 scope: str = None, global_max_in_flight: int = None, redis_client=None):
+        self.max_in_flight = max_in_flight if max_in_flight is not None else Config.ADMISSION_MAX_IN_FLIGHT
+        self.max_queue = max_queue if max_queue is not None else Config.ADMISSION_QUEUE_SIZE
+        self.queue_timeout = queue_timeout if queue_timeout is not None else Config.ADMISSION_QUEUE_TIMEOUT
+        self.scope = scope or Config.ADMISSION_SCOPE
+        if self.scope not in ('worker', 'global'):
+            raise ValueError(f"Unknown ADMISSION_SCOPE: {self.scope}")
+        self.global_max_in_flight = (global_max_in_flight if global_max_in_flight is not None
+                                     else Config.ADMISSION_GLOBAL_MAX_IN_FLIGHT) or self.max_in_flight
+        self._redis = redis_client
+        self._acquire_script = None
+        self._lock = threading.Lock()
+        self.reset()
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_in_flight > 0
+
+    def reset(self):
+        """Forget slots and counters (used after fork)"""
+        self.in_flight = 0
+        self._waiters: deque = deque()
+        self._mean_hold = 1.0
+        self._counts = {'admitted': 0, 'queued': 0, 'rejected_queue_full': 0, 'rejected_deadline': 0}
+        self._peak_queue = 0
+        self._total_wait = 0.0
+
+    def retry_after(self) -> int:
+        """Seconds until a new call would probably get a slot"""
+        backlog = len(self._waiters) + 1
+        return max(1, math.ceil(self._mean_hold * backlog / max(1, self.max_in_flight)))
+
+    def check(self):
+        """
+        Refuse up front when the queue is already full
+
+        Lets streaming routes answer 503 before committing to a 200 stream.
+        """
+        if self.enabled and len(self._waiters) >= self.max_queue and self.in_flight >= self.max_in_flight:
+            upstream_rejected.inc(reason='queue_full')
+            with self._lock:
+                self._counts['rejected_queue_full'] += 1
+            raise UpstreamOverloaded("Upstream queue is full", self.retry_after())
+
+    @asynccontextmanager
+    async def slot(self):
+        """Hold an upstream slot for the duration of the block"""
+        if not self.enabled:
+            yield
+            return
+        deadline = time.monotonic() + self.queue_timeout
+        await self._acquire_local(deadline)
+        lease = None
+        try:
+            if self.scope == 'global':
+                lease = await self._acquire_global(deadline)
+            held = time.monotonic()
+            yield
+        finally:
+            if lease is not None:
+                self._release_global(lease)
+            self._release_local()
+        # Smoothed slot hold time, used for Retry-After
+        self._mean_hold += 0.1 * (time.monotonic() - held - self._mean_hold)
+
+    async def _acquire_local(self, deadline: float):
+        with self._lock:
+            if self.in_flight < self.max_in_flight and not self._waiters:
+                self.in_flight += 1
+                self._counts['admitted'] += 1
+                upstream_queue_wait.observe(0)
+                return
+            if len(self._waiters) >= self.max_queue:
+                self._counts['rejected_queue_full'] += 1
+                upstream_rejected.inc(reason='queue_full')
+                raise UpstreamOverloaded("Upstream queue is full", self.retry_after())
+            waiter = asyncio.get_running_loop().create_future()
+            self._waiters.append(waiter)
+            self._counts['queued'] += 1
+            self._peak_queue = max(self._peak_queue, len(self._waiters))
+
+        queued = time.monotonic()
+        try:
+            await asyncio.wait_for(waiter, max(0.0, deadline - queued))
+        except (asyncio.TimeoutError, asyncio.CancelledError) as e:
+            with self._lock:
+                try:
+                    self._waiters.remove(waiter)
+                    handed_over = False
+                except ValueError:
+                    handed_over = True  # a slot was handed to us as we gave up
+            # Handed over and cancelled: _wake passes the slot on. Handed over
+            # with the result already set: the slot is ours to give back.
+            if handed_over and not waiter.cancelled():
+                self._release_local()
+            if isinstance(e, asyncio.CancelledError):
+                raise
+            self._reject_deadline(queued)
+        waited = time.monotonic() - queued
+        upstream_queue_wait.observe(waited)
+        with self._lock:
+            self._counts['admitted'] += 1
+            self._total_wait += waited
+
+    def _release_local(self):
+        with self._lock:
+            # The slot passes straight to the oldest waiter; in_flight stays the same
+            while self._waiters:
+                waiter = self._waiters.popleft()
+                if not waiter.done():
+                    waiter.get_loop().call_soon_threadsafe(self._wake, waiter)
+                    return
+            self.in_flight -= 1
+
+    def _wake(self, waiter: asyncio.Future):
+        if not waiter.done():
+            waiter.set_result(None)
+        else:
+            # Cancelled after being handed the slot, but before it could remove itself
+            self._release_local()
+
+    def _reject_deadline(self, queued: float):
+        with self._lock:
+            self._counts['rejected_deadline'] += 1
+        upstream_rejected.inc(reason='deadline')
+        upstream_queue_wait.observe(time.monotonic() - queued)
+        raise UpstreamOverloaded(f"No upstream slot within {self.queue_timeout:g}s", self.retry_after())
+
+    # -------------------- CROSS-WORKER SLOTS -------------------- #
+
+    def _redis_client(self):
+        if self._redis is None:
+            import redis
+            self._redis = redis.Redis.from_url(Config.REDIS_URL)
+        if self._acquire_script is None:
+            self._acquire_script = self._redis.register_script(self.ACQUIRE_SCRIPT)
+        return self._redis
+
+    async def _acquire_global(self, deadline: float) -> str:
+        """Take one of the shared Redis leases, polling until the deadline"""
+        client = self._redis_client()
+        lease = uuid.uuid4().hex
+        # A lease outlives the longest possible agent call, then frees itself
+        lease_seconds = Config.AGENT_TIMEOUT + self.queue_timeout
+        queued = time.monotonic()
+        delay = 0.01
+        while True:
+            now = time.time()
+            if self._acquire_script(keys=[self.KEY], args=[now, now + lease_seconds,
+                                                           self.global_max_in_flight, lease], client=client):
+                return lease
+            if time.monotonic() + delay >= deadline:
+                self._reject_deadline(queued)
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, 0.2)
+
+    def _release_global(self, lease: str):
+        try:
+            self._redis_client().zrem(self.KEY, lease)
+        except Exception as e:
+            print(f"⚠️  Could not release upstream lease (it will expire): {e!r}")
+
+    def stats(self) -> Dict:
+        with self._lock:
+            admitted = self._counts['admitted']
+            return {
+                'enabled': self.enabled,
+                'scope': self.scope,
+                'max_in_flight': self.max_in_flight,
+                'max_queue': self.max_queue,
+                'in_flight': self.in_flight,
+                'queue_depth': len(self._waiters),
+                'peak_queue_depth': self._peak_queue,
+                **self._counts,
+                'mean_wait_ms': round(self._total_wait / admitted * 1000, 1) if admitted else 0.0,
+            }
+
+
+# Global controller (one per worker process)
+admission = AdmissionController()
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=admission.reset)
+
+metrics.gauge('llm_admission_in_flight', 'Agent calls holding an upstream slot').set_function(
+    lambda: admission.in_flight)
+metrics.gauge('llm_admission_queue_depth', 'Agent calls waiting for an upstream slot').set_function(
+    lambda: len(admission._waiters))
@@ -0,0 +1,189 @@
+"""
+Bulk grading of archived question/answer pairs
+"""
+import asyncio
+import json
+from collections import OrderedDict
+from typing import AsyncIterator, Dict, Iterable, Iterator, Optional
+
+from app.config import Config
+from app.services.token_budget import apply_answer_budget
+
+REQUIRED_FIELDS = ('technology', 'position', 'question', 'answer')
+
+# InterviewAgents kept per worker, one per technology/position
+AGENTS_PER_WORKER = 16
+
+
+def parse_jsonl(lines: Iterable) -> Iterator[Dict]:
+    """Yield one record per non-blank JSONL line; unparseable lines yield {'_error': ...}"""
+    for number, line in enumerate(lines, 1):
+        if isinstance(line, bytes):
+            line = line.decode('utf-8')
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+        except json.JSONDecodeError as e:
+            yield {'_error': f"Line {number} is not valid JSON: {e.msg}"}
+            continue
+        yield record if isinstance(record, dict) else {'_error': f"Line {number} is not a JSON object"}
+
+
+class BulkGrader:
+    """
+    Grades many {technology, position, question, answer} records with a
+    fixed number of workers.
+
+    Each worker keeps its own InterviewAgents per technology/position and
+    resets them between records, so agents and memory scale with the
+    concurrency rather than the number of records; model clients come from
+    the worker's shared llm_pool. Reading ahead is bounded, so records can
+    be streamed in and results streamed out.
+    """
+
+    def __init__(self, concurrency: int = None, order: str = 'input', evaluation_mode: str = None):
+        """
+        Args:
+            concurrency: Records graded at once (defaults to BULK_GRADING_CONCURRENCY)
+            order: 'input' to emit results in input order, 'completion' as they finish
+            evaluation_mode: 'separate' or 'combined' (defaults to EVALUATION_MODE)
+        """
+        if order not in ('input', 'completion'):
+            raise ValueError("order must be 'input' or 'completion'")
+        self.concurrency = max(1, concurrency or Config.BULK_GRADING_CONCURRENCY)
+        self.order = order
+        self.evaluation_mode = evaluation_mode
+
+    async def grade(self, records: Iterable[Dict]) -> AsyncIterator[Dict]:
+        """
+        Grade records, yielding one result per record
+
+        Every result carries the record's `index` (and `id` if it had one).
+        Invalid records and failed gradings yield a result with `error`
+        instead of stopping the run.
+        """
+        # Records read but not yet emitted; bounds the reorder buffer too
+        window = asyncio.Semaphore(self.concurrency * 4)
+        todo: asyncio.Queue = asyncio.Queue(maxsize=self.concurrency)
+        done: asyncio.Queue = asyncio.Queue()
+
+        async def feed():
+            error = None
+            try:
+                # The input may be a file, stdin or a request body; reading it
+                # blocks, so pull each record on a thread, not on the loop
+                it = iter(records)
+                index = 0
+                while True:
+                    await window.acquire()
+                    record = await asyncio.to_thread(next, it, None)
+                    if record is None:
+                        window.release()
+                        break
+                    await todo.put((index, record))
+                    index += 1
+            except Exception as e:
+                error = e
+            for _ in range(self.concurrency):
+                await todo.put(None)
+            if error is not None:
+                raise error
+
+        async def work():
+            agents_by_key: "OrderedDict[tuple, object]" = OrderedDict()
+            while True:
+                item = await todo.get()
+                if item is None:
+                    return
+                await done.put(await self._grade_one(*item, agents_by_key))
+
+        async def finish():
+            await asyncio.gather(feeder, *workers, return_exceptions=True)
+            await done.put(None)
+
+        feeder = asyncio.ensure_future(feed())
+        workers = [asyncio.ensure_future(work()) for _ in range(self.concurrency)]
+        finisher = asyncio.ensure_future(finish())
+
+        try:
+            next_index, buffered = 0, {}
+            while True:
+                result = await done.get()
+                if result is None:
+                    break
+                if self.order == 'completion':
+                    window.release()
+                    yield result
+                    continue
+                buffered[result['index']] = result
+                while next_index in buffered:
+                    window.release()
+                    yield buffered.pop(next_index)
+                    next_index += 1
+            # A failed read of the input surfaces here
+            if feeder.exception() is not None:
+                raise feeder.exception()
+        finally:
+            for task in (feeder, finisher, *workers):
+                task.cancel()
+
+    def _agents_for(self, agents_by_key: OrderedDict, technology: str, position: str):
+        """Reuse this worker's agents for a technology/position, evicting the least recently used"""
+        from agents import InterviewAgents
+
+        key = (technology, position)
+        agents = agents_by_key.pop(key, None)
+        if agents is None:
+            agents = InterviewAgents(technology, position, evaluation_mode=self.evaluation_mode)
+            if len(agents_by_key) >= AGENTS_PER_WORKER:
+                agents_by_key.popitem(last=False)
+        agents_by_key[key] = agents
+        agents.reset()
+        return agents
+
+    async def _grade_one(self, index: int, record: Dict, agents_by_key: OrderedDict) -> Dict:
+        result = {'index': index}
+        if 'id' in record:
+            result['id'] = record['id']
+        if '_error' in record:
+            result['error'] = record['_error']
+            return result
+        missing = [field for field in REQUIRED_FIELDS
+                   if not isinstance(record.get(field), str) or not record[field].strip()]
+        if missing:
+            result['error'] = f"Missing {', '.join(missing)}"
+            return result
+
+        try:
+            answer, answer_truncated = apply_answer_budget(record['answer'])
+            agents = self._agents_for(agents_by_key, record['technology'], record['position'])
+            qa_record = await agents.process_answer(record['question'], answer, 1)
+        except asyncio.CancelledError:
+            raise
+        except TimeoutError as e:
+            result['error'] = f"Upstream model timed out: {e}"
+            return result
+        except Exception as e:
+            result['error'] = str(e) or type(e).__name__
+            return result
+
+        result.update({
+            'question': qa_record['question'],
+            'feedback': qa_record['feedback'],
+            'feedback_available': qa_record['feedback_available'],
+            'score': qa_record['score'],
+            'score_details': qa_record['score_details'],
+            'score_available': qa_record['score_available'],
+            'answer_truncated': answer_truncated,
+            'total_tokens': agents.usage.total_tokens,
+        })
+        return result
+
+
+async def grade_jsonl(lines: Iterable, concurrency: Optional[int] = None, order: str = 'input',
+                      evaluation_mode: Optional[str] = None) -> AsyncIterator[str]:
+    """Grade JSONL input lines, yielding JSONL output lines"""
+    grader = BulkGrader(concurrency, order, evaluation_mode)
+    async for result in grader.grade(parse_jsonl(lines)):
+        yield json.dumps(result) + "\n"
@@ -0,0 +1,100 @@
+"""
+Long-lived asyncio event loop shared by every request in a worker
+"""
+import asyncio
+import concurrent.futures
+import contextvars
+import os
+import threading
+from functools import wraps
+
+
+class WorkerEventLoop:
+    """
+    Runs one asyncio loop in a daemon thread for the lifetime of the worker.
+
+    Flask's default async support spins up a throwaway loop per request,
+    which makes loop-bound resources (keep-alive HTTP connections, locks,
+    background tasks) useless across requests. Routing coroutines through
+    this loop keeps them alive.
+    """
+
+    def __init__(self):
+        self._loop = None
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def get_loop(self) -> asyncio.AbstractEventLoop:
+        """Get the worker loop, starting it on first use"""
+        with self._lock:
+            if self._loop is None or self._loop.is_closed():
+                self._loop = asyncio.new_event_loop()
+                self._thread = threading.Thread(
+                    target=self._loop.run_forever,
+                    name='worker-event-loop',
+                    daemon=True,
+                )
+                self._thread.start()
+            return self._loop
+
+    def attach(self, loop: asyncio.AbstractEventLoop):
+        """Adopt an already running loop (e.g. the ASGI server's) as the worker loop"""
+        with self._lock:
+            self._loop = loop
+            self._thread = threading.current_thread()
+
+    def submit(self, coro) -> concurrent.futures.Future:
+        """
+        Schedule a coroutine on the worker loop from any thread
+
+        The caller's context variables (e.g. Flask's request context) are
+        copied into the task.
+        """
+        loop = self.get_loop()
+        future = concurrent.futures.Future()
+
+        def _copy_result(task):
+            if future.cancelled():
+                return
+            if task.cancelled():
+                future.cancel()
+            elif task.exception() is not None:
+                future.set_exception(task.exception())
+            else:
+                future.set_result(task.result())
+
+        def _start():
+            task = loop.create_task(coro)
+            task.add_done_callback(_copy_result)
+
+        loop.call_soon_threadsafe(_start, context=contextvars.copy_context())
+        return future
+
+    def run(self, coro):
+        """Run a coroutine on the worker loop and block until it finishes"""
+        if threading.current_thread() is self._thread:
+            coro.close()
+            raise RuntimeError("WorkerEventLoop.run() would block its own loop; await the coroutine instead")
+        return self.submit(coro).result()
+
+    def async_to_sync(self, func):
+        """Wrap an async function so sync callers run it on the worker loop"""
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            return self.run(func(*args, **kwargs))
+
+        return wrapper
+
+    def reset(self):
+        """Drop the loop (used after fork, where the loop thread does not exist)"""
+        self._loop = None
+        self._thread = None
+        self._lock = threading.Lock()
+
+
+# Global loop instance (one per worker process)
+worker_loop = WorkerEventLoop()
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=worker_loop.reset)
@@ -0,0 +1,71 @@
+"""
+Idempotency keys for interview requests that call the model
+"""
+import hashlib
+import time
+from collections import OrderedDict
+from typing import Dict, List, Optional
+
+from app.config import Config
+
+# Longest Idempotency-Key header accepted
+MAX_KEY_LENGTH = 255
+
+
+class IdempotencyConflict(ValueError):
+    """An idempotency key was reused for a different request"""
+
+
+def fingerprint(*parts: str) -> str:
+    """Short digest of the request fields a key is bound to"""
+    return hashlib.sha1('\x00'.join(parts).encode('utf-8')).hexdigest()[:16]
+
+
+class IdempotencyCache:
+    """
+    One session's recently completed keyed requests, plus those still running.
+
+    Completed results are kept for `IDEMPOTENCY_TTL` seconds (at most
+    `IDEMPOTENCY_MAX_KEYS` per session, oldest dropped first) and travel
+    with the session state, so a retry that lands on another worker is
+    replayed too. In-flight requests are tracked as tasks that duplicates
+    await instead of starting their own model calls.
+    """
+
+    __slots__ = ('entries', 'in_flight')
+
+    def __init__(self, entries: Optional[List] = None):
+        # key -> (fingerprint, result, expires_at)
+        self.entries: "OrderedDict[str, tuple]" = OrderedDict(
+            (key, (digest, result, expires_at)) for key, digest, result, expires_at in entries or ()
+        )
+        self.in_flight: Dict[str, object] = {}
+
+    def lookup(self, key: str, digest: str) -> Optional[Dict]:
+        """
+        The stored result for `key`, or None
+
+        Raises:
+            IdempotencyConflict: If the key was used for a different request
+        """
+        entry = self.entries.get(key)
+        if entry is None:
+            return None
+        if entry[2] < time.time():
+            del self.entries[key]
+            return None
+        if entry[0] != digest:
+            raise IdempotencyConflict("Idempotency-Key was already used for a different request")
+        return entry[1]
+
+    def remember(self, key: str, digest: str, result: Dict):
+        self.entries[key] = (digest, result, time.time() + Config.IDEMPOTENCY_TTL)
+        self.entries.move_to_end(key)
+        while len(self.entries) > Config.IDEMPOTENCY_MAX_KEYS:
+            self.entries.popitem(last=False)
+
+    def to_state(self) -> Optional[List]:
+        """Unexpired entries as JSON-serializable rows (None if there are none)"""
+        now = time.time()
+        rows = [[key, *entry] for key, entry in self.entries.items() if entry[2] >= now]
+        return rows or None
@@ -2,6 +2,8 @@
 Interview service for managing interview sessions
 """
 import asyncio
+import threading
+import time
 import uuid
 from typing import Dict, Optional
 from datetime import datetime, timedelta
@@ -10,83 +12,456 @@ import os
 # Import the agents from the parent directory
 import sys
 sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
-from agents import InterviewAgents
+from agents import InterviewAgents, QARecord
+from app.config import Config
+from app.services.idempotency import IdempotencyCache, IdempotencyConflict, fingerprint
+from app.services.metrics import (
+    idempotent_replays, metrics, session_conflicts, sessions_created, sessions_ended,
+)
+from app.services.question_cache import QuestionCache
+from app.services.session_store import MemorySessionStore, SessionConflict, create_session_store
+from app.services.token_budget import TokenUsage, apply_answer_budget
 
 
 class InterviewSession:
     """Represents an active interview session"""
     
+    __slots__ = (
+        'session_id', 'technology', 'position', '_agents', 'created_at', 'last_activity',
+        'current_question_number', 'current_question', 'is_active',
+        'prefetched_question', 'prefetched_for', 'prefetch_task', 'summary_task', 'idempotency',
+        'version',
+    )
+    
+    # Field order used for the compact history encoding in to_state()
+    HISTORY_FIELDS = QARecord.FIELDS
+    
     def __init__(self, session_id: str, technology: str, position: str):
         self.session_id = session_id
         self.technology = technology
         self.position = position
-        self.agents = InterviewAgents(technology, position)
+        # Many sessions are created and never started, so the agents wait for first use
+        self._agents: Optional[InterviewAgents] = None
         self.created_at = datetime.now()
-        self.last_activity = datetime.now()
+        self.last_activity = self.created_at
         self.current_question_number = 0
         self.current_question = None
         self.is_active = True
+        # Speculatively generated next question (see InterviewService prefetch)
+        self.prefetched_question = None
+        self.prefetched_for = None
+        self.prefetch_task = None
+        # Background refresh of the rolling assessment (see InterviewService rolling summary)
+        self.summary_task = None
+        # Results of requests sent with an Idempotency-Key (created on first use)
+        self.idempotency: Optional[IdempotencyCache] = None
+        # Set by the session store on every save; the session info ETag
+        self.version = 0
+    
+    @property
+    def agents(self) -> InterviewAgents:
+        if self._agents is None:
+            self._agents = InterviewAgents(self.technology, self.position)
+        return self._agents
     
     def to_dict(self) -> Dict:
         """Convert session to dictionary"""
+        agents = self._agents
         return {
             'session_id': self.session_id,
             'technology': self.technology,
             'position': self.position,
             'current_question_number': self.current_question_number,
-            'questions_answered': len(self.agents.interview_history),
-            'average_score': round(sum(self.agents.scores) / len(self.agents.scores), 2) if self.agents.scores else 0,
+            'questions_answered': len(agents.interview_history) if agents else 0,
+            'average_score': round(agents.average_score, 2) if agents else 0,
             'is_active': self.is_active,
+            'version': self.version,
             'created_at': self.created_at.isoformat(),
-            'last_activity': self.last_activity.isoformat()
+            'last_activity': self.last_activity.isoformat(),
+            'usage': (agents.usage if agents else TokenUsage()).to_dict()
         }
+    
+    def to_state(self) -> Dict:
+        """Compact, JSON-serializable snapshot of the session for external stores"""
+        agents = self._agents
+        return {
+            'id': self.session_id,
+            't': self.technology,
+            'p': self.position,
+            'c': self.created_at.timestamp(),
+            'a': self.last_activity.timestamp(),
+            'n': self.current_question_number,
+            'q': self.current_question,
+            'on': self.is_active,
+            'v': self.version,
+            'pq': self.prefetched_question,
+            'pn': self.prefetched_for,
+            'r': self.idempotency.to_state() if self.idempotency else None,
+            'u': agents.usage.to_state() if agents else None,
+            's': agents.summary_cache if agents else None,
+            'h': [item.to_row() for item in agents.interview_history] if agents else []
+        }
+    
+    @classmethod
+    def from_state(cls, state: Dict) -> 'InterviewSession':
+        """Rebuild a session from a to_state() snapshot"""
+        session = cls(state['id'], state['t'], state['p'])
+        session.created_at = datetime.fromtimestamp(state['c'])
+        session.last_activity = datetime.fromtimestamp(state['a'])
+        session.current_question_number = state['n']
+        session.current_question = state['q']
+        session.is_active = state['on']
+        session.version = state.get('v', 0)
+        session.prefetched_question = state.get('pq')
+        session.prefetched_for = state.get('pn')
+        if state.get('r'):
+            session.idempotency = IdempotencyCache(state['r'])
+        if state['h'] or state.get('u') or state.get('s'):
+            session.agents.load_history([QARecord(*row) for row in state['h']])
+            session.agents.usage.load_state(state.get('u'))
+            if state.get('s'):
+                session.agents.summary_cache = tuple(state['s'])
+        return session
 
 
 class InterviewService:
     """Service for managing interview sessions"""
     
-    def __init__(self):
-        self.sessions: Dict[str, InterviewSession] = {}
+    def __init__(self, store=None, prefetch: Optional[bool] = None, rolling_summary: Optional[bool] = None):
         # Get session timeout from environment or default to 2 hours
         timeout_hours = int(os.getenv('SESSION_TIMEOUT_HOURS', '2'))
         self.session_timeout = timedelta(hours=timeout_hours)
+        self.store = store or create_session_store(self.session_timeout)
+        self.prefetch = Config.PREFETCH_NEXT_QUESTION if prefetch is None else prefetch
+        self._prefetch_counts = {'hits': 0, 'misses': 0, 'discarded': 0}
+        self.rolling_summary = Config.ROLLING_SUMMARY if rolling_summary is None else rolling_summary
+        self.question_cache = QuestionCache() if Config.QUESTION_CACHE_ENABLED else None
+        # session_id -> futures of long-poll requests waiting for its next change
+        self._watchers: Dict[str, list] = {}
+        self._watchers_lock = threading.Lock()
+    
+    # -------------------- NEXT-QUESTION PREFETCH -------------------- #
+    
+    def _schedule_prefetch(self, session: InterviewSession):
+        """Start generating the next question in the background"""
+        self._discard_prefetch(session)
+        number = session.current_question_number + 1
+        session.prefetch_task = asyncio.ensure_future(self._prefetch(session, number))
+        session.prefetch_task.prefetch_for = number
+    
+    async def _prefetch(self, session: InterviewSession, number: int) -> Optional[str]:
+        """Generate question `number` and stash it on the session"""
+        try:
+            question = await session.agents.get_next_question(number)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            print(f"⚠️  Prefetch of question #{number} failed: {e!r}")
+            return None
+        
+        # The candidate may have moved on (or left) while we were generating
+        if session.is_active and session.current_question_number == number - 1:
+            session.prefetched_question = question
+            session.prefetched_for = number
+            if self._commit(session, background=True):
+                return question
+        self._prefetch_counts['discarded'] += 1
+        return None
+    
+    def _discard_prefetch(self, session: InterviewSession):
+        """Cancel any in-flight prefetch and drop a stashed question"""
+        task = session.prefetch_task
+        if task is not None and not task.done():
+            # delete_session runs on a request thread, not on the task's loop
+            loop = task.get_loop()
+            if not loop.is_closed():
+                loop.call_soon_threadsafe(task.cancel)
+            self._prefetch_counts['discarded'] += 1
+        elif session.prefetched_question is not None:
+            self._prefetch_counts['discarded'] += 1
+        session.prefetch_task = None
+        session.prefetched_question = None
+        session.prefetched_for = None
+    
+    async def _take_prefetched(self, session: InterviewSession, number: int) -> Optional[str]:
+        """Claim the prefetched question `number`, waiting for it if still in flight"""
+        question = None
+        if session.prefetched_for == number and session.prefetched_question:
+            question = session.prefetched_question
+        else:
+            task = session.prefetch_task
+            if task is not None and getattr(task, 'prefetch_for', None) == number:
+                try:
+                    question = await asyncio.shield(task)
+                except asyncio.CancelledError:
+                    if task.cancelled():
+                        question = None
+                    else:
+                        raise
+        
+        session.prefetch_task = None
+        session.prefetched_question = None
+        session.prefetched_for = None
+        
+        if question:
+            self._prefetch_counts['hits'] += 1
+        else:
+            self._prefetch_counts['misses'] += 1
+        return question
+    
+    # -------------------- ROLLING SUMMARY -------------------- #
     
-    def _cleanup_expired_sessions(self):
-        """Remove expired sessions"""
-        now = datetime.now()
-        expired = [
-            sid for sid, session in self.sessions.items()
-            if now - session.last_activity > self.session_timeout
-        ]
-        for sid in expired:
-            del self.sessions[sid]
+    def _schedule_summary_refresh(self, session: InterviewSession):
+        """Fold the newest answers into the session's assessment in the background"""
+        task = session.summary_task
+        if task is not None and not task.done():
+            return  # the running refresh loops until it has caught up
+        session.summary_task = asyncio.ensure_future(self._refresh_summary(session))
+    
+    async def _refresh_summary(self, session: InterviewSession):
+        """Refresh the assessment until it covers every recorded answer"""
+        agents = session.agents
+        try:
+            while agents.scored_count and (agents.summary_cache or (-1,))[0] < agents.history_version:
+                await agents.refresh_summary()
+                if not self._commit(session, background=True):
+                    return  # another worker moved the session on; its next answer refreshes again
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            # /end falls back to generating the summary itself
+            print(f"⚠️  Rolling summary refresh failed: {e!r}")
+    
+    # -------------------- IDEMPOTENT REQUESTS -------------------- #
+    
+    async def _run_once(self, session: InterviewSession, operation: str, key: Optional[str],
+                        digest: str, run) -> Dict:
+        """
+        Run an operation at most once per idempotency key
+        
+        Without a key the operation just runs. With one, a finished result
+        for the same key is replayed and a duplicate that arrives while
+        the first is still running awaits the same task, so neither makes
+        model calls. The operation runs as its own task: a client that
+        disconnects doesn't cancel it, and its retry gets the result.
+        
+        Raises:
+            IdempotencyConflict: If the key was used for a different request
+        """
+        if not key:
+            return await run()
+        
+        cache = session.idempotency
+        if cache is None:
+            cache = session.idempotency = IdempotencyCache()
+        cache_key = f"{operation}:{key}"
+        
+        result = cache.lookup(cache_key, digest)
+        if result is not None:
+            idempotent_replays.inc(kind='replay')
+            return result
+        
+        task = cache.in_flight.get(cache_key)
+        if task is not None:
+            if task.digest != digest:
+                raise IdempotencyConflict("Idempotency-Key is in use by a different request")
+            idempotent_replays.inc(kind='join')
+            return await asyncio.shield(task)
+        
+        async def run_and_remember():
+            result = await run()
+            cache.remember(cache_key, digest, result)
+            self._commit(session)  # so a retry on another worker is replayed too
+            return result
+        
+        task = asyncio.ensure_future(run_and_remember())
+        task.digest = digest
+        cache.in_flight[cache_key] = task
+        
+        def finished(task):
+            cache.in_flight.pop(cache_key, None)
+            if not task.cancelled():
+                task.exception()  # retrieved here in case every caller went away
+        
+        task.add_done_callback(finished)
+        return await asyncio.shield(task)
+    
+    # -------------------- CHANGE NOTIFICATION -------------------- #
+    
+    # Saves of a request's change attempted before giving up on a busy session
+    COMMIT_ATTEMPTS = 5
+    
+    def _commit(self, session: InterviewSession, background: bool = False) -> bool:
+        """
+        Save a changed session (the store assigns its new version) and wake long-polls waiting on it
+        
+        With a shared store another worker may have saved the session since
+        this copy was read. A request's change still goes through: results
+        of background work in the newer copy (rolling summary, prefetched
+        question, idempotent replies) are carried over and the save retried.
+        A background write is dropped instead, as it was made on an
+        out-of-date copy.
+        
+        Returns:
+            False if a background write was dropped
+        
+        Raises:
+            ValueError: If the session was deleted meanwhile
+            SessionConflict: If other saves kept winning the race
+        """
+        for _ in range(self.COMMIT_ATTEMPTS):
+            try:
+                self.store.save(session)
+                break
+            except SessionConflict:
+                if background:
+                    session_conflicts.inc(outcome='dropped')
+                    return False
+                latest = self.store.get(session.session_id)
+                if latest is None:
+                    raise ValueError("Session not found")
+                self._carry_over(latest, session)
+                session.version = latest.version
+                session_conflicts.inc(outcome='merged')
+        else:
+            raise SessionConflict("Session is busy with other requests, please retry")
+        self._notify(session.session_id)
+        return True
+    
+    @staticmethod
+    def _carry_over(latest: InterviewSession, session: InterviewSession):
+        """Copy background results from a newer stored copy that still apply to this one"""
+        theirs = latest._agents.summary_cache if latest._agents else None
+        if theirs and theirs[0] <= session.agents.history_version:
+            ours = session.agents.summary_cache
+            if ours is None or ours[0] < theirs[0]:
+                session.agents.summary_cache = theirs
+        if (session.prefetched_question is None and latest.prefetched_question
+                and latest.prefetched_for == session.current_question_number + 1):
+            session.prefetched_question = latest.prefetched_question
+            session.prefetched_for = latest.prefetched_for
+        if latest.idempotency:
+            if session.idempotency is None:
+                session.idempotency = IdempotencyCache()
+            for key, entry in latest.idempotency.entries.items():
+                session.idempotency.entries.setdefault(key, entry)
+    
+    def _notify(self, session_id: str):
+        with self._watchers_lock:
+            waiters = self._watchers.pop(session_id, ())
+        for waiter in waiters:
+            # Saves also happen on request threads, not only on the waiters' loop
+            waiter.get_loop().call_soon_threadsafe(self._wake, waiter)
+    
+    @staticmethod
+    def _wake(waiter: asyncio.Future):
+        if not waiter.done():
+            waiter.set_result(None)
+    
+    def session_version(self, session_id: str) -> int:
+        """Current version of a session (its info ETag)"""
+        session = self.get_session(session_id)
+        if not session:
+            raise ValueError("Session not found")
+        return session.version
+    
+    async def wait_for_change(self, session_id: str, version: int, timeout: float) -> int:
+        """
+        Wait until the session's version differs from `version`
+        
+        Changes made by this worker wake the wait at once. With a shared
+        store another worker may change the session, so the store is also
+        re-read every LONG_POLL_INTERVAL seconds, in a thread so a network
+        round trip doesn't block the loop.
+        
+        Returns:
+            The session's version when it changed or the timeout expired
+        
+        Raises:
+            ValueError: If the session doesn't exist (or is deleted meanwhile)
+        """
+        deadline = time.monotonic() + timeout
+        loop = asyncio.get_running_loop()
+        while True:
+            waiter = loop.create_future()
+            with self._watchers_lock:
+                self._watchers.setdefault(session_id, []).append(waiter)
+            # Registered first, so a change between this read and the wait isn't missed
+            session = await asyncio.to_thread(self.store.get, session_id)
+            if not session:
+                self._unwatch(session_id, waiter)
+                raise ValueError("Session not found")
+            current = session.version
+            remaining = deadline - time.monotonic()
+            if current != version or remaining <= 0:
+                self._unwatch(session_id, waiter)
+                return current
+            try:
+                await asyncio.wait_for(waiter, min(remaining, Config.LONG_POLL_INTERVAL))
+            except asyncio.TimeoutError:
+                pass
+            finally:
+                self._unwatch(session_id, waiter)
+    
+    def _unwatch(self, session_id: str, waiter: asyncio.Future):
+        with self._watchers_lock:
+            waiters = self._watchers.get(session_id)
+            if waiters and waiter in waiters:
+                waiters.remove(waiter)
+                if not waiters:
+                    del self._watchers[session_id]
+    
+    def prefetch_stats(self) -> Dict:
+        """Prefetch hit/miss counters for this worker"""
+        lookups = self._prefetch_counts['hits'] + self._prefetch_counts['misses']
+        return {
+            'enabled': self.prefetch,
+            **self._prefetch_counts,
+            'hit_rate': round(self._prefetch_counts['hits'] / lookups, 3) if lookups else 0.0
+        }
     
     def create_session(self, technology: str, position: str) -> str:
         """Create a new interview session"""
-        self._cleanup_expired_sessions()
-        
         session_id = str(uuid.uuid4())
         session = InterviewSession(session_id, technology, position)
-        self.sessions[session_id] = session
+        self._commit(session)
+        sessions_created.inc()
         
         return session_id
     
     def get_session(self, session_id: str) -> Optional[InterviewSession]:
         """Get an interview session by ID"""
-        session = self.sessions.get(session_id)
+        session = self.store.get(session_id)
         if session:
-            session.last_activity = datetime.now()
+            self.store.touch(session)
         return session
     
-    async def start_interview(self, session_id: str) -> Dict:
+    async def _opening_question(self, session: InterviewSession, on_token=None) -> str:
+        """Get question #1, from the question cache when possible"""
+        if self.question_cache is None or session.agents.interview_history:
+            return await session.agents.get_next_question(1, on_token)
+        
+        key = self.question_cache.make_key(session.technology, session.position, 1)
+        question = self.question_cache.get(key)
+        if question is not None:
+            if on_token:
+                on_token(session.agents.interviewer.name, question)
+            return question
+        
+        question = await session.agents.get_next_question(1, on_token)
+        self.question_cache.put(key, question)
+        return question
+    
+    async def start_interview(self, session_id: str, on_token=None) -> Dict:
         """Start an interview and get the first question"""
         session = self.get_session(session_id)
         if not session:
             raise ValueError("Session not found")
         
         session.current_question_number = 1
-        question = await session.agents.get_next_question(1)
+        question = await self._opening_question(session, on_token)
         session.current_question = question
+        self._commit(session)
         
         return {
             'session_id': session_id,
@@ -94,56 +469,108 @@ class InterviewService:
             'question': question
         }
     
-    async def submit_answer(self, session_id: str, answer: str) -> Dict:
+    async def submit_answer(self, session_id: str, answer: str, on_token=None,
+                            idempotency_key: Optional[str] = None) -> Dict:
         """Submit an answer and get feedback and score"""
         session = self.get_session(session_id)
         if not session:
             raise ValueError("Session not found")
         
+        return await self._run_once(
+            session, 'answer', idempotency_key, fingerprint(answer),
+            lambda: self._submit_answer(session, answer, on_token)
+        )
+    
+    async def _submit_answer(self, session: InterviewSession, answer: str, on_token=None) -> Dict:
         if not session.current_question:
             raise ValueError("No active question")
         
+        answer, answer_truncated = apply_answer_budget(answer)
+        
         # Process the answer
         result = await session.agents.process_answer(
             session.current_question,
             answer,
-            session.current_question_number
+            session.current_question_number,
+            on_token
         )
+        self._commit(session)
+        
+        if self.prefetch and session.is_active:
+            self._schedule_prefetch(session)
+        if self.rolling_summary:
+            self._schedule_summary_refresh(session)
         
         return {
-            'session_id': session_id,
+            'session_id': session.session_id,
             'question_number': result['question_number'],
             'question': result['question'],
             'answer': result['answer'],
             'feedback': result['feedback'],
+            'feedback_available': result['feedback_available'],
             'score': result['score'],
-            'score_details': result['score_details']
+            'score_details': result['score_details'],
+            'score_available': result['score_available'],
+            'answer_truncated': answer_truncated
         }
     
-    async def get_next_question(self, session_id: str) -> Dict:
+    async def get_next_question(self, session_id: str, on_token=None,
+                                idempotency_key: Optional[str] = None) -> Dict:
         """Get the next question"""
         session = self.get_session(session_id)
         if not session:
             raise ValueError("Session not found")
         
-        session.current_question_number += 1
-        question = await session.agents.get_next_question(session.current_question_number)
+        return await self._run_once(
+            session, 'next-question', idempotency_key, fingerprint(),
+            lambda: self._next_question(session, on_token)
+        )
+    
+    async def _next_question(self, session: InterviewSession, on_token=None) -> Dict:
+        number = session.current_question_number + 1
+        question = await self._take_prefetched(session, number) if self.prefetch else None
+        if question is not None:
+            if on_token:
+                on_token(session.agents.interviewer.name, question)
+        else:
+            question = await session.agents.get_next_question(number, on_token)
+        session.current_question_number = number
         session.current_question = question
+        self._commit(session)
         
         return {
-            'session_id': session_id,
+            'session_id': session.session_id,
             'question_number': session.current_question_number,
             'question': question
         }
     
-    async def end_interview(self, session_id: str) -> Dict:
-        """End the interview and get summary"""
+    async def end_interview(self, session_id: str, on_token=None, refresh: bool = False) -> Dict:
+        """
+        End the interview and get summary
+        
+        With a rolling summary the latest assessment is returned straight
+        away (`summary_current` is false if the newest answers aren't folded
+        in yet); `refresh=True` waits for it to cover every answer.
+        """
         session = self.get_session(session_id)
         if not session:
             raise ValueError("Session not found")
         
-        session.is_active = False
-        summary = await session.agents.get_overall_summary()
+        if session.is_active:
+            # Repeat /end calls (a retry, another tab) only fetch the summary again
+            session.is_active = False
+            self._discard_prefetch(session)
+            self._commit(session)
+            sessions_ended.inc()
+        cached = session.agents.summary_cache
+        task = session.summary_task
+        if task is not None and not task.done() and (refresh or cached is None):
+            await asyncio.shield(task)
+            cached = session.agents.summary_cache
+        summary = await session.agents.get_overall_summary(
+            on_token, allow_stale=self.rolling_summary and not refresh)
+        if session.agents.summary_cache != cached:
+            self._commit(session)  # keep the summary for repeat /end calls on other workers
         
         return {
             'session_id': session_id,
@@ -162,12 +589,26 @@ class InterviewService:
     
     def delete_session(self, session_id: str) -> bool:
         """Delete a session"""
-        if session_id in self.sessions:
-            del self.sessions[session_id]
-            return True
-        return False
+        session = self.store.get(session_id)
+        if session:
+            self._discard_prefetch(session)
+            task = session.summary_task
+            if task is not None and not task.done():
+                # Like the prefetch task, it belongs to the worker loop, not this request thread
+                loop = task.get_loop()
+                if not loop.is_closed():
+                    loop.call_soon_threadsafe(task.cancel)
+        deleted = self.store.delete(session_id)
+        self._notify(session_id)  # waiting long-polls answer 404
+        return deleted
 
 
 # Global service instance
 interview_service = InterviewService()
 
+# In-memory sessions are per worker and add up; a shared store reports the same total everywhere
+metrics.gauge(
+    'interview_sessions_live', 'Interview sessions that have not expired',
+    multiprocess_mode='sum' if isinstance(interview_service.store, MemorySessionStore) else 'max',
+).set_function(interview_service.store.count)
+
@@ -0,0 +1,151 @@
+"""
+Process-wide pool of shared LLM clients
+"""
+import os
+import threading
+from typing import TYPE_CHECKING, Dict, Optional, Tuple
+
+import httpx
+
+from app.config import Config
+
+if TYPE_CHECKING:
+    # Imported on first use instead: openai and autogen are slow to import
+    from autogen_ext.models.openai import OpenAIChatCompletionClient
+
+
+MODEL_INFO = {
+    "vision": False,
+    "function_calling": True,
+    "json_output": True,
+    "structured_output": False,
+    "family": "unknown",
+}
+
+
+class LLMClientPool:
+    """
+    Hands out one shared OpenAIChatCompletionClient per model and settings.
+
+    All clients pointing at the same base_url share a single keep-alive
+    HTTP connection pool, so the TCP/TLS handshake to the provider is paid
+    once per worker instead of once per interview session.
+    """
+
+    def __init__(self, max_connections: int = None, max_keepalive: int = None,
+                 keepalive_expiry: float = None):
+        self.max_connections = max_connections or Config.LLM_POOL_MAX_CONNECTIONS
+        self.max_keepalive = max_keepalive or Config.LLM_POOL_MAX_KEEPALIVE
+        self.keepalive_expiry = keepalive_expiry or Config.LLM_POOL_KEEPALIVE_EXPIRY
+
+        self._lock = threading.Lock()
+        self._clients: Dict[Tuple, 'OpenAIChatCompletionClient'] = {}
+        self._http_clients: Dict[str, httpx.AsyncClient] = {}
+        self._borrows = 0
+        self._created = 0
+
+    def _get_http_client(self, base_url: str) -> httpx.AsyncClient:
+        """Get (or create) the keep-alive HTTP pool for a base URL. Caller holds the lock."""
+        http_client = self._http_clients.get(base_url)
+        if http_client is None:
+            from openai import DefaultAsyncHttpxClient
+
+            http_client = DefaultAsyncHttpxClient(
+                limits=httpx.Limits(
+                    max_connections=self.max_connections,
+                    max_keepalive_connections=self.max_keepalive,
+                    keepalive_expiry=self.keepalive_expiry,
+                )
+            )
+            self._http_clients[base_url] = http_client
+        return http_client
+
+    def get_client(self, model: str, base_url: str, api_key: Optional[str] = None,
+                   temperature: Optional[float] = None, max_tokens: Optional[int] = None) -> 'OpenAIChatCompletionClient':
+        """
+        Borrow the shared model client for a model, base_url and sampling settings
+
+        Args:
+            model: Model name as understood by the provider
+            base_url: OpenAI-compatible API base URL
+            api_key: API key used if the client has to be created
+            temperature: Sampling temperature (provider default if None)
+            max_tokens: Completion length cap (provider default if None)
+
+        Returns:
+            A shared OpenAIChatCompletionClient. Callers must not close it.
+        """
+        key = (model, base_url, temperature, max_tokens)
+        with self._lock:
+            self._borrows += 1
+            client = self._clients.get(key)
+            if client is None:
+                from autogen_ext.models.openai import OpenAIChatCompletionClient
+
+                settings = {'temperature': temperature, 'max_tokens': max_tokens}
+                client = OpenAIChatCompletionClient(
+                    model=model,
+                    api_key=api_key,
+                    base_url=base_url,
+                    http_client=self._get_http_client(base_url),
+                    model_info=MODEL_INFO,
+                    # InterviewAgents retries within its own deadline
+                    max_retries=0,
+                    # Agents always stream; ask for token usage in the final chunk
+                    stream_options={'include_usage': True},
+                    **{name: value for name, value in settings.items() if value is not None},
+                )
+                self._clients[key] = client
+                self._created += 1
+            return client
+
+    def http_client(self, base_url: str) -> httpx.AsyncClient:
+        """The shared keep-alive HTTP pool for a base URL (e.g. to pre-open connections)"""
+        with self._lock:
+            return self._get_http_client(base_url)
+
+    @staticmethod
+    def _connection_counts(http_client: httpx.AsyncClient) -> Dict:
+        """Count open and idle connections in an httpx pool"""
+        pool = getattr(getattr(http_client, '_transport', None), '_pool', None)
+        connections = list(getattr(pool, 'connections', []) or [])
+        idle = sum(1 for conn in connections if conn.is_idle())
+        return {'open': len(connections), 'idle': idle}
+
+    def stats(self) -> Dict:
+        """Get pool statistics"""
+        with self._lock:
+            return {
+                'clients': len(self._clients),
+                'borrows': self._borrows,
+                'reuses': self._borrows - self._created,
+                'max_connections': self.max_connections,
+                'max_keepalive': self.max_keepalive,
+                'connections': {
+                    base_url: self._connection_counts(http_client)
+                    for base_url, http_client in self._http_clients.items()
+                },
+            }
+
+    async def aclose(self):
+        """Close every pooled HTTP connection (called on server shutdown)"""
+        with self._lock:
+            http_clients = list(self._http_clients.values())
+        for http_client in http_clients:
+            await http_client.aclose()
+        self.reset()
+
+    def reset(self):
+        """Forget all clients (used after fork, where inherited sockets are unusable)"""
+        with self._lock:
+            self._clients = {}
+            self._http_clients = {}
+            self._borrows = 0
+            self._created = 0
+
+
+# Global pool instance (one per worker process)
+llm_pool = LLMClientPool()
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=llm_pool.reset)
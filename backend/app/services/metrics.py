@@ -0,0 +1,394 @@
+"""
+In-process metrics with Prometheus text exposition
+"""
+import bisect
+import glob
+import json
+import math
+import os
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+from app.config import Config
+
+
+# Seconds; covers fast cache hits up to slow LLM completions
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0)
+
+
+class _Metric:
+    """Base for labelled metrics; one lock per metric keeps updates cheap"""
+
+    kind = ''
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+        self._values: Dict[Tuple, object] = {}
+
+    def _key(self, labels: Dict) -> Tuple:
+        return tuple(str(labels.get(name, '')) for name in self.labelnames)
+
+    def samples(self) -> List:
+        with self._lock:
+            return [[list(key), value] for key, value in self._values.items()]
+
+    def reset(self):
+        with self._lock:
+            self._values = {}
+
+
+class Counter(_Metric):
+    kind = 'counter'
+
+    def inc(self, amount: float = 1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels) -> float:
+        with self._lock:
+            return self._values.get(self._key(labels), 0)
+
+
+class Gauge(_Metric):
+    """
+    Gauge set directly or computed at collection time by a callback.
+
+    `multiprocess_mode` says how values from several workers combine:
+    'sum' for per-worker quantities, 'max' for values every worker sees
+    the same way (e.g. sessions in a shared Redis store).
+    """
+
+    kind = 'gauge'
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 multiprocess_mode: str = 'sum'):
+        super().__init__(name, documentation, labelnames)
+        self.multiprocess_mode = multiprocess_mode
+        self._function: Optional[Callable[[], float]] = None
+
+    def set(self, value: float, **labels):
+        with self._lock:
+            self._values[self._key(labels)] = value
+
+    def inc(self, amount: float = 1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def dec(self, amount: float = 1, **labels):
+        self.inc(-amount, **labels)
+
+    def set_function(self, function: Callable[[], float]):
+        """Compute the (unlabelled) value when metrics are collected"""
+        self._function = function
+
+    def samples(self) -> List:
+        if self._function is not None:
+            try:
+                return [[[], float(self._function())]]
+            except Exception:
+                return []
+        return super().samples()
+
+
+class Histogram(_Metric):
+    kind = 'histogram'
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value: float, **labels):
+        key = self._key(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                # Per-bucket (non-cumulative) counts, the last one is +Inf, then sum
+                state = self._values[key] = [0] * (len(self.buckets) + 1) + [0.0]
+            state[index] += 1
+            state[-1] += value
+
+    def samples(self) -> List:
+        with self._lock:
+            return [[list(key), list(state)] for key, state in self._values.items()]
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return '+Inf' if value > 0 else '-Inf'
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def _escape(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: Tuple = ()) -> str:
+    pairs = list(zip(names, values)) + list(extra)
+    if not pairs:
+        return ''
+    return '{' + ','.join(f'{name}="{_escape(str(value))}"' for name, value in pairs) + '}'
+
+
+class MetricsRegistry:
+    """
+    Registry of this worker's metrics.
+
+    With several gunicorn/uvicorn workers each one only sees its own
+    numbers, so when METRICS_DIR is set every worker periodically writes a
+    snapshot of its metrics there and a scrape merges all of them: counters
+    and histograms are summed (including workers that have since exited, so
+    they never go backwards) and gauges are combined by their
+    multiprocess_mode across live workers only.
+    """
+
+    def __init__(self, directory: str = None, snapshot_interval: float = None):
+        self.directory = directory if directory is not None else Config.METRICS_DIR
+        self.snapshot_interval = snapshot_interval or Config.METRICS_SNAPSHOT_INTERVAL
+        self._metrics: Dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+        self._writer_pid = None
+
+    def _register(self, metric: _Metric) -> _Metric:
+        with self._lock:
+            existing = self._metrics.get(metric.name)
+            if existing is not None:
+                return existing
+            self._metrics[metric.name] = metric
+            return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._register(Counter(name, documentation, labelnames))
+
+    def gauge(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+              multiprocess_mode: str = 'sum') -> Gauge:
+        return self._register(Gauge(name, documentation, labelnames, multiprocess_mode))
+
+    def histogram(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                  buckets: Sequence[float] = DEFAULT_BUCKETS) -> Histogram:
+        return self._register(Histogram(name, documentation, labelnames, buckets))
+
+    def snapshot(self) -> Dict:
+        """This worker's current values, in the format written to METRICS_DIR"""
+        with self._lock:
+            metrics = list(self._metrics.values())
+        return {
+            'pid': os.getpid(),
+            'time': time.time(),
+            'metrics': {
+                metric.name: {
+                    'type': metric.kind,
+                    'help': metric.documentation,
+                    'labelnames': list(metric.labelnames),
+                    'mode': getattr(metric, 'multiprocess_mode', None),
+                    'buckets': list(getattr(metric, 'buckets', ())),
+                    'samples': metric.samples(),
+                }
+                for metric in metrics
+            },
+        }
+
+    # -------------------- multi-worker -------------------- #
+
+    def _snapshot_path(self, pid: int) -> str:
+        return os.path.join(self.directory, f"worker-{pid}.json")
+
+    def write_snapshot(self):
+        """Atomically write this worker's snapshot to METRICS_DIR"""
+        if not self.directory:
+            return
+        os.makedirs(self.directory, exist_ok=True)
+        path = self._snapshot_path(os.getpid())
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(self.snapshot(), f, separators=(',', ':'))
+        os.replace(tmp_path, path)
+
+    def ensure_writer(self):
+        """Start the snapshot writer for this process if it isn't running"""
+        if not self.directory or self._writer_pid == os.getpid():
+            return
+        self._writer_pid = os.getpid()
+        threading.Thread(target=self._writer_loop, name='metrics-snapshot', daemon=True).start()
+
+    def _writer_loop(self):
+        while True:
+            time.sleep(self.snapshot_interval)
+            try:
+                self.write_snapshot()
+            except Exception as e:
+                print(f"⚠️  Metrics snapshot error: {e!r}")
+
+    @staticmethod
+    def _pid_alive(pid: int) -> bool:
+        try:
+            os.kill(pid, 0)
+        except ProcessLookupError:
+            return False
+        except PermissionError:
+            return True
+        return True
+
+    def _load_snapshots(self) -> List[Dict]:
+        """Every worker's snapshot, with this worker's taken live"""
+        own = self.snapshot()
+        if not self.directory:
+            return [own]
+        snapshots = [own]
+        for path in glob.glob(os.path.join(self.directory, 'worker-*.json')):
+            try:
+                with open(path) as f:
+                    data = json.load(f)
+            except (OSError, ValueError):
+                continue  # being replaced or removed right now
+            if data.get('pid') != own['pid']:
+                snapshots.append(data)
+        return snapshots
+
+    @staticmethod
+    def _merge(snapshots: List[Dict]) -> Dict:
+        merged: Dict[str, Dict] = {}
+        for snapshot in snapshots:
+            alive = snapshot['pid'] == os.getpid() or MetricsRegistry._pid_alive(snapshot['pid'])
+            for name, metric in snapshot['metrics'].items():
+                if metric['type'] == 'gauge' and not alive:
+                    continue
+                target = merged.setdefault(name, {**metric, 'samples': {}})
+                samples = target['samples']
+                for labels, value in metric['samples']:
+                    key = tuple(labels)
+                    current = samples.get(key)
+                    if current is None:
+                        samples[key] = list(value) if isinstance(value, list) else value
+                    elif metric['type'] == 'histogram':
+                        samples[key] = [a + b for a, b in zip(current, value)]
+                    elif metric['type'] == 'gauge' and metric.get('mode') == 'max':
+                        samples[key] = max(current, value)
+                    else:
+                        samples[key] = current + value
+        return merged
+
+    def render(self) -> str:
+        """All workers' metrics in the Prometheus text exposition format"""
+        lines = []
+        merged = self._merge(self._load_snapshots())
+        for name in sorted(merged):
+            metric = merged[name]
+            lines.append(f"# HELP {name} {metric['help']}")
+            lines.append(f"# TYPE {name} {metric['type']}")
+            labelnames = metric['labelnames']
+            for labels, value in sorted(metric['samples'].items()):
+                if metric['type'] != 'histogram':
+                    lines.append(f"{name}{_format_labels(labelnames, labels)} {_format_value(value)}")
+                    continue
+                cumulative = 0
+                bounds = list(metric['buckets']) + [math.inf]
+                for bound, count in zip(bounds, value[:-1]):
+                    cumulative += count
+                    le = (('le', _format_value(bound)),)
+                    lines.append(f"{name}_bucket{_format_labels(labelnames, labels, le)} {cumulative}")
+                lines.append(f"{name}_sum{_format_labels(labelnames, labels)} {_format_value(value[-1])}")
+                lines.append(f"{name}_count{_format_labels(labelnames, labels)} {cumulative}")
+        return '\n'.join(lines) + '\n'
+
+    def init_app(self, app):
+        """Time every request by route and serve the merged metrics at /metrics"""
+        from flask import Response, g, request
+
+        @app.before_request
+        def _start_metrics_timer():
+            self.ensure_writer()
+            g.metrics_started = time.perf_counter()
+            http_requests_in_flight.inc()
+
+        @app.after_request
+        def _observe_request(response):
+            started = g.get('metrics_started')
+            if started is not None:
+                http_request_duration.observe(
+                    time.perf_counter() - started,
+                    method=request.method,
+                    # Unmatched URLs share one label so the series count stays bounded
+                    endpoint=request.endpoint or 'unmatched',
+                    status=response.status_code,
+                )
+            return response
+
+        @app.teardown_request
+        def _end_request(exc):
+            if g.pop('metrics_started', None) is not None:
+                http_requests_in_flight.dec()
+
+        @app.route('/metrics')
+        def metrics_endpoint():
+            return Response(self.render(), mimetype='text/plain; version=0.0.4')
+
+    def reset(self):
+        """Zero every metric (used after fork so a worker starts from its own counts)"""
+        with self._lock:
+            metrics = list(self._metrics.values())
+        for metric in metrics:
+            metric.reset()
+        self._writer_pid = None
+
+
+# Global registry (one per worker process)
+metrics = MetricsRegistry()
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=metrics.reset)
+
+# -------------------- metric definitions -------------------- #
+
+http_requests_in_flight = metrics.gauge(
+    'http_requests_in_flight', 'Requests currently being handled')
+ws_connections = metrics.gauge(
+    'interview_ws_connections', 'Open interview WebSocket connections')
+http_request_duration = metrics.histogram(
+    'http_request_duration_seconds', 'HTTP request latency by route',
+    ('method', 'endpoint', 'status'))
+llm_request_duration = metrics.histogram(
+    'llm_request_duration_seconds', 'Agent call latency including retries',
+    ('agent', 'model', 'outcome'))
+llm_time_to_first_token = metrics.histogram(
+    'llm_time_to_first_token_seconds', 'Time from sending a prompt to the first streamed token',
+    ('agent', 'model'))
+llm_prompt_tokens = metrics.counter(
+    'llm_prompt_tokens_total', 'Prompt tokens sent to the model', ('agent',))
+llm_completion_tokens = metrics.counter(
+    'llm_completion_tokens_total', 'Completion tokens generated by the model', ('agent',))
+llm_calls = metrics.counter(
+    'llm_calls_total', 'Agent calls started', ('agent',))
+llm_retries = metrics.counter(
+    'llm_retries_total', 'Agent call attempts retried after a retryable error', ('agent',))
+llm_timeouts = metrics.counter(
+    'llm_timeouts_total', 'Agent call attempts that hit their deadline', ('agent',))
+llm_failures = metrics.counter(
+    'llm_failures_total', 'Agent calls that failed after retries', ('agent',))
+evaluation_fallbacks = metrics.counter(
+    'llm_evaluation_fallbacks_total', 'Combined evaluations that fell back to Coach + Scorer')
+upstream_queue_wait = metrics.histogram(
+    'llm_admission_wait_seconds', 'Time agent calls waited for an upstream slot')
+upstream_rejected = metrics.counter(
+    'llm_admission_rejected_total', 'Agent calls refused by admission control', ('reason',))
+summary_cache_hits = metrics.counter(
+    'llm_summary_cache_hits_total', 'Overall summaries served without a model call')
+idempotent_replays = metrics.counter(
+    'interview_idempotent_replays_total', 'Keyed requests answered from a finished or in-flight duplicate',
+    ('kind',))
+session_conflicts = metrics.counter(
+    'interview_session_conflicts_total', 'Session saves that lost a race with another worker',
+    ('outcome',))
+sessions_created = metrics.counter(
+    'interview_sessions_created_total', 'Interview sessions created')
+sessions_ended = metrics.counter(
+    'interview_sessions_ended_total', 'Interviews ended with a summary')
@@ -0,0 +1,93 @@
+"""
+Cache of generated opening questions
+"""
+import itertools
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+
+from app.config import Config
+
+
+class QuestionCache:
+    """
+    Bounded LRU + TTL cache of interview questions that don't depend on history.
+
+    Each key (normalized technology, position and question number) holds a
+    small pool of question variants. Until a pool is full every lookup is a
+    miss, so the caller asks the LLM and adds another variant. Once full,
+    lookups rotate through the variants without calling the LLM. Variants
+    expire individually, so pools keep refreshing over time.
+    """
+
+    def __init__(self, max_keys: int = None, ttl: float = None, variants: int = None):
+        self.max_keys = max_keys if max_keys is not None else Config.QUESTION_CACHE_MAX_KEYS
+        self.ttl = ttl if ttl is not None else Config.QUESTION_CACHE_TTL
+        self.variants = variants if variants is not None else Config.QUESTION_CACHE_VARIANTS
+
+        self._lock = threading.Lock()
+        # key -> list of (question, added_at)
+        self._pools: "OrderedDict[Tuple, list]" = OrderedDict()
+        self._rotation = itertools.count()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    @staticmethod
+    def make_key(technology: str, position: str, question_number: int = 1) -> Tuple:
+        """Normalize case and whitespace so equivalent inputs share a key"""
+        def normalize(value: str) -> str:
+            return ' '.join(value.lower().split())
+        return (normalize(technology), normalize(position), question_number)
+
+    def _live_pool(self, key: Tuple) -> Optional[list]:
+        """Get a key's pool with expired variants removed. Caller holds the lock."""
+        pool = self._pools.get(key)
+        if pool is None:
+            return None
+        cutoff = time.monotonic() - self.ttl
+        pool[:] = [item for item in pool if item[1] > cutoff]
+        if not pool:
+            del self._pools[key]
+            return None
+        return pool
+
+    def get(self, key: Tuple) -> Optional[str]:
+        """Get a cached question, or None if the pool for this key isn't full yet"""
+        with self._lock:
+            pool = self._live_pool(key)
+            if pool is None or len(pool) < self.variants:
+                self._misses += 1
+                return None
+            self._pools.move_to_end(key)
+            self._hits += 1
+            return pool[next(self._rotation) % len(pool)][0]
+
+    def put(self, key: Tuple, question: str):
+        """Add a freshly generated question to a key's pool"""
+        with self._lock:
+            pool = self._live_pool(key)
+            if pool is None:
+                pool = self._pools[key] = []
+            if len(pool) < self.variants:
+                pool.append((question, time.monotonic()))
+            self._pools.move_to_end(key)
+            while len(self._pools) > self.max_keys:
+                self._pools.popitem(last=False)
+                self._evictions += 1
+
+    def stats(self) -> Dict:
+        """Cache statistics for this worker"""
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                'keys': len(self._pools),
+                'variants': sum(len(pool) for pool in self._pools.values()),
+                'max_keys': self.max_keys,
+                'variants_per_key': self.variants,
+                'hits': self._hits,
+                'misses': self._misses,
+                'evictions': self._evictions,
+                'hit_rate': round(self._hits / lookups, 3) if lookups else 0.0,
+            }
@@ -0,0 +1,189 @@
+"""
+Non-blocking structured request logging
+"""
+import json
+import os
+import queue
+import random
+import sys
+import threading
+import time
+from typing import Dict, Optional
+
+from app.config import Config
+
+
+LEVELS = {'debug': 10, 'info': 20, 'warning': 30, 'error': 40}
+
+
+def parse_route_rules(spec: str) -> Dict[str, Dict]:
+    """
+    Parse per-route logging rules
+
+    Format: comma-separated `endpoint=sample_rate[:level]`, e.g.
+    `interview.get_session_info=0.1,health=0,interview.submit_answer=1:debug`
+    """
+    rules = {}
+    for item in (spec or '').split(','):
+        item = item.strip()
+        if not item or '=' not in item:
+            continue
+        endpoint, value = item.split('=', 1)
+        rate, _, level = value.partition(':')
+        rule = {'sample_rate': float(rate)}
+        if level:
+            rule['level'] = level.strip().lower()
+        rules[endpoint.strip()] = rule
+    return rules
+
+
+class RequestLogPipeline:
+    """
+    Structured JSON log events written off the request path.
+
+    Request threads only sample and enqueue onto a bounded queue; they never
+    block and never touch the sink. When the queue is full the event is
+    dropped and counted. A background writer drains the queue and writes
+    batches to the sink (stdout, stderr or a file).
+    """
+
+    def __init__(self, sink: str = None, queue_size: int = None, batch_size: int = None,
+                 flush_interval: float = None, sample_rate: float = None,
+                 level: str = None, route_rules: Dict[str, Dict] = None):
+        self.sink = sink if sink is not None else Config.REQUEST_LOG_SINK
+        self.batch_size = batch_size or Config.REQUEST_LOG_BATCH_SIZE
+        self.flush_interval = flush_interval or Config.REQUEST_LOG_FLUSH_INTERVAL
+        self.sample_rate = sample_rate if sample_rate is not None else Config.REQUEST_LOG_SAMPLE_RATE
+        self.level = (level or Config.REQUEST_LOG_LEVEL).lower()
+        self.route_rules = route_rules if route_rules is not None else parse_route_rules(Config.REQUEST_LOG_ROUTES)
+
+        self._queue: queue.Queue = queue.Queue(maxsize=queue_size or Config.REQUEST_LOG_QUEUE_SIZE)
+        self._writer_pid = None
+        self._counts_lock = threading.Lock()
+        self._counts = {'emitted': 0, 'sampled_out': 0, 'dropped': 0, 'written': 0, 'write_errors': 0}
+
+    @property
+    def enabled(self) -> bool:
+        return self.sink not in ('', 'off', 'none')
+
+    def _count(self, name: str, n: int = 1):
+        with self._counts_lock:
+            self._counts[name] += n
+
+    def should_log(self, route: Optional[str], level: str) -> bool:
+        """Apply the per-route (or default) minimum level and sampling rate"""
+        rule = self.route_rules.get(route, {})
+        min_level = rule.get('level', self.level)
+        if LEVELS.get(level, 20) < LEVELS.get(min_level, 20):
+            return False
+        rate = rule.get('sample_rate', self.sample_rate)
+        return rate >= 1 or (rate > 0 and random.random() < rate)
+
+    def emit(self, event: Dict, route: Optional[str] = None, level: str = 'info') -> bool:
+        """
+        Queue a log event without blocking
+
+        Returns:
+            True if the event was queued
+        """
+        if not self.enabled:
+            return False
+        if not self.should_log(route, level):
+            self._count('sampled_out')
+            return False
+
+        self._ensure_writer()
+        event.setdefault('ts', time.time())
+        event.setdefault('level', level)
+        try:
+            self._queue.put_nowait(event)
+        except queue.Full:
+            self._count('dropped')
+            return False
+        self._count('emitted')
+        return True
+
+    def _ensure_writer(self):
+        """Start the writer thread for this process if it isn't running"""
+        if self._writer_pid == os.getpid():
+            return
+        self._writer_pid = os.getpid()
+        threading.Thread(target=self._writer_loop, name='request-log-writer', daemon=True).start()
+
+    def _open_sink(self):
+        if self.sink == 'stdout':
+            return sys.stdout, False
+        if self.sink == 'stderr':
+            return sys.stderr, False
+        directory = os.path.dirname(self.sink)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        return open(self.sink, 'a', buffering=1024 * 64), True
+
+    def _writer_loop(self):
+        try:
+            stream, owned = self._open_sink()
+        except OSError as e:
+            print(f"⚠️  Request log sink {self.sink!r} unavailable ({e}); writing to stderr")
+            stream, owned = sys.stderr, False
+        try:
+            while True:
+                batch = [self._queue.get()]
+                deadline = time.monotonic() + self.flush_interval
+                while len(batch) < self.batch_size:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    try:
+                        batch.append(self._queue.get(timeout=remaining))
+                    except queue.Empty:
+                        break
+                self._write(stream, batch)
+        finally:
+            if owned:
+                stream.close()
+
+    def _write(self, stream, batch):
+        try:
+            stream.write(''.join(json.dumps(event, default=str) + '\n' for event in batch))
+            stream.flush()
+            self._count('written', len(batch))
+        except Exception:
+            self._count('write_errors')
+
+    def stats(self) -> Dict:
+        """Pipeline counters for this worker"""
+        with self._counts_lock:
+            return {
+                'sink': self.sink,
+                'queue_depth': self._queue.qsize(),
+                'queue_capacity': self._queue.maxsize,
+                **self._counts,
+            }
+
+    def init_app(self, app):
+        """Record one event per request with its duration and status"""
+        from flask import g, request
+
+        @app.before_request
+        def _start_request_timer():
+            g.request_started = time.perf_counter()
+
+        @app.after_request
+        def _log_request(response):
+            started = g.pop('request_started', None)
+            status = response.status_code
+            level = 'error' if status >= 500 else 'warning' if status >= 400 else 'info'
+            self.emit({
+                'event': 'request',
+                'method': request.method,
+                'path': request.path,
+                'endpoint': request.endpoint,
+                'status': status,
+                'duration_ms': round((time.perf_counter() - started) * 1000, 2) if started else None,
+            }, route=request.endpoint, level=level)
+            return response
+
+
+# Global pipeline instance (one writer per worker process)
+request_log = RequestLogPipeline()
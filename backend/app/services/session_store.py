@@ -0,0 +1,646 @@
+"""
+Pluggable storage backends for interview sessions
+"""
+import heapq
+import json
+import atexit
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from typing import Dict, Optional
+
+from app.config import Config
+
+
+class SessionConflict(ValueError):
+    """The session was saved by someone else since this copy of it was read"""
+
+
+class SessionStore:
+    """Base class for interview session storage"""
+
+    def __init__(self, session_timeout: timedelta):
+        self.session_timeout = session_timeout
+
+    def get(self, session_id: str):
+        """Get a session by ID, or None if it doesn't exist or has expired"""
+        raise NotImplementedError
+
+    def save(self, session):
+        """Persist a new or changed session and set its new `version`"""
+        raise NotImplementedError
+
+    def touch(self, session):
+        """Record activity on a session, pushing back its expiry"""
+        session.last_activity = datetime.now()
+
+    def delete(self, session_id: str) -> bool:
+        """Delete a session. Returns True if it existed."""
+        raise NotImplementedError
+
+    def count(self) -> int:
+        """Number of live sessions visible to this store"""
+        raise NotImplementedError
+
+    def cleanup_expired(self):
+        """Drop expired sessions (no-op for backends with native expiry)"""
+
+
+class MemorySessionStore(SessionStore):
+    """
+    Sessions kept in a dict in this worker process.
+
+    Expiry is tracked in a min-heap of (last_activity, session_id) entries,
+    so adding a session is O(log n) no matter how many are live. Touching a
+    session doesn't update the heap: when an entry reaches the top, the
+    session's current last_activity is compared and the entry re-pushed if
+    it was refreshed (lazy invalidation). A background reaper thread pops
+    expired entries in bounded batches.
+    """
+
+    def __init__(self, session_timeout: timedelta, reaper_interval: float = None,
+                 reaper_batch: int = None):
+        super().__init__(session_timeout)
+        self.sessions: Dict[str, object] = {}
+        self.reaper_interval = reaper_interval if reaper_interval is not None else Config.SESSION_REAPER_INTERVAL
+        self.reaper_batch = reaper_batch if reaper_batch is not None else Config.SESSION_REAPER_BATCH
+        self._timeout_seconds = session_timeout.total_seconds()
+        self._expiry_heap: list = []
+        self._lock = threading.Lock()
+        self._reaper_pid = None
+
+    def _is_expired(self, session, now: float) -> bool:
+        return now - session.last_activity.timestamp() > self._timeout_seconds
+
+    def get(self, session_id: str):
+        session = self.sessions.get(session_id)
+        if session is not None and self._is_expired(session, time.time()):
+            # Expired but not reaped yet; its heap entry is skipped later
+            self.delete(session_id)
+            return None
+        return session
+
+    def _add(self, session):
+        """Hold a session, indexing its expiry if it is new. Caller holds the lock."""
+        if session.session_id not in self.sessions:
+            heapq.heappush(self._expiry_heap, (session.last_activity.timestamp(), session.session_id))
+        self.sessions[session.session_id] = session
+
+    def save(self, session):
+        with self._lock:
+            self._add(session)
+            # Only this worker holds the session, so its own counter is the version
+            session.version += 1
+        self._ensure_reaper()
+
+    def delete(self, session_id: str) -> bool:
+        with self._lock:
+            return self.sessions.pop(session_id, None) is not None
+
+    def count(self) -> int:
+        return len(self.sessions)
+
+    def reap(self, max_batch: int = None) -> int:
+        """
+        Evict up to `max_batch` expired sessions
+
+        Returns:
+            Number of sessions evicted
+        """
+        max_batch = max_batch or self.reaper_batch
+        evicted = 0
+        now = time.time()
+        with self._lock:
+            heap = self._expiry_heap
+            while heap and evicted < max_batch and now - heap[0][0] > self._timeout_seconds:
+                _, session_id = heapq.heappop(heap)
+                session = self.sessions.get(session_id)
+                if session is None:
+                    continue  # already deleted
+                if self._is_expired(session, now):
+                    del self.sessions[session_id]
+                    evicted += 1
+                else:
+                    # Touched since this entry was pushed
+                    heapq.heappush(heap, (session.last_activity.timestamp(), session_id))
+        return evicted
+
+    def cleanup_expired(self):
+        while self.reap() == self.reaper_batch:
+            pass
+
+    def _ensure_reaper(self):
+        """Start the reaper thread for this process if it isn't running"""
+        if self._reaper_pid == os.getpid() or self.reaper_interval <= 0:
+            return
+        self._reaper_pid = os.getpid()
+        threading.Thread(target=self._reaper_loop, name='session-reaper', daemon=True).start()
+
+    def _reaper_loop(self):
+        while True:
+            time.sleep(self.reaper_interval)
+            try:
+                # Bounded batches keep the lock hold time short for request threads
+                while self.reap() == self.reaper_batch:
+                    time.sleep(0)
+            except Exception as e:
+                print(f"⚠️  Session reaper error: {e!r}")
+
+
+class RedisSessionStore(SessionStore):
+    """
+    Sessions shared by every worker and node through Redis.
+
+    Each session is a hash holding a compact encoded state (`d`) and a
+    version counter (`v`) that every save increments atomically, so all
+    workers agree on a session's version. A save is a compare-and-swap on
+    `v` (WATCH/MULTI): it raises SessionConflict if the session was saved
+    since this copy was read, instead of silently overwriting that change.
+    A small in-process cache keeps recently used sessions; a cached copy is
+    reused only while its version still matches Redis, which costs one tiny
+    HGET instead of a full fetch and decode.
+
+    Expiry is handled by Redis TTLs, set on every save. Reads refresh the
+    TTL only once a tenth of it has passed since this worker last set it,
+    so a session may expire up to that much early.
+    """
+
+    KEY_PREFIX = 'interview:session:'
+    # States larger than this are zlib-compressed
+    COMPRESS_THRESHOLD = 1024
+    # Share of the TTL that may pass before a read refreshes it
+    TOUCH_REFRESH_FRACTION = 0.1
+
+    def __init__(self, session_timeout: timedelta, redis_url: str = None,
+                 cache_size: int = None, cache_ttl: float = None, client=None):
+        super().__init__(session_timeout)
+        if client is None:
+            import redis
+            client = redis.Redis.from_url(redis_url or Config.REDIS_URL)
+        self.redis = client
+        self.ttl_seconds = max(1, int(session_timeout.total_seconds()))
+        self.touch_interval = self.ttl_seconds * self.TOUCH_REFRESH_FRACTION
+        self.cache_size = cache_size if cache_size is not None else Config.SESSION_CACHE_SIZE
+        self.cache_ttl = cache_ttl if cache_ttl is not None else Config.SESSION_CACHE_TTL
+        # session_id -> (session, version, cached_at, ttl_set_at)
+        self._cache: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _key(self, session_id: str) -> str:
+        return f"{self.KEY_PREFIX}{session_id}"
+
+    @classmethod
+    def encode(cls, session) -> bytes:
+        """Serialize a session to compact bytes"""
+        raw = json.dumps(session.to_state(), separators=(',', ':')).encode('utf-8')
+        if len(raw) > cls.COMPRESS_THRESHOLD:
+            return b'z' + zlib.compress(raw)
+        return b'j' + raw
+
+    @staticmethod
+    def decode(data: bytes):
+        """Rebuild a session from bytes produced by encode()"""
+        from app.services.interview_service import InterviewSession
+
+        raw = zlib.decompress(data[1:]) if data[:1] == b'z' else data[1:]
+        return InterviewSession.from_state(json.loads(raw))
+
+    def _cache_put(self, session, version: int, ttl_set_at: float = None):
+        with self._lock:
+            if ttl_set_at is None:
+                previous = self._cache.get(session.session_id)
+                ttl_set_at = previous[3] if previous else 0.0
+            self._cache[session.session_id] = (session, version, time.monotonic(), ttl_set_at)
+            self._cache.move_to_end(session.session_id)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+
+    def _cache_drop(self, session_id: str):
+        with self._lock:
+            self._cache.pop(session_id, None)
+
+    def get(self, session_id: str):
+        key = self._key(session_id)
+        with self._lock:
+            cached = self._cache.get(session_id)
+
+        if cached is not None and time.monotonic() - cached[2] < self.cache_ttl:
+            version = self.redis.hget(key, 'v')
+            if version is None:
+                self._cache_drop(session_id)
+                return None
+            if int(version) == cached[1]:
+                return cached[0]
+
+        version, data = self.redis.hmget(key, 'v', 'd')
+        if data is None:
+            self._cache_drop(session_id)
+            return None
+        session = self.decode(data)
+        session.version = int(version)
+        self._cache_put(session, session.version)
+        return session
+
+    def save(self, session):
+        """
+        Save a session if it is unchanged in Redis since this copy was read
+
+        Raises:
+            SessionConflict: If another save (or a delete) got there first
+        """
+        from redis.exceptions import WatchError
+
+        key = self._key(session.session_id)
+        data = self.encode(session)
+        with self.redis.pipeline() as pipe:
+            try:
+                pipe.watch(key)
+                if int(pipe.hget(key, 'v') or 0) != session.version:
+                    raise SessionConflict("Session was changed by another request")
+                pipe.multi()
+                pipe.hincrby(key, 'v', 1)
+                pipe.hset(key, 'd', data)
+                pipe.expire(key, self.ttl_seconds)
+                version, _, _ = pipe.execute()
+            except WatchError:
+                raise SessionConflict("Session was changed by another request") from None
+        session.version = int(version)
+        self._cache_put(session, session.version, time.monotonic())
+
+    def touch(self, session):
+        super().touch(session)
+        now = time.monotonic()
+        with self._lock:
+            cached = self._cache.get(session.session_id)
+            if cached is not None:
+                if now - cached[3] < self.touch_interval:
+                    return
+                self._cache[session.session_id] = cached[:3] + (now,)
+        self.redis.expire(self._key(session.session_id), self.ttl_seconds)
+
+    def delete(self, session_id: str) -> bool:
+        self._cache_drop(session_id)
+        return bool(self.redis.delete(self._key(session_id)))
+
+    def count(self) -> int:
+        return sum(1 for _ in self.redis.scan_iter(match=f"{self.KEY_PREFIX}*", count=1000))
+
+
+class SQLiteSessionStore(MemorySessionStore):
+    """
+    In-memory sessions made durable in an embedded SQLite database.
+
+    Reads and writes are served from the worker's dict exactly like
+    MemorySessionStore. Saves only mark the session dirty; a writer thread
+    flushes dirty sessions every `flush_interval` seconds (or once
+    `batch_size` are pending) in a single transaction, writing the session
+    state and any Q&A records it hasn't stored yet. Touches (reads, polls)
+    change only `last_activity`: they are coalesced per session and
+    written as a one-column UPDATE on the next flush. The database runs in WAL
+    mode so lazy loads don't wait for the writer.
+
+    Nothing is loaded at startup: a session missing from memory is looked up
+    in the database on first access (e.g. after a restart). A crash can lose
+    the last `flush_interval` seconds of changes; a clean shutdown flushes.
+
+    Several workers may share the database file. Each row carries the
+    session's version; a worker remembers the version it last read or wrote
+    and only writes a row still at that version. Gets and saves check the
+    row's version first (one indexed SELECT on a separate read connection):
+    a copy another worker has moved on is reloaded, and a save of it raises
+    SessionConflict. Two workers changing a session within the same flush
+    interval can still race; the second flush is then dropped and its copy
+    reloaded, rather than mixing the two. Route a session's requests to one
+    worker (or use Redis) if that matters.
+    """
+
+    SCHEMA = (
+        "CREATE TABLE IF NOT EXISTS sessions ("
+        " id TEXT PRIMARY KEY, state TEXT NOT NULL, last_activity REAL NOT NULL, is_active INTEGER NOT NULL,"
+        " version INTEGER NOT NULL DEFAULT 0)",
+        "CREATE INDEX IF NOT EXISTS sessions_last_activity ON sessions (last_activity)",
+        "CREATE TABLE IF NOT EXISTS qa_records ("
+        " session_id TEXT NOT NULL, idx INTEGER NOT NULL, question_number INTEGER, score INTEGER,"
+        " record TEXT NOT NULL, PRIMARY KEY (session_id, idx))",
+    )
+
+    def __init__(self, session_timeout: timedelta, path: str = None, flush_interval: float = None,
+                 batch_size: int = None, **kwargs):
+        super().__init__(session_timeout, **kwargs)
+        self.path = path or Config.SESSION_DB_PATH
+        self.flush_interval = flush_interval if flush_interval is not None else Config.SESSION_DB_FLUSH_INTERVAL
+        self.batch_size = batch_size if batch_size is not None else Config.SESSION_DB_BATCH_SIZE
+        # session_id -> session to write, or None to delete
+        self._pending: Dict[str, Optional[object]] = {}
+        # session_id -> last_activity timestamp of a session only touched since the last flush
+        self._touched: Dict[str, float] = {}
+        self._pending_lock = threading.Lock()
+        self._wake = threading.Event()
+        # session_id -> row version this worker last read or wrote (absent: not in the database yet)
+        self._synced: Dict[str, int] = {}
+        self._db_lock = threading.Lock()
+        self._db = None
+        self._db_pid = None
+        # Reads use their own connection so they don't wait for a flush transaction
+        self._read_lock = threading.Lock()
+        self._reader = None
+        self._reader_pid = None
+        self._writer_pid = None
+        # Expired rows are purged on the next flush after a reap (and on the first one)
+        self._purge_due = True
+        self._stats = {'flushes': 0, 'sessions_written': 0, 'records_written': 0, 'touches_written': 0,
+                       'deleted': 0, 'largest_batch': 0, 'loaded': 0, 'reloaded': 0, 'conflicts': 0,
+                       'flush_errors': 0}
+        atexit.register(self.flush)
+
+    def _open(self) -> sqlite3.Connection:
+        directory = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(directory, exist_ok=True)
+        db = sqlite3.connect(self.path, timeout=5, check_same_thread=False, isolation_level=None)
+        db.execute("PRAGMA journal_mode=WAL")
+        db.execute("PRAGMA synchronous=NORMAL")
+        for statement in self.SCHEMA:
+            db.execute(statement)
+        try:
+            # Databases created before rows were versioned
+            db.execute("ALTER TABLE sessions ADD COLUMN version INTEGER NOT NULL DEFAULT 0")
+        except sqlite3.OperationalError:
+            pass  # already there
+        return db
+
+    def _connection(self) -> sqlite3.Connection:
+        """This process's write connection (opened on first use, never shared across a fork)"""
+        if self._db_pid != os.getpid():
+            self._db, self._db_pid = self._open(), os.getpid()
+        return self._db
+
+    def _read_connection(self) -> sqlite3.Connection:
+        """This process's read connection. Caller holds _read_lock."""
+        if self._reader_pid != os.getpid():
+            self._reader, self._reader_pid = self._open(), os.getpid()
+        return self._reader
+
+    def _stored_version(self, session_id: str) -> Optional[int]:
+        """Version of the session's row, or None if there is no row"""
+        with self._read_lock:
+            row = self._read_connection().execute(
+                "SELECT version FROM sessions WHERE id = ?", (session_id,)).fetchone()
+        return row[0] if row else None
+
+    def _is_current(self, session_id: str) -> bool:
+        """Whether no other worker has written (or deleted) the session since this one synced it"""
+        synced = self._synced.get(session_id)
+        return synced is None or self._stored_version(session_id) == synced
+
+    def _evict(self, session_id: str):
+        """Forget this worker's copy of a session so the next get reloads it"""
+        with self._lock:
+            self.sessions.pop(session_id, None)
+        self._synced.pop(session_id, None)
+
+    def _mark(self, session_id: str, session):
+        with self._pending_lock:
+            self._pending[session_id] = session
+            full = len(self._pending) >= self.batch_size
+        if full:
+            self._wake.set()
+        self._ensure_writer()
+
+    def get(self, session_id: str):
+        session = self.sessions.get(session_id)
+        if session is not None:
+            session = super().get(session_id)
+            if session is None or self._is_current(session_id):
+                return session
+            # Another worker wrote it since; its copy wins
+            self._evict(session_id)
+            self._stats['reloaded'] += 1
+        with self._pending_lock:
+            if session_id in self._pending:
+                return None  # deleted, delete not flushed yet
+        session = self._load(session_id)
+        if session is None:
+            return None
+        if self._is_expired(session, time.time()):
+            self.delete(session_id)
+            return None
+        with self._lock:
+            # Another request may have loaded it meanwhile; keep that copy
+            if session_id in self.sessions:
+                return self.sessions[session_id]
+            self._add(session)  # unchanged, so its stored version stands
+        self._ensure_reaper()
+        self._stats['loaded'] += 1
+        return session
+
+    def _load(self, session_id: str):
+        """Read a session and its Q&A records from the database"""
+        with self._read_lock:
+            db = self._read_connection()
+            db.execute("BEGIN")  # one snapshot for the row and its records
+            try:
+                row = db.execute("SELECT state, last_activity, version FROM sessions WHERE id = ?",
+                                 (session_id,)).fetchone()
+                records = db.execute("SELECT record FROM qa_records WHERE session_id = ? ORDER BY idx",
+                                     (session_id,)).fetchall() if row else []
+            finally:
+                db.execute("COMMIT")
+        if row is None:
+            return None
+        from app.services.interview_service import InterviewSession
+
+        state = json.loads(row[0])
+        state['a'] = row[1]  # touches update only the column
+        state['h'] = [json.loads(record) for (record,) in records]
+        session = InterviewSession.from_state(state)
+        session.version = row[2]
+        self._synced[session_id] = row[2]
+        return session
+
+    def save(self, session):
+        """
+        Save a session, written to the database on the next flush
+
+        Raises:
+            SessionConflict: If another worker wrote or deleted it since this copy was read
+        """
+        if not self._is_current(session.session_id):
+            self._evict(session.session_id)
+            raise SessionConflict("Session was changed by another worker")
+        super().save(session)
+        self._mark(session.session_id, session)
+
+    def touch(self, session):
+        super().touch(session)
+        with self._pending_lock:
+            self._touched[session.session_id] = session.last_activity.timestamp()
+        self._ensure_writer()
+
+    def delete(self, session_id: str) -> bool:
+        existed = super().delete(session_id)
+        self._mark(session_id, None)
+        return existed
+
+    def reap(self, max_batch: int = None) -> int:
+        evicted = super().reap(max_batch)
+        if evicted:
+            self._purge_due = True  # drop the same sessions from the database
+            with self._lock:
+                for session_id in list(self._synced):
+                    if session_id not in self.sessions:
+                        self._synced.pop(session_id, None)
+        return evicted
+
+    def flush(self) -> int:
+        """
+        Write every pending change in one transaction
+
+        Returns:
+            Number of sessions written or deleted
+        """
+        with self._pending_lock:
+            pending, self._pending = self._pending, {}
+            touched, self._touched = self._touched, {}
+        purge, self._purge_due = self._purge_due, False
+        if not pending and not touched and not purge:
+            return 0
+
+        written = records = deleted = 0
+        synced, conflicts = {}, []
+        try:
+            with self._db_lock:
+                db = self._connection()
+                db.execute("BEGIN")
+                try:
+                    for session_id, session in pending.items():
+                        if session is None:
+                            db.execute("DELETE FROM sessions WHERE id = ?", (session_id,))
+                            db.execute("DELETE FROM qa_records WHERE session_id = ?", (session_id,))
+                            deleted += 1
+                            continue
+                        result = self._write(db, session, self._synced.get(session_id))
+                        if result is None:
+                            conflicts.append(session_id)
+                            continue
+                        synced[session_id], new_records = result
+                        records += new_records
+                        written += 1
+                    # A session written above already has its latest last_activity
+                    touches = [(at, session_id) for session_id, at in touched.items() if session_id not in pending]
+                    db.executemany("UPDATE sessions SET last_activity = ? WHERE id = ?", touches)
+                    if purge:
+                        cutoff = time.time() - self._timeout_seconds
+                        db.execute("DELETE FROM qa_records WHERE session_id IN "
+                                   "(SELECT id FROM sessions WHERE last_activity < ?)", (cutoff,))
+                        db.execute("DELETE FROM sessions WHERE last_activity < ?", (cutoff,))
+                    db.execute("COMMIT")
+                except BaseException:
+                    db.execute("ROLLBACK")
+                    raise
+        except Exception as e:
+            self._stats['flush_errors'] += 1
+            self._purge_due = self._purge_due or purge
+            print(f"⚠️  Session DB flush failed, will retry: {e!r}")
+            with self._pending_lock:
+                # Changes made since the swap are newer; keep those
+                for session_id, session in pending.items():
+                    self._pending.setdefault(session_id, session)
+                for session_id, at in touched.items():
+                    self._touched.setdefault(session_id, at)
+            return 0
+
+        self._synced.update(synced)
+        for session_id, session in pending.items():
+            if session is None:
+                self._synced.pop(session_id, None)
+        for session_id in conflicts:
+            # Another worker got there first: drop this copy (and changes queued since) and reload theirs
+            with self._pending_lock:
+                if self._pending.get(session_id) is not None:
+                    del self._pending[session_id]
+            self._evict(session_id)
+            print(f"⚠️  Session {session_id} was changed by another worker; dropped this worker's copy")
+        self._stats['conflicts'] += len(conflicts)
+        self._stats['touches_written'] += len(touches)
+        if not pending:
+            return 0
+        self._stats['flushes'] += 1
+        self._stats['sessions_written'] += written
+        self._stats['records_written'] += records
+        self._stats['deleted'] += deleted
+        self._stats['largest_batch'] = max(self._stats['largest_batch'], len(pending))
+        return len(pending)
+
+    @staticmethod
+    def _write(db: sqlite3.Connection, session, expected: Optional[int]) -> Optional[tuple]:
+        """
+        Write one session and append its new Q&A records
+
+        The row is only written if it is still at version `expected` (or,
+        for None, doesn't exist yet).
+
+        Returns:
+            (version written, records written), or None if the row had moved on
+        """
+        state = session.to_state()
+        history = state.pop('h')
+        row = (json.dumps(state, separators=(',', ':')), state['a'], int(state['on']), state['v'])
+        if expected is None:
+            cursor = db.execute(
+                "INSERT INTO sessions (state, last_activity, is_active, version, id) VALUES (?, ?, ?, ?, ?) "
+                "ON CONFLICT (id) DO NOTHING", (*row, session.session_id))
+        else:
+            cursor = db.execute(
+                "UPDATE sessions SET state = ?, last_activity = ?, is_active = ?, version = ? "
+                "WHERE id = ? AND version = ?", (*row, session.session_id, expected))
+        if cursor.rowcount == 0:
+            return None
+        stored = db.execute("SELECT COUNT(*) FROM qa_records WHERE session_id = ?",
+                            (session.session_id,)).fetchone()[0]
+        if stored > len(history):
+            # History was reset; drop the rows past its new end
+            db.execute("DELETE FROM qa_records WHERE session_id = ? AND idx >= ?",
+                       (session.session_id, len(history)))
+            stored = len(history)
+        db.executemany(
+            "INSERT OR REPLACE INTO qa_records (session_id, idx, question_number, score, record) "
+            "VALUES (?, ?, ?, ?, ?)",
+            [(session.session_id, idx, record[0], record[5], json.dumps(record, separators=(',', ':')))
+             for idx, record in enumerate(history[stored:], start=stored)],
+        )
+        return state['v'], len(history) - stored
+
+    def _ensure_writer(self):
+        """Start the writer thread for this process if it isn't running"""
+        if self._writer_pid == os.getpid():
+            return
+        self._writer_pid = os.getpid()
+        threading.Thread(target=self._writer_loop, name='session-db-writer', daemon=True).start()
+
+    def _writer_loop(self):
+        while True:
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            self.flush()
+
+    def stats(self) -> Dict:
+        with self._pending_lock:
+            pending, touched = len(self._pending), len(self._touched)
+        return {'path': self.path, 'pending': pending, 'touched': touched, 'in_memory': len(self.sessions),
+                **self._stats}
+
+
+def create_session_store(session_timeout: timedelta) -> SessionStore:
+    """Create the session store selected by SESSION_BACKEND"""
+    backend = Config.SESSION_BACKEND
+    if backend == 'redis':
+        return RedisSessionStore(session_timeout)
+    if backend == 'memory':
+        return MemorySessionStore(session_timeout)
+    if backend == 'sqlite':
+        return SQLiteSessionStore(session_timeout)
+    raise ValueError(f"Unknown SESSION_BACKEND: {backend}")
@@ -0,0 +1,133 @@
+"""
+Token metering and per-session token budgets
+"""
+from typing import Dict, List, Optional, Tuple
+
+from app.config import Config
+from app.services.metrics import llm_completion_tokens, llm_prompt_tokens
+
+
+class TokenBudgetExceeded(ValueError):
+    """A model call would exceed one of the session's token budgets"""
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count (~4 characters per token for English text)"""
+    return (len(text or '') + 3) // 4
+
+
+def truncate_to_tokens(text: str, max_tokens: int) -> Tuple[str, bool]:
+    """
+    Cut text down to roughly `max_tokens` tokens
+
+    Returns:
+        Tuple of (text, whether it was truncated)
+    """
+    max_chars = max_tokens * 4
+    if len(text) <= max_chars:
+        return text, False
+    cut = text[:max_chars]
+    # Prefer not to end mid-word
+    space = cut.rfind(' ')
+    if space > max_chars * 0.8:
+        cut = cut[:space]
+    return cut.rstrip(), True
+
+
+def apply_answer_budget(answer: str) -> Tuple[str, bool]:
+    """
+    Truncate or reject an answer over MAX_ANSWER_TOKENS before it reaches the agents
+    
+    Returns:
+        Tuple of (answer, whether it was truncated)
+    """
+    limit = Config.MAX_ANSWER_TOKENS
+    if not limit or estimate_tokens(answer) <= limit:
+        return answer, False
+    if Config.ANSWER_OVERFLOW == 'reject':
+        raise TokenBudgetExceeded(f"Answer is too long (limit is about {limit * 4} characters)")
+    return truncate_to_tokens(answer, limit)
+
+
+class TokenUsage:
+    """
+    Token usage accumulated by one interview session, with its budgets.
+
+    Counts come from the usage the provider reports with each completion;
+    when a provider doesn't report usage the prompt and reply are estimated
+    instead (and counted in `estimated_calls`).
+    """
+
+    def __init__(self, max_prompt_tokens: int = None, max_total_tokens: int = None):
+        self.max_prompt_tokens = max_prompt_tokens if max_prompt_tokens is not None else Config.MAX_PROMPT_TOKENS
+        self.max_total_tokens = max_total_tokens if max_total_tokens is not None else Config.SESSION_TOKEN_BUDGET
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+        self.calls = 0
+        self.estimated_calls = 0
+        # role -> [prompt_tokens, completion_tokens, calls]
+        self.by_agent: Dict[str, List[int]] = {}
+
+    @property
+    def total_tokens(self) -> int:
+        return self.prompt_tokens + self.completion_tokens
+
+    def check(self, role: str, prompt_tokens: int):
+        """Reject a call before it is sent if it would break a budget"""
+        if self.max_prompt_tokens and prompt_tokens > self.max_prompt_tokens:
+            raise TokenBudgetExceeded(
+                f"The {role} prompt is too long (~{prompt_tokens} tokens, limit {self.max_prompt_tokens})"
+            )
+        if self.max_total_tokens and self.total_tokens + prompt_tokens > self.max_total_tokens:
+            raise TokenBudgetExceeded(
+                f"This interview has used its token budget ({self.total_tokens} of {self.max_total_tokens} tokens)"
+            )
+
+    def record(self, role: str, prompt_tokens: int, completion_tokens: int, estimated: bool = False):
+        """Add one completed call to the session and worker totals"""
+        self.prompt_tokens += prompt_tokens
+        self.completion_tokens += completion_tokens
+        self.calls += 1
+        self.estimated_calls += estimated
+        agent = self.by_agent.setdefault(role, [0, 0, 0])
+        agent[0] += prompt_tokens
+        agent[1] += completion_tokens
+        agent[2] += 1
+
+        llm_prompt_tokens.inc(prompt_tokens, agent=role)
+        llm_completion_tokens.inc(completion_tokens, agent=role)
+
+    def to_dict(self) -> Dict:
+        return {
+            'prompt_tokens': self.prompt_tokens,
+            'completion_tokens': self.completion_tokens,
+            'total_tokens': self.total_tokens,
+            'calls': self.calls,
+            'estimated_calls': self.estimated_calls,
+            'by_agent': {
+                role: {'prompt_tokens': p, 'completion_tokens': c, 'calls': n}
+                for role, (p, c, n) in self.by_agent.items()
+            },
+            'budget': {
+                'max_total_tokens': self.max_total_tokens or None,
+                'remaining_tokens': max(0, self.max_total_tokens - self.total_tokens) if self.max_total_tokens else None,
+            },
+        }
+
+    def to_state(self) -> List:
+        """Compact snapshot for external session stores"""
+        return [self.prompt_tokens, self.completion_tokens, self.calls, self.estimated_calls, self.by_agent]
+
+    def load_state(self, state: Optional[List]):
+        if not state:
+            return
+        self.prompt_tokens, self.completion_tokens, self.calls, self.estimated_calls, self.by_agent = state
+
+
+def worker_token_usage() -> Dict:
+    """Tokens used by every session on this worker, by agent role"""
+    usage = {}
+    for counter, field in ((llm_prompt_tokens, 'prompt_tokens'), (llm_completion_tokens, 'completion_tokens')):
+        for (role,), value in counter.samples():
+            usage.setdefault(role, {'prompt_tokens': 0, 'completion_tokens': 0})[field] = value
+    return usage
@@ -0,0 +1,102 @@
+"""
+Worker warmup: pay the cold-start costs before the first interview does
+"""
+import asyncio
+import os
+import threading
+import time
+from typing import Dict, List, Optional
+
+from app.config import Config
+from app.services.event_loop import worker_loop
+from app.services.llm_pool import llm_pool
+
+
+class Warmup:
+    """
+    Optional per-worker warmup, started after fork.
+
+    Imports autogen/openai, builds one set of agents (creating the pooled
+    model clients for every role), opens a keep-alive connection to the
+    upstream and checks the configured models against its /models list.
+    /health reports `warming` (503) until it finishes. Problems are
+    reported as warnings rather than failing the worker, so a slow or
+    unreachable provider doesn't keep it out of rotation.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def start(self):
+        """Start warming this worker on its event loop (no-op if already started)"""
+        with self._lock:
+            if self.state != 'off':
+                return
+            self.state = 'warming'
+            self._started = time.perf_counter()
+        worker_loop.submit(self.run())
+
+    async def run(self):
+        timings = {}
+        step = time.perf_counter()
+        try:
+            # Imports and agent construction are CPU-bound; keep the loop free
+            await asyncio.to_thread(self._build_agents)
+            timings['agents_ms'] = round((time.perf_counter() - step) * 1000, 1)
+
+            step = time.perf_counter()
+            await asyncio.wait_for(self._check_upstream(), Config.WARMUP_TIMEOUT)
+            timings['upstream_ms'] = round((time.perf_counter() - step) * 1000, 1)
+        except Exception as e:
+            self.warnings.append(f"Warmup incomplete: {e!r}")
+            print(f"⚠️  Warmup incomplete: {e!r}")
+        finally:
+            timings['total_ms'] = round((time.perf_counter() - self._started) * 1000, 1)
+            self.timings = timings
+            self.state = 'ready'
+
+    @staticmethod
+    def _build_agents():
+        from agents import InterviewAgents
+
+        InterviewAgents('warmup', 'warmup', evaluation_mode=Config.EVALUATION_MODE).interviewer
+
+    async def _check_upstream(self):
+        """Open the keep-alive pool to the provider and look up the configured models"""
+        base_url = os.getenv("OPENROUTER_BASE_URL", "https://openrouter.ai/api/v1")
+        http_client = llm_pool.http_client(base_url)
+        response = await http_client.get(
+            f"{base_url.rstrip('/')}/models",
+            headers={'Authorization': f"Bearer {os.getenv('OPENROUTER_API_KEY', '')}"},
+        )
+        if response.status_code != 200:
+            self.warnings.append(f"GET /models returned {response.status_code}")
+            return
+
+        available = {model.get('id') for model in response.json().get('data', [])}
+        configured = {settings['model'] for settings in Config.ROLE_MODELS.values()}
+        missing = sorted(configured - available) if available else []
+        if missing:
+            self.warnings.append(f"Model(s) not offered by the provider: {', '.join(missing)}")
+
+    def status(self) -> Dict:
+        return {
+            'state': self.state,
+            'timings': self.timings,
+            'warnings': list(self.warnings),
+        }
+
+    def reset(self):
+        """Forget the warmup state (used after fork, where the child has to warm itself)"""
+        self.state = 'off'
+        self.timings: Dict = {}
+        self.warnings: List[str] = []
+        self._started: Optional[float] = None
+
+
+# Global warmup state (one per worker process)
+warmup = Warmup()
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=warmup.reset)
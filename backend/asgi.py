@@ -0,0 +1,30 @@
+"""
+ASGI application entry point
+
+Serves the same API as run.py from an ASGI server, with one long-lived
+event loop per worker:
+
+    uvicorn asgi:app --host 0.0.0.0 --port 5000 --workers 2
+"""
+import os
+import sys
+from dotenv import load_dotenv
+
+# Load environment variables
+load_dotenv()
+
+# Add the backend directory to the Python path
+sys.path.insert(0, os.path.dirname(__file__))
+
+from app.asgi import create_asgi_app
+from app.config import Config
+
+app = create_asgi_app()
+
+if __name__ == '__main__':
+    import uvicorn
+
+    print(f"🚀 Starting AI Interviewer Backend (ASGI)")
+    print(f"   Port: {Config.PORT}")
+    print(f"   Model: {Config.MODEL}")
+    uvicorn.run(app, host='0.0.0.0', port=Config.PORT)
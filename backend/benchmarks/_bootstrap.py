@@ -0,0 +1,17 @@
+"""
+Shared setup for benchmark scripts
+
+Makes the backend importable when a script is run directly
+(`python benchmarks/<script>.py`) and fills in the environment the app
+needs at import time. No real API key is required: benchmarks stub or
+fake the upstream LLM.
+"""
+import os
+import sys
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if BACKEND_DIR not in sys.path:
+    sys.path.insert(0, BACKEND_DIR)
+
+os.environ.setdefault('SECRET_KEY', 'benchmark-secret-key')
+os.environ.setdefault('OPENROUTER_API_KEY', 'benchmark-key')
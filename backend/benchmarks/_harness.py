@@ -0,0 +1,50 @@
+"""
+Helpers for benchmarks that boot a real backend worker
+"""
+import asyncio
+import os
+import socket
+import subprocess
+import sys
+import time
+
+import httpx
+
+import _bootstrap
+
+
+def percentile(values: list, pct: float) -> float:
+    """Nearest-rank percentile of a list of numbers"""
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def start_server(mode: str, port: int, env: dict, workers: int = 1, threads: int = 4) -> subprocess.Popen:
+    """Boot the backend under gunicorn (`wsgi`) or uvicorn (`asgi`) with extra environment"""
+    env = dict(os.environ, **env)
+    if mode == 'wsgi':
+        cmd = ['gunicorn', '--bind', f'127.0.0.1:{port}', '--workers', str(workers),
+               '--threads', str(threads), '--timeout', '120', 'run:app']
+    else:
+        cmd = [sys.executable, '-m', 'uvicorn', 'asgi:app', '--host', '127.0.0.1',
+               '--port', str(port), '--workers', str(workers), '--log-level', 'warning']
+    return subprocess.Popen(cmd, cwd=_bootstrap.BACKEND_DIR, env=env,
+                            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+
+async def wait_healthy(client: httpx.AsyncClient, base: str, timeout: float = 30):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            if (await client.get(f"{base}/health")).status_code == 200:
+                return
+        except httpx.TransportError:
+            pass
+        await asyncio.sleep(0.2)
+    raise RuntimeError(f"server at {base} did not become healthy")
@@ -0,0 +1,95 @@
+"""
+Traffic spike against a provider with a concurrency quota, with and without admission control
+
+Fires a burst of concurrent Coach calls at a fake LLM that answers 429
+to requests beyond its concurrency limit, then repeats it with the
+admission controller capping in-flight calls at that limit. Reports
+completed and failed calls, 429s seen upstream, latency, and queue
+depth/wait. A last run uses a small queue to show fast rejections with
+Retry-After instead of slow failures.
+
+Usage:
+    python benchmarks/bench_admission.py [--calls 200] [--limit 32] [--latency 0.3]
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import time
+
+import _bootstrap  # noqa: F401
+from fake_llm_server import FakeLLMServer
+
+
+async def spike(calls: int, controller) -> dict:
+    import agents as agents_module
+    from agents import InterviewAgents
+    from app.services.admission import UpstreamOverloaded
+
+    agents_module.admission = controller
+    latencies, failures, rejected, retry_after = [], 0, 0, set()
+
+    async def one(i):
+        nonlocal failures, rejected
+        agents = InterviewAgents("Python", "Backend Developer")
+        start = time.perf_counter()
+        try:
+            await agents.get_feedback("What is a closure?", f"Answer {i}: a function plus its scope.")
+            latencies.append((time.perf_counter() - start) * 1000)
+        except UpstreamOverloaded as e:
+            rejected += 1
+            retry_after.add(e.retry_after)
+        except Exception:
+            failures += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(calls)))
+    return {
+        'elapsed': time.perf_counter() - start,
+        'ok': len(latencies),
+        'failed': failures,
+        'rejected': rejected,
+        'retry_after': sorted(retry_after),
+        'p50': statistics.median(latencies) if latencies else 0.0,
+        'p95': statistics.quantiles(latencies, n=20)[18] if len(latencies) > 1 else 0.0,
+        'admission': controller.stats(),
+    }
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--calls', type=int, default=200, help='concurrent calls in the spike')
+    parser.add_argument('--limit', type=int, default=32, help="provider's concurrency quota")
+    parser.add_argument('--latency', default='0.3', help='fake LLM time to first token')
+    parser.add_argument('--small-queue', type=int, default=64)
+    args = parser.parse_args()
+
+    llm = FakeLLMServer(latency=args.latency, concurrency_limit=args.limit).start()
+    os.environ['OPENROUTER_BASE_URL'] = llm.base_url
+    from app.services.admission import AdmissionController
+
+    runs = [
+        ('off', AdmissionController(max_in_flight=0)),
+        (f'{args.limit} in flight', AdmissionController(max_in_flight=args.limit, max_queue=args.calls,
+                                                         queue_timeout=60)),
+        (f'queue {args.small_queue}', AdmissionController(max_in_flight=args.limit, max_queue=args.small_queue,
+                                                           queue_timeout=60)),
+    ]
+    print(f"🚦 Spike of {args.calls} concurrent Coach calls, provider quota {args.limit} in flight "
+          f"(429 beyond), latency {args.latency}s\n")
+    print(f"   {'admission':16s} {'ok':>5s} {'failed':>7s} {'503':>5s} {'429s':>6s} {'p50 ms':>8s} "
+          f"{'p95 ms':>8s} {'seconds':>8s} {'peak queue':>11s} {'mean wait ms':>13s}")
+    for name, controller in runs:
+        llm.reset_counters()
+        result = await spike(args.calls, controller)
+        stats = result['admission']
+        print(f"   {name:16s} {result['ok']:5d} {result['failed']:7d} {result['rejected']:5d} "
+              f"{llm.stats()['rate_limited']:6d} {result['p50']:8.0f} {result['p95']:8.0f} "
+              f"{result['elapsed']:8.2f} {stats['peak_queue_depth']:11d} {stats['mean_wait_ms']:13.0f}")
+        if result['retry_after']:
+            print(f"   {'':16s} Retry-After offered: {', '.join(map(str, result['retry_after']))} s")
+    llm.stop()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
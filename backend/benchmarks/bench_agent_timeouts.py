@@ -0,0 +1,83 @@
+"""
+Tail latency of agent calls when some upstream requests hang
+
+Runs Scorer calls against a fake upstream where a fraction of requests
+never answer in time, first with no effective per-attempt deadline (the
+old behaviour: a hung call waits until the upstream gives up), then with
+a short role deadline plus jittered retries.
+
+Usage:
+    python benchmarks/bench_agent_timeouts.py [--calls 200] [--hang-rate 0.1] [--deadline 1.0]
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import time
+
+import _bootstrap  # noqa: F401
+from _harness import percentile
+from fake_llm_server import FakeLLMServer
+
+
+async def run_calls(agents, calls: int, concurrency: int) -> tuple:
+    """Run `calls` scorer calls, returning (latencies in ms, failures)"""
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies, failures = [], 0
+
+    async def one():
+        nonlocal failures
+        async with semaphore:
+            start = time.perf_counter()
+            try:
+                await agents.get_score("What is a closure?", "A function plus its scope.")
+            except Exception:
+                failures += 1
+            latencies.append((time.perf_counter() - start) * 1000)
+
+    await asyncio.gather(*(one() for _ in range(calls)))
+    return latencies, failures
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--calls', type=int, default=200)
+    parser.add_argument('--concurrency', type=int, default=20)
+    parser.add_argument('--latency', type=float, default=0.2, help='normal upstream latency (s)')
+    parser.add_argument('--hang-rate', type=float, default=0.1)
+    parser.add_argument('--hang-seconds', type=float, default=5.0)
+    parser.add_argument('--deadline', type=float, default=1.0, help='scorer per-attempt deadline (s)')
+    args = parser.parse_args()
+
+    upstream = FakeLLMServer(latency=args.latency, hang_rate=args.hang_rate,
+                             hang_seconds=args.hang_seconds).start()
+    os.environ['OPENROUTER_BASE_URL'] = upstream.base_url
+
+    from agents import InterviewAgents, agent_call_stats
+    from app.config import Config
+
+    print(f"⏱️  Scorer latency, {args.calls} calls, {args.hang_rate:.0%} of upstream requests "
+          f"hang for {args.hang_seconds:.0f}s\n")
+
+    modes = [
+        ('no deadline', {'SCORER_TIMEOUT': args.hang_seconds * 2, 'AGENT_MAX_RETRIES': 0}),
+        (f'{args.deadline:.1f}s deadline + retries', {'SCORER_TIMEOUT': args.deadline, 'AGENT_MAX_RETRIES': 2}),
+    ]
+    for label, settings in modes:
+        for name, value in settings.items():
+            setattr(Config, name, value)
+        agent_call_stats.reset()
+        upstream.reset_counters()
+
+        agents = InterviewAgents("Python", "Backend Developer")
+        latencies, failures = await run_calls(agents, args.calls, args.concurrency)
+        counts = agent_call_stats.stats().get('scorer', {})
+        print(f"   {label:28s} p50 {statistics.median(latencies):7.0f} ms   "
+              f"p95 {percentile(latencies, 95):7.0f} ms   p99 {percentile(latencies, 99):7.0f} ms   "
+              f"max {max(latencies):7.0f} ms")
+        print(f"   {'':28s} timeouts {counts.get('timeouts', 0)}, retries {counts.get('retries', 0)}, "
+              f"failed calls {failures}, upstream requests {upstream.requests}\n")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
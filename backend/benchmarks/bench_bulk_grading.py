@@ -0,0 +1,91 @@
+"""
+Bulk grading throughput vs. concurrency
+
+Grades the same batch of records through BulkGrader at increasing
+concurrency against a fake LLM that serves a limited number of requests
+at once, and reports records/sec, agents created and peak upstream load.
+Throughput should grow with concurrency until the upstream capacity is
+reached, while agents stay bounded by the concurrency.
+
+Usage:
+    python benchmarks/bench_bulk_grading.py [--records 200] [--latency 0.3] [--capacity 32]
+"""
+import argparse
+import asyncio
+import os
+import time
+
+import _bootstrap  # noqa: F401
+from fake_llm_server import FakeLLMServer
+
+TOPICS = [("Python", "Backend Developer"), ("React", "Frontend Developer"), ("SQL", "Data Engineer")]
+
+
+def make_records(count: int) -> list:
+    return [
+        {
+            'id': f"rec-{i}",
+            'technology': TOPICS[i % len(TOPICS)][0],
+            'position': TOPICS[i % len(TOPICS)][1],
+            'question': "What is a closure?",
+            'answer': f"Answer {i}: a closure keeps access to variables from the scope where it was defined.",
+        }
+        for i in range(count)
+    ]
+
+
+async def run(records: list, concurrency: int, order: str) -> dict:
+    import agents as agents_module
+    from app.services.bulk_grading import BulkGrader
+
+    created = 0
+    original_init = agents_module.InterviewAgents.__init__
+
+    def counting_init(self, *args, **kwargs):
+        nonlocal created
+        created += 1
+        original_init(self, *args, **kwargs)
+
+    agents_module.InterviewAgents.__init__ = counting_init
+    try:
+        start = time.perf_counter()
+        indexes, errors = [], 0
+        async for result in BulkGrader(concurrency, order).grade(records):
+            indexes.append(result['index'])
+            errors += 'error' in result
+        elapsed = time.perf_counter() - start
+    finally:
+        agents_module.InterviewAgents.__init__ = original_init
+
+    if order == 'input':
+        assert indexes == list(range(len(records))), "results out of input order"
+    return {'elapsed': elapsed, 'errors': errors, 'agents': created}
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--records', type=int, default=200)
+    parser.add_argument('--latency', default='0.3', help='fake LLM time to first token (spec or seconds)')
+    parser.add_argument('--capacity', type=int, default=32, help='requests the fake LLM serves at once')
+    parser.add_argument('--concurrency', default='1,4,16,32,64')
+    parser.add_argument('--order', choices=('input', 'completion'), default='input')
+    args = parser.parse_args()
+
+    llm = FakeLLMServer(latency=args.latency, capacity=args.capacity).start()
+    os.environ['OPENROUTER_BASE_URL'] = llm.base_url
+    records = make_records(args.records)
+
+    print(f"📦 Bulk grading {args.records} records ({args.order} order), fake LLM latency {args.latency}s, "
+          f"capacity {args.capacity} requests\n")
+    print(f"   {'concurrency':>11s} {'records/s':>10s} {'seconds':>8s} {'agents':>7s} "
+          f"{'peak upstream':>14s} {'errors':>7s}")
+    for concurrency in (int(c) for c in args.concurrency.split(',')):
+        llm.reset_counters()
+        result = await run(records, concurrency, args.order)
+        print(f"   {concurrency:11d} {args.records / result['elapsed']:10.1f} {result['elapsed']:8.2f} "
+              f"{result['agents']:7d} {llm.stats()['peak_in_flight']:14d} {result['errors']:7d}")
+    llm.stop()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
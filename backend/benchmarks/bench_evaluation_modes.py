@@ -0,0 +1,94 @@
+"""
+Separate Coach + Scorer evaluation vs. one combined JSON evaluation call
+
+Runs `process_answer` against the fake LLM in each EVALUATION_MODE and
+reports latency, upstream requests and tokens per answer. Finally checks
+that a malformed combined reply falls back to the Coach + Scorer path.
+
+Usage:
+    python benchmarks/bench_evaluation_modes.py [--answers 40] [--latency 0.5] [--token-delay 0.005]
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import time
+
+import _bootstrap  # noqa: F401
+from _harness import percentile
+from fake_llm_server import FakeLLMServer
+
+QUESTION = "What is a closure?"
+ANSWER = "A closure is a function that keeps access to variables from the scope where it was defined."
+
+
+async def run_mode(mode: str, answers: int, concurrency: int) -> dict:
+    from agents import InterviewAgents
+
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies, sessions = [], []
+
+    async def one(i: int):
+        async with semaphore:
+            agents = InterviewAgents("Python", "Backend Developer", evaluation_mode=mode)
+            sessions.append(agents)
+            start = time.perf_counter()
+            record = await agents.process_answer(QUESTION, ANSWER, i + 1)
+            latencies.append((time.perf_counter() - start) * 1000)
+            assert record['feedback_available'] and record['score_available']
+
+    await asyncio.gather(*(one(i) for i in range(answers)))
+    return {
+        'latencies': latencies,
+        'prompt_tokens': sum(a.usage.prompt_tokens for a in sessions) / answers,
+        'completion_tokens': sum(a.usage.completion_tokens for a in sessions) / answers,
+    }
+
+
+async def check_fallback():
+    """A combined reply that isn't valid JSON still yields a full record"""
+    from agents import InterviewAgents
+
+    agents = InterviewAgents("Python", "Backend Developer", evaluation_mode='combined')
+    ask = agents._ask
+
+    async def malformed_evaluator(agent, prompt, on_token=None, role=None):
+        if agent is agents.evaluator:
+            return "Sure! Here is my evaluation: the answer is decent."
+        return await ask(agent, prompt, on_token, role)
+
+    agents._ask = malformed_evaluator
+    record = await agents.process_answer(QUESTION, ANSWER, 1)
+    assert record['feedback'].startswith('STRENGTHS') and record['score_available']
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--answers', type=int, default=40)
+    parser.add_argument('--concurrency', type=int, default=10)
+    parser.add_argument('--latency', default='0.5', help='fake LLM time to first token (spec or seconds)')
+    parser.add_argument('--token-delay', type=float, default=0.005, help='seconds per streamed token')
+    args = parser.parse_args()
+
+    llm = FakeLLMServer(latency=args.latency, token_delay=args.token_delay).start()
+    os.environ['OPENROUTER_BASE_URL'] = llm.base_url
+
+    print(f"⚖️  process_answer, {args.answers} answers ({args.concurrency} concurrent), "
+          f"fake LLM latency {args.latency}s + {args.token_delay * 1000:.0f} ms/token\n")
+    print(f"   {'mode':10s} {'p50 ms':>8s} {'p95 ms':>8s} {'requests/answer':>16s} "
+          f"{'prompt tok/answer':>18s} {'completion tok/answer':>22s}")
+    for mode in ('separate', 'combined'):
+        llm.reset_counters()
+        result = await run_mode(mode, args.answers, args.concurrency)
+        latencies = result['latencies']
+        print(f"   {mode:10s} {statistics.median(latencies):8.0f} {percentile(latencies, 95):8.0f} "
+              f"{llm.stats()['requests'] / args.answers:16.1f} {result['prompt_tokens']:18.0f} "
+              f"{result['completion_tokens']:22.0f}")
+
+    await check_fallback()
+    print("\n✅ Malformed combined reply falls back to Coach + Scorer")
+    llm.stop()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,90 @@
+"""
+Duplicate answer / next-question requests with and without idempotency keys
+
+Plays interviews where every answer and next-question request is sent
+several times at once (a double-click or a client retry racing the
+original) and once more after it completed (a retry after a dropped
+response). Reports the model calls made, the answers recorded and the
+question number each interview ends on, without and with an
+Idempotency-Key per logical request.
+
+Usage:
+    python benchmarks/bench_idempotency.py [--interviews 20] [--questions 3] [--duplicates 3]
+"""
+import argparse
+import asyncio
+import os
+import time
+import uuid
+from datetime import timedelta
+
+import _bootstrap  # noqa: F401
+from fake_llm_server import FakeLLMServer
+
+
+async def interview(service, questions: int, duplicates: int, keyed: bool) -> dict:
+    session_id = service.create_session("Python", "Backend Developer")
+    await service.start_interview(session_id)
+
+    async def send(call, *args):
+        key = uuid.uuid4().hex if keyed else None
+        results = await asyncio.gather(*(call(session_id, *args, idempotency_key=key) for _ in range(duplicates)))
+        results.append(await call(session_id, *args, idempotency_key=key))  # late retry
+        return results
+
+    for n in range(questions):
+        await send(service.submit_answer, f"Answer {n}: a closure captures variables from its scope.")
+        if n + 1 < questions:
+            await send(service.get_next_question)
+
+    session = service.get_session(session_id)
+    return {'answers': len(session.agents.interview_history), 'question_number': session.current_question_number}
+
+
+async def run(llm, interviews: int, questions: int, duplicates: int, keyed: bool) -> dict:
+    from app.services.interview_service import InterviewService
+    from app.services.session_store import MemorySessionStore
+
+    service = InterviewService(store=MemorySessionStore(timedelta(hours=2)), prefetch=False, rolling_summary=False)
+    service.question_cache = None
+    llm.reset_counters()
+    start = time.perf_counter()
+    results = await asyncio.gather(*(interview(service, questions, duplicates, keyed) for _ in range(interviews)))
+    return {
+        'elapsed': time.perf_counter() - start,
+        'requests': llm.stats()['requests'],
+        'answers': sum(r['answers'] for r in results) / interviews,
+        'last_question': sum(r['question_number'] for r in results) / interviews,
+    }
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--interviews', type=int, default=20)
+    parser.add_argument('--questions', type=int, default=3)
+    parser.add_argument('--duplicates', type=int, default=3, help='copies of each request sent at once')
+    parser.add_argument('--latency', default='0.2', help='fake LLM time to first token')
+    args = parser.parse_args()
+
+    llm = FakeLLMServer(latency=args.latency).start()
+    os.environ['OPENROUTER_BASE_URL'] = llm.base_url
+
+    # One start, then per question an answer (Coach + Scorer) and, except after the last, a next question
+    expected_calls = args.interviews * (1 + 2 * args.questions + (args.questions - 1))
+    print(f"🔁 {args.interviews} interviews x {args.questions} questions, each request sent "
+          f"{args.duplicates}x at once + 1 late retry (ideal: {expected_calls} model calls, "
+          f"{args.questions} answers, ending on question {args.questions})\n")
+    print(f"   {'keys':6s} {'model calls':>12s} {'answers/interview':>18s} {'ends on question':>17s} {'seconds':>8s}")
+    for keyed in (False, True):
+        result = await run(llm, args.interviews, args.questions, args.duplicates, keyed)
+        print(f"   {'yes' if keyed else 'no':6s} {result['requests']:12d} {result['answers']:18.1f} "
+              f"{result['last_question']:17.1f} {result['elapsed']:8.2f}")
+        if keyed:
+            assert result['requests'] == expected_calls, "duplicates reached the model"
+            assert result['last_question'] == args.questions, "a question was skipped"
+    llm.stop()
+    print("\n✅ With keys, duplicates made no model calls and no question was skipped")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
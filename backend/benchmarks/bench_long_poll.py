@@ -0,0 +1,118 @@
+"""
+Watching a session: tight polling vs. conditional GET vs. long-polling
+
+Boots an ASGI worker against the fake LLM, drives one interview through
+a series of answers and next questions, and has N watchers follow the
+session info endpoint in one of three ways:
+
+    poll         GET every --interval seconds, full body each time
+    conditional  same, with If-None-Match (304 while nothing changed)
+    long-poll    GET ?wait=30 with If-None-Match, answered on change
+
+Reports requests and bytes the watchers received, the server's CPU time,
+and how long after a change the watchers saw it.
+
+Usage:
+    python benchmarks/bench_long_poll.py [--watchers 50] [--steps 6] [--interval 0.25]
+"""
+import argparse
+import asyncio
+import statistics
+import time
+
+import httpx
+
+import _bootstrap  # noqa: F401
+from _harness import free_port, start_server, wait_healthy
+from fake_llm_server import FakeLLMServer
+
+MODES = ('poll', 'conditional', 'long-poll')
+
+
+def cpu_seconds(pid: int) -> float:
+    """User + system CPU time of a process (Linux)"""
+    with open(f"/proc/{pid}/stat") as f:
+        fields = f.read().rsplit(')', 1)[1].split()
+    return (int(fields[11]) + int(fields[12])) / 100
+
+
+async def watch(client, url: str, mode: str, interval: float, seen: dict, stop: asyncio.Event, totals: dict):
+    etag = None
+    while not stop.is_set():
+        headers = {'If-None-Match': etag} if etag and mode != 'poll' else {}
+        params = {'wait': 30} if mode == 'long-poll' and etag else {}
+        response = await client.get(url, headers=headers, params=params)
+        totals['requests'] += 1
+        totals['bytes'] += len(response.content)
+        totals[response.status_code] = totals.get(response.status_code, 0) + 1
+        if response.status_code == 200:
+            etag = response.headers.get('ETag')
+            version = response.json()['version']
+            seen.setdefault(version, []).append(time.perf_counter())
+        if mode != 'long-poll':
+            await asyncio.sleep(interval)
+
+
+async def run(base: str, pid: int, mode: str, watchers: int, steps: int, interval: float) -> dict:
+    async with httpx.AsyncClient(timeout=60, limits=httpx.Limits(max_connections=watchers + 10)) as client:
+        session_id = (await client.post(f"{base}/api/interview/create",
+                                        json={'technology': 'Python', 'position': 'Backend Developer'})).json()['session_id']
+        url = f"{base}/api/interview/{session_id}"
+        seen, totals, stop = {}, {'requests': 0, 'bytes': 0}, asyncio.Event()
+        tasks = [asyncio.ensure_future(watch(client, url, mode, interval, seen, stop, totals)) for _ in range(watchers)]
+        await asyncio.sleep(0.5)
+
+        cpu_before = cpu_seconds(pid)
+        changed = {}
+        await client.post(f"{base}/api/interview/{session_id}/start")
+        changed[(await client.get(f"{base}/api/interview/{session_id}")).json()['version']] = time.perf_counter()
+        for step in range(steps):
+            if step % 2 == 0:
+                await client.post(f"{url}/answer", json={'answer': f"Answer {step}: a closure keeps its scope."})
+            else:
+                await client.post(f"{url}/next-question")
+            changed[(await client.get(url)).json()['version']] = time.perf_counter()
+            await asyncio.sleep(0.5)
+        await asyncio.sleep(0.5)
+        stop.set()
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        cpu = cpu_seconds(pid) - cpu_before
+
+    # Delay from the driver seeing a change (just after it was saved) to each watcher seeing it
+    delays = [max(0.0, t - changed[v]) * 1000 for v, times in seen.items() if v in changed for t in times]
+    return {**totals, 'cpu': cpu, 'delay_p50': statistics.median(delays) if delays else float('nan')}
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--watchers', type=int, default=50)
+    parser.add_argument('--steps', type=int, default=6, help='answers + next questions driven through the interview')
+    parser.add_argument('--interval', type=float, default=0.25, help='polling interval for poll/conditional')
+    parser.add_argument('--latency', default='0.3', help='fake LLM time to first token')
+    args = parser.parse_args()
+
+    llm = FakeLLMServer(latency=args.latency).start()
+    port = free_port()
+    base = f"http://127.0.0.1:{port}"
+    server = start_server('asgi', port, {'OPENROUTER_BASE_URL': llm.base_url, 'REQUEST_LOG_SINK': 'off'})
+    try:
+        async with httpx.AsyncClient() as client:
+            await wait_healthy(client, base)
+        print(f"👀 {args.watchers} watchers on one interview ({args.steps} steps), ASGI worker, "
+              f"poll interval {args.interval * 1000:.0f} ms\n")
+        print(f"   {'mode':12s} {'requests':>9s} {'200':>6s} {'304':>6s} {'KB':>8s} {'server CPU s':>13s} "
+              f"{'seen after ms (p50)':>20s}")
+        for mode in MODES:
+            result = await run(base, server.pid, mode, args.watchers, args.steps, args.interval)
+            print(f"   {mode:12s} {result['requests']:9d} {result.get(200, 0):6d} {result.get(304, 0):6d} "
+                  f"{result['bytes'] / 1000:8.1f} {result['cpu']:13.2f} {result['delay_p50']:20.0f}")
+    finally:
+        server.terminate()
+        server.wait()
+        llm.stop()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,81 @@
+"""
+Latency comparison of sequential vs. concurrent Coach/Scorer evaluation
+
+The Coach and Scorer are replaced with stubs that sleep for a fixed
+upstream latency, so the numbers only reflect how `process_answer`
+schedules the two calls.
+
+Usage:
+    python benchmarks/bench_process_answer.py [--coach-ms 800] [--scorer-ms 600] [--runs 5]
+"""
+import argparse
+import asyncio
+import statistics
+import time
+
+import _bootstrap  # noqa: F401
+from agents import InterviewAgents
+
+
+def make_agents(concurrent: bool, coach_s: float, scorer_s: float, scorer_fails: bool = False) -> InterviewAgents:
+    """Build InterviewAgents whose Coach/Scorer calls just sleep"""
+    agents = InterviewAgents("Python", "Backend Developer", concurrent_evaluation=concurrent)
+
+    async def fake_feedback(question, answer, on_token=None):
+        await asyncio.sleep(coach_s)
+        return "STRENGTHS: ...\nIMPROVEMENTS: ...\nIDEAL ANSWER APPROACH: ..."
+
+    async def fake_score(question, answer, on_token=None):
+        await asyncio.sleep(scorer_s)
+        if scorer_fails:
+            raise RuntimeError("scorer upstream error")
+        return 7, "SCORE: 7/10\nJUSTIFICATION: ..."
+
+    agents.get_feedback = fake_feedback
+    agents.get_score = fake_score
+    return agents
+
+
+async def time_mode(concurrent: bool, coach_s: float, scorer_s: float, runs: int) -> list:
+    """Time `process_answer` for one mode, returning per-run latencies in ms"""
+    agents = make_agents(concurrent, coach_s, scorer_s)
+    latencies = []
+    for i in range(runs):
+        start = time.perf_counter()
+        await agents.process_answer("What is a closure?", "A function plus its scope.", i + 1)
+        latencies.append((time.perf_counter() - start) * 1000)
+    return latencies
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--coach-ms', type=float, default=800)
+    parser.add_argument('--scorer-ms', type=float, default=600)
+    parser.add_argument('--runs', type=int, default=5)
+    args = parser.parse_args()
+
+    coach_s, scorer_s = args.coach_ms / 1000, args.scorer_ms / 1000
+
+    print(f"⏱️  process_answer latency (Coach {args.coach_ms:.0f} ms, Scorer {args.scorer_ms:.0f} ms, {args.runs} runs)\n")
+
+    sequential = await time_mode(False, coach_s, scorer_s, args.runs)
+    concurrent = await time_mode(True, coach_s, scorer_s, args.runs)
+
+    seq_median = statistics.median(sequential)
+    con_median = statistics.median(concurrent)
+    print(f"   sequential: median {seq_median:8.1f} ms")
+    print(f"   concurrent: median {con_median:8.1f} ms")
+    print(f"   speedup:    {seq_median / con_median:.2f}x")
+
+    # Concurrent mode must be bounded by the slower agent, not the sum
+    assert con_median < (args.coach_ms + args.scorer_ms) * 0.9, "concurrent mode is not overlapping the agents"
+
+    # Partial failure: the feedback still comes back when the Scorer fails
+    agents = make_agents(True, coach_s, scorer_s, scorer_fails=True)
+    record = await agents.process_answer("What is a closure?", "A function plus its scope.", 1)
+    assert record['feedback_available'] and not record['score_available'] and record['score'] is None
+    print("\n✅ Scorer failure returns feedback with score marked unavailable")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,89 @@
+"""
+One model for every agent vs. faster models for the Interviewer and Scorer
+
+Runs a short interview (questions, answers and the summary) per session
+against the fake LLM, where the large model is slow and the small one is
+fast, and reports per-role latency and end-to-end time for each routing.
+
+Usage:
+    python benchmarks/bench_role_models.py [--sessions 20] [--answers 3] [--slow 0.8] [--fast 0.2]
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import time
+
+import _bootstrap  # noqa: F401
+from fake_llm_server import FakeLLMServer
+
+LARGE_MODEL = 'large-model'
+SMALL_MODEL = 'small-model'
+ANSWER = "A closure is a function that keeps access to variables from the scope where it was defined."
+
+ROUTINGS = {
+    'single model': {},
+    'routed': {'INTERVIEWER_MODEL': SMALL_MODEL, 'SCORER_MODEL': SMALL_MODEL},
+}
+
+
+def apply_routing(overrides: dict):
+    from app.config import AGENT_ROLES, Config, role_model_settings
+
+    for role in AGENT_ROLES:
+        os.environ.pop(f'{role.upper()}_MODEL', None)
+    os.environ['MODEL'] = LARGE_MODEL
+    os.environ.update(overrides)
+    Config.ROLE_MODELS = {role: role_model_settings(role) for role in AGENT_ROLES}
+
+
+async def run_routing(sessions: int, answers: int, concurrency: int) -> dict:
+    from agents import InterviewAgents, agent_call_stats
+    from app.services.metrics import llm_request_duration
+
+    agent_call_stats.reset()
+    llm_request_duration.reset()
+    semaphore = asyncio.Semaphore(concurrency)
+    durations = []
+
+    async def interview():
+        async with semaphore:
+            agents = InterviewAgents("Python", "Backend Developer")
+            start = time.perf_counter()
+            for i in range(answers):
+                question = await agents.get_next_question(i + 1)
+                await agents.process_answer(question, ANSWER, i + 1)
+            await agents.get_overall_summary()
+            durations.append((time.perf_counter() - start) * 1000)
+
+    await asyncio.gather(*(interview() for _ in range(sessions)))
+    return {'durations': durations, 'roles': agent_call_stats.stats()}
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sessions', type=int, default=20)
+    parser.add_argument('--answers', type=int, default=3)
+    parser.add_argument('--concurrency', type=int, default=10)
+    parser.add_argument('--slow', default='0.8', help=f'{LARGE_MODEL} latency (spec or seconds)')
+    parser.add_argument('--fast', default='0.2', help=f'{SMALL_MODEL} latency (spec or seconds)')
+    args = parser.parse_args()
+
+    llm = FakeLLMServer(latency=args.slow, model_latency={LARGE_MODEL: args.slow, SMALL_MODEL: args.fast}).start()
+    os.environ['OPENROUTER_BASE_URL'] = llm.base_url
+
+    print(f"🧭 {args.sessions} interviews × {args.answers} answers, "
+          f"{LARGE_MODEL} {args.slow}s vs. {SMALL_MODEL} {args.fast}s\n")
+    for name, overrides in ROUTINGS.items():
+        apply_routing(overrides)
+        result = await run_routing(args.sessions, args.answers, args.concurrency)
+        print(f"   {name}: interview p50 {statistics.median(result['durations']):.0f} ms")
+        for role, stats in result['roles'].items():
+            latency = ', '.join(f"{model} {ms:.0f} ms" for model, ms in stats.get('mean_latency_ms', {}).items())
+            print(f"      {role:12s} {stats['calls']:4.0f} calls   {latency}")
+        print()
+    llm.stop()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,89 @@
+"""
+/end latency with the summary built at the end vs. a rolling summary
+
+Runs interviews through InterviewService against the fake LLM, pausing
+between answers like a candidate reading feedback, then ends them.
+With ROLLING_SUMMARY the assessment is refreshed in the background after
+each answer, so /end only returns what is already there; `refresh`
+additionally waits for the newest answer to be folded in.
+
+Usage:
+    python benchmarks/bench_rolling_summary.py [--sessions 20] [--answers 3] [--latency 0.8] [--think 1.5]
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import time
+
+import _bootstrap  # noqa: F401
+from _harness import percentile
+from fake_llm_server import FakeLLMServer
+
+ANSWER = "A closure is a function that keeps access to variables from the scope where it was defined."
+
+MODES = (
+    ('at end', {'rolling_summary': False}, {}),
+    ('rolling', {'rolling_summary': True}, {}),
+    ('rolling+refresh', {'rolling_summary': True}, {'refresh': True}),
+)
+
+
+async def run_mode(service_kwargs: dict, end_kwargs: dict, sessions: int, answers: int,
+                   think: float, end_after: float) -> dict:
+    from app.services.interview_service import InterviewService
+
+    service = InterviewService(prefetch=False, **service_kwargs)
+    end_latencies, current, summary_tokens = [], 0, []
+
+    async def interview():
+        nonlocal current
+        session_id = service.create_session("Python", "Backend Developer")
+        await service.start_interview(session_id)
+        for i in range(answers):
+            await service.submit_answer(session_id, ANSWER)
+            if i < answers - 1:
+                await asyncio.sleep(think)
+                await service.get_next_question(session_id)
+        await asyncio.sleep(end_after)
+
+        start = time.perf_counter()
+        result = await service.end_interview(session_id, **end_kwargs)
+        end_latencies.append((time.perf_counter() - start) * 1000)
+        current += result['summary']['summary_current']
+
+        # Let a still-running refresh finish before counting its tokens
+        session = service.get_session(session_id)
+        if session.summary_task is not None:
+            await session.summary_task
+        summary_tokens.append(session.agents.usage.to_dict()['by_agent'].get('summary', {}).get('prompt_tokens', 0))
+
+    await asyncio.gather(*(interview() for _ in range(sessions)))
+    return {'end': end_latencies, 'current': current, 'summary_tokens': summary_tokens}
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sessions', type=int, default=20)
+    parser.add_argument('--answers', type=int, default=3)
+    parser.add_argument('--latency', default='0.8', help='fake LLM time to first token (spec or seconds)')
+    parser.add_argument('--think', type=float, default=1.5, help='seconds between an answer and the next question')
+    parser.add_argument('--end-after', type=float, default=0.2,
+                        help='seconds between the last answer and /end (shorter than a refresh on purpose)')
+    args = parser.parse_args()
+
+    llm = FakeLLMServer(latency=args.latency).start()
+    os.environ['OPENROUTER_BASE_URL'] = llm.base_url
+
+    print(f"🏁 /end latency, {args.sessions} interviews × {args.answers} answers, "
+          f"fake LLM latency {args.latency}s, /end {args.end_after}s after the last answer\n")
+    print(f"   {'mode':16s} {'p50 ms':>8s} {'p95 ms':>8s} {'summary current':>16s} {'summary prompt tok':>19s}")
+    for name, service_kwargs, end_kwargs in MODES:
+        result = await run_mode(service_kwargs, end_kwargs, args.sessions, args.answers, args.think, args.end_after)
+        print(f"   {name:16s} {statistics.median(result['end']):8.0f} {percentile(result['end'], 95):8.0f} "
+              f"{result['current']:>10d}/{args.sessions:<5d} {statistics.mean(result['summary_tokens']):19.0f}")
+    llm.stop()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
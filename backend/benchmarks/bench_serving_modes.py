@@ -0,0 +1,79 @@
+"""
+How many interviews can one worker keep in flight: WSGI (gunicorn) vs. ASGI (uvicorn)
+
+Starts a fake upstream with a fixed latency, boots one backend worker in
+each serving mode against it, and fires N concurrent `/start` calls. The
+peak number of simultaneous upstream calls is the number of interviews the
+worker was actually serving at once.
+
+Usage:
+    python benchmarks/bench_serving_modes.py [--interviews 64] [--latency 2.0] [--threads 4]
+"""
+import argparse
+import asyncio
+import time
+
+import httpx
+
+import _bootstrap  # noqa: F401
+from _harness import free_port, start_server, wait_healthy
+from fake_llm_server import FakeLLMServer
+
+
+async def run_mode(mode: str, upstream: FakeLLMServer, interviews: int, threads: int) -> dict:
+    port = free_port()
+    base = f"http://127.0.0.1:{port}"
+    server = start_server(mode, port, {
+        'OPENROUTER_BASE_URL': upstream.base_url,
+        'LLM_POOL_MAX_CONNECTIONS': str(max(interviews * 2, 100)),
+    }, threads=threads)
+    limits = httpx.Limits(max_connections=None, max_keepalive_connections=None)
+    try:
+        async with httpx.AsyncClient(timeout=300, limits=limits) as client:
+            await wait_healthy(client, base)
+
+            session_ids = []
+            for _ in range(interviews):
+                response = await client.post(f"{base}/api/interview/create",
+                                             json={'technology': 'Python', 'position': 'Backend Developer'})
+                session_ids.append(response.json()['session_id'])
+
+            upstream.reset_counters()
+            start = time.perf_counter()
+            responses = await asyncio.gather(*(
+                client.post(f"{base}/api/interview/{sid}/start") for sid in session_ids
+            ))
+            elapsed = time.perf_counter() - start
+    finally:
+        server.terminate()
+        server.wait()
+
+    return {
+        'mode': mode,
+        'ok': sum(1 for r in responses if r.status_code == 200),
+        'peak_in_flight': upstream.peak_in_flight,
+        'elapsed': elapsed,
+    }
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--interviews', type=int, default=64)
+    parser.add_argument('--latency', type=float, default=2.0, help='fake upstream latency in seconds')
+    parser.add_argument('--threads', type=int, default=4, help='gunicorn threads per worker (Dockerfile uses 4)')
+    args = parser.parse_args()
+
+    upstream = FakeLLMServer(latency=args.latency).start()
+    print(f"🔬 {args.interviews} concurrent /start calls, upstream latency {args.latency}s, one worker per mode\n")
+
+    for mode in ('wsgi', 'asgi'):
+        result = await run_mode(mode, upstream, args.interviews, args.threads)
+        print(f"   {result['mode'].upper()}: {result['ok']}/{args.interviews} ok, "
+              f"peak in-flight interviews {result['peak_in_flight']:4d}, "
+              f"wall time {result['elapsed']:6.2f}s")
+
+    upstream.stop()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
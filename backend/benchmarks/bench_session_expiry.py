@@ -0,0 +1,87 @@
+"""
+Session expiry cost at scale: full scan on every create vs. heap index + reaper
+
+Fills a MemorySessionStore with N live sessions, then times adding more
+sessions (a) with the old behaviour of scanning every session for expiry
+on each create and (b) with the expiry heap, where create does no scan.
+Finally expires everything and times the reaper draining it in batches.
+
+Sessions are lightweight stand-ins, so the numbers only reflect the store.
+
+Usage:
+    python benchmarks/bench_session_expiry.py [--sessions 100000] [--creates 200]
+"""
+import argparse
+import statistics
+import time
+import uuid
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+import _bootstrap  # noqa: F401
+from app.services.session_store import MemorySessionStore
+
+
+def make_session():
+    return SimpleNamespace(session_id=str(uuid.uuid4()), last_activity=datetime.now())
+
+
+def full_scan_cleanup(store: MemorySessionStore):
+    """The expiry check create_session used to run on every call"""
+    now = datetime.now()
+    expired = [
+        sid for sid, session in store.sessions.items()
+        if now - session.last_activity > store.session_timeout
+    ]
+    for sid in expired:
+        del store.sessions[sid]
+
+
+def time_creates(store: MemorySessionStore, creates: int, scan: bool) -> list:
+    latencies = []
+    for _ in range(creates):
+        start = time.perf_counter()
+        if scan:
+            full_scan_cleanup(store)
+        store.save(make_session())
+        latencies.append((time.perf_counter() - start) * 1e6)
+    return latencies
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sessions', type=int, default=100_000)
+    parser.add_argument('--creates', type=int, default=200)
+    args = parser.parse_args()
+
+    # reaper_interval=0 disables the background thread; the benchmark drives reap() itself
+    store = MemorySessionStore(timedelta(hours=2), reaper_interval=0)
+    for _ in range(args.sessions):
+        store.save(make_session())
+
+    print(f"📦 {store.count():,} live sessions\n")
+
+    scan = time_creates(store, args.creates, scan=True)
+    heap = time_creates(store, args.creates, scan=False)
+    print(f"   create with full scan:  median {statistics.median(scan):10.1f} µs")
+    print(f"   create with heap index: median {statistics.median(heap):10.1f} µs")
+
+    # Age every session past the timeout and let the reaper drain them
+    past = datetime.now() - timedelta(hours=3)
+    for session in store.sessions.values():
+        session.last_activity = past
+    store._expiry_heap = [(past.timestamp(), sid) for _, sid in store._expiry_heap]
+
+    batches = []
+    while True:
+        start = time.perf_counter()
+        evicted = store.reap()
+        batches.append((time.perf_counter() - start) * 1000)
+        if evicted < store.reaper_batch:
+            break
+    print(f"\n🧹 reaped to {store.count():,} sessions in {len(batches)} batches of {store.reaper_batch}, "
+          f"worst batch {max(batches):.2f} ms (lock hold time)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""
+Memory per interview session
+
+Creates N sessions in one process and measures the Python heap they hold
+(tracemalloc) in three states: just created (never started), with their
+agents built, and with three answered questions each.
+
+Usage:
+    python benchmarks/bench_session_memory.py [--sessions 10000,100000] [--built 10000]
+"""
+import argparse
+import gc
+import tracemalloc
+
+import _bootstrap  # noqa: F401
+
+ANSWERS = 3
+
+
+def measure(factory, count: int) -> float:
+    """Bytes per object held by `count` objects from factory()"""
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    objects = [factory(i) for i in range(count)]
+    gc.collect()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del objects
+    return (after - before) / count
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sessions', default='10000,100000', help='session counts for created sessions')
+    parser.add_argument('--built', type=int, default=10000, help='session count for the heavier states')
+    args = parser.parse_args()
+
+    from app.services.interview_service import InterviewSession
+
+    def created(i):
+        return InterviewSession(f"session-{i}", "Python", "Backend Developer")
+
+    def built(i):
+        session = created(i)
+        session.agents.interviewer  # first use builds the agents
+        return session
+
+    def answered(i):
+        session = built(i)
+        for n in range(1, ANSWERS + 1):
+            session.agents._record_answer(
+                f"Question {n} about closures?", f"Answer {n} from candidate {i}.", n,
+                "STRENGTHS: ...\nIMPROVEMENTS: ...\nIDEAL ANSWER APPROACH: ...", True,
+                7, "SCORE: 7/10\nJUSTIFICATION: ...", True,
+            )
+        return session
+
+    print("🧠 Heap held per interview session (tracemalloc)\n")
+    print(f"   {'state':32s} {'sessions':>9s} {'bytes/session':>14s} {'total MB':>9s}")
+    for count in (int(c) for c in args.sessions.split(',')):
+        per = measure(created, count)
+        print(f"   {'created, never started':32s} {count:9d} {per:14.0f} {per * count / 1e6:9.1f}")
+    for name, factory in ((f'agents built', built), (f'{ANSWERS} answers recorded', answered)):
+        per = measure(factory, args.built)
+        print(f"   {name:32s} {args.built:9d} {per:14.0f} {per * args.built / 1e6:9.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+"""
+Cost of SQLite write-behind persistence on submit_answer
+
+Runs the same workload (many concurrent sessions, several answers each)
+through InterviewService with the memory and the sqlite session backends
+and compares submit_answer latency. The Coach and Scorer are stubs that
+sleep for a fixed time, so any difference is the store's own overhead.
+
+Then simulates a restart: opens a new store on the same database file,
+and reports how long startup and the first (lazy) load of a session take
+and checks the reloaded Q&A records match.
+
+Usage:
+    python benchmarks/bench_sqlite_store.py [--sessions 200] [--answers 5] [--llm-ms 20]
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import tempfile
+import time
+from datetime import timedelta
+
+import _bootstrap  # noqa: F401
+from agents import InterviewAgents
+from app.services.interview_service import InterviewService
+from app.services.session_store import MemorySessionStore, SQLiteSessionStore
+
+TIMEOUT = timedelta(hours=2)
+
+
+def stub_agents(llm_s: float):
+    async def fake_feedback(self, question, answer, on_token=None):
+        await asyncio.sleep(llm_s)
+        return "STRENGTHS: ...\nIMPROVEMENTS: ...\nIDEAL ANSWER APPROACH: ..."
+
+    async def fake_score(self, question, answer, on_token=None):
+        await asyncio.sleep(llm_s)
+        return 7, "SCORE: 7/10\nJUSTIFICATION: ..."
+
+    InterviewAgents.get_feedback = fake_feedback
+    InterviewAgents.get_score = fake_score
+
+
+async def run(store, sessions: int, answers: int) -> list:
+    """submit_answer latencies (ms) for `sessions` concurrent interviews"""
+    service = InterviewService(store=store, prefetch=False, rolling_summary=False)
+    latencies = []
+
+    async def interview(i):
+        session_id = service.create_session("Python", "Backend Developer")
+        session = service.get_session(session_id)
+        for n in range(1, answers + 1):
+            session.current_question_number = n
+            session.current_question = f"Question {n}: what is a closure?"
+            start = time.perf_counter()
+            await service.submit_answer(session_id, f"Answer {n} from candidate {i}: a function plus its scope.")
+            latencies.append((time.perf_counter() - start) * 1000)
+
+    await asyncio.gather(*(interview(i) for i in range(sessions)))
+    return latencies
+
+
+def percentile(values: list, q: float) -> float:
+    return statistics.quantiles(values, n=100)[int(q) - 1]
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sessions', type=int, default=200)
+    parser.add_argument('--answers', type=int, default=5)
+    parser.add_argument('--llm-ms', type=float, default=20, help='stubbed Coach/Scorer latency')
+    parser.add_argument('--rounds', type=int, default=5)
+    args = parser.parse_args()
+
+    stub_agents(args.llm_ms / 1000)
+    workdir = tempfile.mkdtemp(prefix='bench-sqlite-')
+    path = os.path.join(workdir, 'sessions.db')
+
+    print(f"💾 submit_answer latency, {args.sessions} concurrent sessions x {args.answers} answers, "
+          f"stubbed LLM {args.llm_ms:.0f} ms, {args.rounds} rounds\n")
+    print(f"   {'backend':8s} {'p50 ms':>8s} {'p99 ms':>8s} {'mean ms':>8s}")
+    # One store per backend, rounds interleaved so both see the same machine state
+    stores = {'memory': MemorySessionStore(TIMEOUT), 'sqlite': SQLiteSessionStore(TIMEOUT, path=path)}
+    latencies = {backend: [] for backend in stores}
+    for _ in range(args.rounds):
+        for backend, store in stores.items():
+            latencies[backend] += await run(store, args.sessions, args.answers)
+    for backend, values in latencies.items():
+        print(f"   {backend:8s} {statistics.median(values):8.2f} {percentile(values, 99):8.2f} "
+              f"{statistics.mean(values):8.2f}")
+
+    store = stores['sqlite']
+    stats = store.stats()
+    print(f"\n   writer during the runs: {stats['flushes']} flushes, {stats['sessions_written']} session writes, "
+          f"{stats['records_written']} Q&A records, largest batch {stats['largest_batch']}")
+    store.flush()
+
+    # Restart: a fresh store on the same file loads nothing until asked
+    start = time.perf_counter()
+    restarted = SQLiteSessionStore(TIMEOUT, path=path)
+    startup_ms = (time.perf_counter() - start) * 1000
+    session_id, original = next(iter(store.sessions.items()))
+    start = time.perf_counter()
+    reloaded = restarted.get(session_id)
+    load_ms = (time.perf_counter() - start) * 1000
+    start = time.perf_counter()
+    restarted.get(session_id)
+    hit_ms = (time.perf_counter() - start) * 1000
+
+    assert reloaded is not None, "session was not persisted"
+    assert ([r.to_row() for r in reloaded.agents.interview_history]
+            == [r.to_row() for r in original.agents.interview_history]), "Q&A records differ after reload"
+    print(f"   restart: store ready in {startup_ms:.2f} ms, first get (lazy load) {load_ms:.2f} ms, "
+          f"then {hit_ms * 1000:.0f} µs from memory")
+    print(f"\n✅ {len(reloaded.agents.interview_history)} Q&A records reloaded intact")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
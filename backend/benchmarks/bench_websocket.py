@@ -0,0 +1,185 @@
+"""
+Whole interview over REST vs. the WebSocket channel, on links with added RTT
+
+Boots an ASGI worker against the fake LLM and plays the same interview
+(create, start, N answers with next questions, end) two ways through a
+TCP proxy that adds a fixed round-trip time:
+
+    rest       one HTTP request per step over a keep-alive connection,
+               plus the CORS preflight a browser sends once per URL
+               (axios sends JSON, so every POST is preflighted)
+    websocket  one connection; the answer message asks for the next
+               question too, so each question costs one round trip
+
+Reports network round trips and end-to-end interview time.
+
+Usage:
+    python benchmarks/bench_websocket.py [--questions 5] [--rtt 0,50,150] [--runs 3]
+"""
+import argparse
+import asyncio
+import json
+import statistics
+import time
+
+import httpx
+import websockets
+
+import _bootstrap  # noqa: F401
+from _harness import free_port, start_server, wait_healthy
+from fake_llm_server import FakeLLMServer
+
+ORIGIN = 'http://localhost:3000'
+
+
+class LatencyProxy:
+    """TCP proxy adding half the RTT to each direction of every connection"""
+
+    def __init__(self, target_port: int, rtt: float):
+        self.target_port = target_port
+        self.delay = rtt / 2
+        self.server = None
+
+    async def start(self) -> int:
+        self.server = await asyncio.start_server(self._handle, '127.0.0.1', 0)
+        return self.server.sockets[0].getsockname()[1]
+
+    async def stop(self):
+        self.server.close()
+
+    async def _handle(self, reader, writer):
+        upstream_reader, upstream_writer = await asyncio.open_connection('127.0.0.1', self.target_port)
+        pipes = [asyncio.ensure_future(self._pipe(reader, upstream_writer)),
+                 asyncio.ensure_future(self._pipe(upstream_reader, writer))]
+        try:
+            await asyncio.wait(pipes, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            for pipe in pipes:
+                pipe.cancel()
+            await asyncio.gather(*pipes, return_exceptions=True)
+            writer.close()
+            upstream_writer.close()
+
+    async def _pipe(self, reader, writer):
+        loop = asyncio.get_running_loop()
+        queue = asyncio.Queue()
+
+        async def deliver():
+            while True:
+                due, data = await queue.get()
+                await asyncio.sleep(max(0.0, due - loop.time()))
+                if not data:
+                    writer.close()
+                    return
+                writer.write(data)
+                await writer.drain()
+
+        delivery = asyncio.ensure_future(deliver())
+        try:
+            while True:
+                data = await reader.read(65536)
+                queue.put_nowait((loop.time() + self.delay, data))
+                if not data:
+                    break
+            await delivery
+        except ConnectionError:
+            pass
+        finally:
+            delivery.cancel()
+
+
+async def rest_interview(base: str, questions: int) -> int:
+    """Play one interview over REST; returns the round trips made"""
+    trips = 0
+    preflighted = set()
+    async with httpx.AsyncClient(base_url=base, timeout=60, headers={'Origin': ORIGIN}) as client:
+        async def post(path, body=None):
+            nonlocal trips
+            if path not in preflighted:
+                preflighted.add(path)
+                trips += 1
+                await client.options(path, headers={'Access-Control-Request-Method': 'POST',
+                                                    'Access-Control-Request-Headers': 'content-type'})
+            trips += 1
+            response = await client.post(path, json=body or {})
+            assert response.status_code < 300, response.text
+            return response.json()
+
+        session_id = (await post('/api/interview/create',
+                                 {'technology': 'Python', 'position': 'Backend Developer'}))['session_id']
+        await post(f'/api/interview/{session_id}/start')
+        for n in range(questions):
+            await post(f'/api/interview/{session_id}/answer', {'answer': f"Answer {n}: a closure keeps its scope."})
+            if n + 1 < questions:
+                await post(f'/api/interview/{session_id}/next-question')
+        await post(f'/api/interview/{session_id}/end')
+    return trips
+
+
+async def ws_interview(url: str, questions: int) -> int:
+    """Play one interview over the WebSocket channel; returns the round trips made"""
+    trips = 1  # the upgrade handshake
+    async with websockets.connect(url, origin=ORIGIN) as ws:
+        async def exchange(message: dict, until: str):
+            nonlocal trips
+            trips += 1
+            await ws.send(json.dumps(message))
+            while True:
+                reply = json.loads(await ws.recv())
+                assert reply['type'] != 'error', reply
+                if reply['type'] == until:
+                    return reply
+
+        await exchange({'type': 'create', 'technology': 'Python', 'position': 'Backend Developer'}, 'session')
+        await exchange({'type': 'start'}, 'question')
+        for n in range(questions):
+            last = n + 1 == questions
+            await exchange({'type': 'answer', 'answer': f"Answer {n}: a closure keeps its scope.", 'next': not last},
+                           'feedback' if last else 'question')
+        await exchange({'type': 'end'}, 'summary')
+    return trips
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--questions', type=int, default=5)
+    parser.add_argument('--rtt', default='0,50,150', help='added round-trip times in ms')
+    parser.add_argument('--runs', type=int, default=3)
+    parser.add_argument('--latency', default='0.2', help='fake LLM time to first token')
+    args = parser.parse_args()
+
+    llm = FakeLLMServer(latency=args.latency).start()
+    port = free_port()
+    server = start_server('asgi', port, {'OPENROUTER_BASE_URL': llm.base_url, 'REQUEST_LOG_SINK': 'off',
+                                         'QUESTION_CACHE_ENABLED': 'False'})
+    try:
+        async with httpx.AsyncClient() as client:
+            await wait_healthy(client, f"http://127.0.0.1:{port}")
+        print(f"🔌 One interview of {args.questions} questions, fake LLM latency {args.latency}s, "
+              f"median of {args.runs} runs\n")
+        print(f"   {'RTT ms':>6s} {'mode':10s} {'round trips':>12s} {'seconds':>8s}")
+        # Warm up the worker (first-request imports, model client) before timing
+        await rest_interview(f"http://127.0.0.1:{port}", 1)
+        await ws_interview(f"ws://127.0.0.1:{port}/api/interview/ws", 1)
+        for rtt in (float(r) for r in args.rtt.split(',')):
+            proxy = LatencyProxy(port, rtt / 1000)
+            proxy_port = await proxy.start()
+            for mode in ('rest', 'websocket'):
+                times, trips = [], 0
+                for _ in range(args.runs):
+                    start = time.perf_counter()
+                    if mode == 'rest':
+                        trips = await rest_interview(f"http://127.0.0.1:{proxy_port}", args.questions)
+                    else:
+                        trips = await ws_interview(f"ws://127.0.0.1:{proxy_port}/api/interview/ws", args.questions)
+                    times.append(time.perf_counter() - start)
+                print(f"   {rtt:6.0f} {mode:10s} {trips:12d} {statistics.median(times):8.2f}")
+            await proxy.stop()
+    finally:
+        server.terminate()
+        server.wait()
+        llm.stop()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
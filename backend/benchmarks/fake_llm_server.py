@@ -0,0 +1,352 @@
+"""
+Offline OpenAI-compatible chat-completions server for load tests
+
+Point the backend at it instead of OpenRouter and no credits are spent:
+
+    python benchmarks/fake_llm_server.py --port 8765 --latency lognormal:0.8,0.5
+    OPENROUTER_BASE_URL=http://127.0.0.1:8765/v1 python run.py
+
+Replies are canned per agent role (questions for the Interviewer, structured
+feedback for the Coach, `SCORE: X/10` for the Scorer, a JSON evaluation for
+the combined Evaluator) and can be streamed token by token. Latency follows
+a configurable distribution (optionally per model), the number of requests
+served at once can be capped (or requests beyond a concurrency limit
+rejected with a 429), and a fraction of requests can fail with a 500, be
+rate limited with a 429, or hang.
+
+Latency specs:
+    0.5 / fixed:0.5         always 0.5 s
+    uniform:0.2,1.5         uniform between 0.2 and 1.5 s
+    normal:0.8,0.2          normal with mean 0.8 s, std dev 0.2 s (clamped at 0)
+    lognormal:0.8,0.5       log-normal with median 0.8 s and sigma 0.5 (long tail)
+    exp:0.8                 exponential with mean 0.8 s
+"""
+import argparse
+import json
+import math
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, Union
+
+
+QUESTIONS = [
+    "What is the difference between a process and a thread?",
+    "How would you design a rate limiter for a public API?",
+    "Explain how a hash map handles collisions.",
+    "What happens when you type a URL into the browser and press enter?",
+    "How do you find and fix a memory leak in a long-running service?",
+    "When would you choose a message queue over direct HTTP calls?",
+]
+
+FEEDBACK = (
+    "STRENGTHS: The answer identifies the core concept and uses correct terminology.\n"
+    "IMPROVEMENTS: Add a concrete example and discuss trade-offs and edge cases.\n"
+    "IDEAL ANSWER APPROACH: Define the concept, walk through an example, then cover "
+    "trade-offs and how you would apply it in production."
+)
+
+SUMMARY = (
+    "The candidate showed a solid grasp of fundamentals and communicated clearly. "
+    "Answers would benefit from more depth on trade-offs and real-world examples."
+)
+
+
+def parse_latency(spec: Union[str, float]) -> Callable[[], float]:
+    """Build a latency sampler (seconds) from a spec like `lognormal:0.8,0.5`"""
+    if isinstance(spec, (int, float)):
+        return lambda: float(spec)
+    kind, _, params = str(spec).partition(':')
+    if not params:
+        value = float(kind)
+        return lambda: value
+    args = [float(p) for p in params.split(',')]
+    if kind == 'fixed':
+        return lambda: args[0]
+    if kind == 'uniform':
+        return lambda: random.uniform(args[0], args[1])
+    if kind == 'normal':
+        return lambda: max(0.0, random.gauss(args[0], args[1]))
+    if kind == 'lognormal':
+        return lambda: random.lognormvariate(math.log(args[0]), args[1])
+    if kind == 'exp':
+        return lambda: random.expovariate(1 / args[0])
+    raise ValueError(f"Unknown latency distribution: {kind}")
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 1024
+
+
+class FakeLLMServer:
+    """Fake chat-completions provider running in a background thread"""
+
+    def __init__(self, latency: Union[str, float] = 1.0, port: int = 0, token_delay: float = 0.0,
+                 error_rate: float = 0.0, rate_limit_rate: float = 0.0, hang_rate: float = 0.0,
+                 hang_seconds: float = 60.0, score_range: tuple = (4, 9),
+                 model_latency: Dict[str, Union[str, float]] = None, capacity: int = 0,
+                 connect_delay: float = 0.0, concurrency_limit: int = 0):
+        self.latency = latency
+        # Per-model latency specs overriding `latency`, e.g. {'fast-model': 0.2}
+        self._model_latency = {model: parse_latency(spec) for model, spec in (model_latency or {}).items()}
+        self.token_delay = token_delay
+        # Extra delay on each new connection, standing in for DNS + TLS setup
+        self.connect_delay = connect_delay
+        # Requests served at once (0 = unlimited); the rest queue like at a saturated provider
+        self._capacity = threading.BoundedSemaphore(capacity) if capacity else None
+        # Requests in flight beyond this get a 429 (0 = no limit), like a provider's concurrency quota
+        self.concurrency_limit = concurrency_limit
+        self.error_rate = error_rate
+        self.rate_limit_rate = rate_limit_rate
+        self.hang_rate = hang_rate
+        self.hang_seconds = hang_seconds
+        self.score_range = score_range
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self.requests = 0
+        self.streamed = 0
+        self.errors = 0
+        self.rate_limited = 0
+        self.hung = 0
+        # Ids listed by GET /v1/models (empty = nothing to check against)
+        self.models = []
+        self._lock = threading.Lock()
+        self._server = _Server(('127.0.0.1', port), self._handler_class())
+
+    @property
+    def latency(self):
+        return self._latency_spec
+
+    @latency.setter
+    def latency(self, spec):
+        self._latency_spec = spec
+        self._sample_latency = parse_latency(spec)
+
+    @property
+    def base_url(self) -> str:
+        return f"http://127.0.0.1:{self._server.server_address[1]}/v1"
+
+    def reply_for(self, messages: list) -> str:
+        """Canned reply for the agent role named in the system message"""
+        system = messages[0].get('content', '') if messages and messages[0].get('role') == 'system' else ''
+        prompt = messages[-1].get('content', '') if messages else ''
+        if 'JSON object' in system:
+            return json.dumps({
+                'strengths': 'Identifies the core concept and uses correct terminology.',
+                'improvements': 'Add a concrete example and discuss trade-offs.',
+                'ideal_answer_approach': 'Define the concept, walk through an example, then cover trade-offs.',
+                'score': random.randint(*self.score_range),
+                'justification': 'Covers the main idea but misses some depth.',
+            })
+        if 'evaluator' in system:
+            score = random.randint(*self.score_range)
+            return f"SCORE: {score}/10\nJUSTIFICATION: Covers the main idea but misses some depth."
+        if 'coach' in system:
+            return SUMMARY if 'overall assessment' in prompt else FEEDBACK
+        return random.choice(QUESTIONS)
+
+    def _record(self, **counts):
+        with self._lock:
+            for name, n in counts.items():
+                setattr(self, name, getattr(self, name) + n)
+            self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                'requests': self.requests,
+                'streamed': self.streamed,
+                'errors': self.errors,
+                'rate_limited': self.rate_limited,
+                'hung': self.hung,
+                'in_flight': self.in_flight,
+                'peak_in_flight': self.peak_in_flight,
+            }
+
+    def _handler_class(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def log_message(self, *args):
+                pass
+
+            def setup(self):
+                super().setup()
+                if server.connect_delay:
+                    time.sleep(server.connect_delay)
+
+            def do_GET(self):
+                if self.path in ('/health', '/stats'):
+                    self._json(200, server.stats())
+                elif self.path.endswith('/models'):
+                    self._json(200, {'object': 'list', 'data': [{'id': model} for model in server.models]})
+                else:
+                    self._json(404, {'error': {'message': 'Not found'}})
+
+            def do_POST(self):
+                body = json.loads(self.rfile.read(int(self.headers.get('Content-Length', 0))) or b'{}')
+                if not self.path.endswith('/chat/completions'):
+                    self._json(404, {'error': {'message': 'Not found'}})
+                    return
+
+                server._record(requests=1, in_flight=1)
+                if server._capacity is not None:
+                    server._capacity.acquire()
+                try:
+                    roll = random.random()
+                    if server.concurrency_limit and server.in_flight > server.concurrency_limit:
+                        server._record(rate_limited=1)
+                        self._json(429, {'error': {'message': 'Too many concurrent requests',
+                                                   'type': 'rate_limit_error'}}, headers={'Retry-After': '1'})
+                        return
+                    if roll < server.rate_limit_rate:
+                        server._record(rate_limited=1)
+                        self._json(429, {'error': {'message': 'Rate limit exceeded', 'type': 'rate_limit_error'}},
+                                   headers={'Retry-After': '1'})
+                        return
+                    roll -= server.rate_limit_rate
+                    if roll < server.error_rate:
+                        server._record(errors=1)
+                        self._json(500, {'error': {'message': 'Injected upstream error', 'type': 'server_error'}})
+                        return
+                    roll -= server.error_rate
+                    if roll < server.hang_rate:
+                        server._record(hung=1)
+                        time.sleep(server.hang_seconds)
+                    else:
+                        sample = server._model_latency.get(body.get('model'), server._sample_latency)
+                        time.sleep(sample())
+
+                    text = server.reply_for(body.get('messages', []))
+                    if body.get('stream'):
+                        server._record(streamed=1)
+                        self._stream(body, text)
+                    else:
+                        self._complete(body, text)
+                except (BrokenPipeError, ConnectionResetError):
+                    pass  # the client gave up (e.g. its deadline passed)
+                finally:
+                    if server._capacity is not None:
+                        server._capacity.release()
+                    server._record(in_flight=-1)
+
+            @staticmethod
+            def _usage(body, text):
+                prompt_chars = sum(len(str(m.get('content', ''))) for m in body.get('messages', []))
+                completion_tokens = len(text.split())
+                prompt_tokens = max(1, prompt_chars // 4)
+                return {'prompt_tokens': prompt_tokens, 'completion_tokens': completion_tokens,
+                        'total_tokens': prompt_tokens + completion_tokens}
+
+            def _json(self, status, payload, headers=None):
+                data = json.dumps(payload).encode()
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(data)))
+                for name, value in (headers or {}).items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(data)
+
+            def _complete(self, body, text):
+                self._json(200, {
+                    'id': 'chatcmpl-fake',
+                    'object': 'chat.completion',
+                    'created': int(time.time()),
+                    'model': body.get('model', 'fake'),
+                    'choices': [{
+                        'index': 0,
+                        'message': {'role': 'assistant', 'content': text},
+                        'finish_reason': 'stop',
+                    }],
+                    'usage': self._usage(body, text),
+                })
+
+            def _stream(self, body, text):
+                self.send_response(200)
+                self.send_header('Content-Type', 'text/event-stream')
+                self.send_header('Transfer-Encoding', 'chunked')
+                self.end_headers()
+
+                def chunk(choices, **extra):
+                    data = json.dumps({
+                        'id': 'chatcmpl-fake',
+                        'object': 'chat.completion.chunk',
+                        'created': int(time.time()),
+                        'model': body.get('model', 'fake'),
+                        'choices': choices,
+                        **extra,
+                    })
+                    self._write_chunk(f"data: {data}\n\n")
+
+                words = text.split(' ')
+                for i, word in enumerate(words):
+                    if i and server.token_delay:
+                        time.sleep(server.token_delay)
+                    chunk([{'index': 0, 'delta': {'content': word + (' ' if i < len(words) - 1 else '')},
+                            'finish_reason': None}])
+                chunk([{'index': 0, 'delta': {}, 'finish_reason': 'stop'}])
+                if (body.get('stream_options') or {}).get('include_usage'):
+                    chunk([], usage=self._usage(body, text))
+                self._write_chunk('data: [DONE]\n\n')
+                self.wfile.write(b'0\r\n\r\n')
+
+            def _write_chunk(self, text):
+                data = text.encode()
+                self.wfile.write(b'%x\r\n' % len(data) + data + b'\r\n')
+
+        return Handler
+
+    def start(self):
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return self
+
+    def reset_counters(self):
+        with self._lock:
+            self.requests = 0
+            self.streamed = 0
+            self.errors = 0
+            self.rate_limited = 0
+            self.hung = 0
+            self.peak_in_flight = self.in_flight
+
+    def stop(self):
+        self._server.shutdown()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--latency', default='lognormal:0.8,0.5', help='time to first token (see specs above)')
+    parser.add_argument('--token-delay', type=float, default=0.0, help='seconds between streamed tokens')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='fraction of requests answered with a 500')
+    parser.add_argument('--rate-limit-rate', type=float, default=0.0, help='fraction answered with a 429')
+    parser.add_argument('--hang-rate', type=float, default=0.0, help='fraction that hang for --hang-seconds')
+    parser.add_argument('--hang-seconds', type=float, default=60.0)
+    parser.add_argument('--score-range', default='4-9', help='range of canned scores, e.g. 4-9')
+    parser.add_argument('--capacity', type=int, default=0, help='requests served at once (0 = unlimited)')
+    parser.add_argument('--connect-delay', type=float, default=0.0, help='seconds added to each new connection')
+    parser.add_argument('--concurrency-limit', type=int, default=0,
+                        help='requests in flight beyond this get a 429 (0 = no limit)')
+    args = parser.parse_args()
+
+    low, high = (int(v) for v in args.score_range.split('-'))
+    server = FakeLLMServer(
+        latency=args.latency, port=args.port, token_delay=args.token_delay,
+        error_rate=args.error_rate, rate_limit_rate=args.rate_limit_rate,
+        hang_rate=args.hang_rate, hang_seconds=args.hang_seconds, score_range=(low, high),
+        capacity=args.capacity, connect_delay=args.connect_delay, concurrency_limit=args.concurrency_limit,
+    )
+    print(f"🤖 Fake LLM listening on {server.base_url} (latency {args.latency})")
+    try:
+        server._server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,167 @@
+"""
+End-to-end load test: N concurrent full interviews against the API
+
+Each simulated candidate runs create → start → (answer → next-question)
+× answers → end, then reads the session to collect its token usage.
+Reports completed sessions/sec, p50/p95/p99 latency per endpoint and
+tokens per session.
+
+By default it boots a backend worker against an in-process fake LLM
+(fake_llm_server.py), so no OpenRouter credits are used. Pass --api-url
+to load an already running backend instead (point that backend's
+OPENROUTER_BASE_URL at `python benchmarks/fake_llm_server.py`).
+
+Usage:
+    python benchmarks/load_test.py [--sessions 100] [--concurrency 20] [--answers 3]
+                                   [--server wsgi|asgi] [--llm-latency lognormal:0.8,0.5]
+    python benchmarks/load_test.py --api-url http://localhost:5000
+"""
+import argparse
+import asyncio
+import statistics
+import time
+from collections import defaultdict
+
+import httpx
+
+import _bootstrap  # noqa: F401
+from _harness import free_port, percentile, start_server, wait_healthy
+from fake_llm_server import FakeLLMServer
+
+ENDPOINTS = ('create', 'start', 'answer', 'next-question', 'end', 'session')
+ANSWER = "A closure is a function that captures variables from its enclosing scope."
+
+
+class LoadStats:
+    """Per-endpoint latencies and error counts"""
+
+    def __init__(self):
+        self.latencies = defaultdict(list)
+        self.errors = defaultdict(lambda: defaultdict(int))
+        self.session_tokens = []
+
+    async def call(self, client: httpx.AsyncClient, endpoint: str, method: str, url: str, **kwargs):
+        start = time.perf_counter()
+        try:
+            response = await client.request(method, url, **kwargs)
+            status = response.status_code
+        except httpx.HTTPError as e:
+            response, status = None, type(e).__name__
+        self.latencies[endpoint].append((time.perf_counter() - start) * 1000)
+        if not isinstance(status, int) or not 200 <= status < 300:
+            self.errors[endpoint][status] += 1
+            return None
+        return response.json()
+
+
+async def run_interview(client: httpx.AsyncClient, api: str, stats: LoadStats, answers: int) -> bool:
+    """Run one full interview. Returns True if every step succeeded."""
+    created = await stats.call(client, 'create', 'POST', f"{api}/api/interview/create",
+                               json={'technology': 'Python', 'position': 'Backend Developer'})
+    if created is None:
+        return False
+    base = f"{api}/api/interview/{created['session_id']}"
+
+    if await stats.call(client, 'start', 'POST', f"{base}/start") is None:
+        return False
+    for i in range(answers):
+        if await stats.call(client, 'answer', 'POST', f"{base}/answer", json={'answer': ANSWER}) is None:
+            return False
+        if i < answers - 1 and await stats.call(client, 'next-question', 'POST', f"{base}/next-question") is None:
+            return False
+    if await stats.call(client, 'end', 'POST', f"{base}/end") is None:
+        return False
+
+    info = await stats.call(client, 'session', 'GET', base)
+    if info and 'usage' in info:
+        stats.session_tokens.append(info['usage']['total_tokens'])
+    return True
+
+
+async def run_load(api: str, sessions: int, concurrency: int, answers: int) -> tuple:
+    stats = LoadStats()
+    semaphore = asyncio.Semaphore(concurrency)
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+
+    async with httpx.AsyncClient(timeout=300, limits=limits) as client:
+        await wait_healthy(client, api)
+
+        async def candidate():
+            async with semaphore:
+                return await run_interview(client, api, stats, answers)
+
+        start = time.perf_counter()
+        results = await asyncio.gather(*(candidate() for _ in range(sessions)))
+        elapsed = time.perf_counter() - start
+    return stats, sum(results), elapsed
+
+
+def report(stats: LoadStats, completed: int, sessions: int, elapsed: float):
+    print(f"   sessions: {completed}/{sessions} completed in {elapsed:.2f}s "
+          f"→ {completed / elapsed:.2f} sessions/sec\n")
+    print(f"   {'endpoint':15s} {'calls':>6s} {'errors':>7s} {'p50 ms':>9s} {'p95 ms':>9s} "
+          f"{'p99 ms':>9s} {'max ms':>9s}")
+    for endpoint in ENDPOINTS:
+        values = stats.latencies.get(endpoint)
+        if not values:
+            continue
+        errors = sum(stats.errors.get(endpoint, {}).values())
+        print(f"   {endpoint:15s} {len(values):6d} {errors:7d} {statistics.median(values):9.0f} "
+              f"{percentile(values, 95):9.0f} {percentile(values, 99):9.0f} {max(values):9.0f}")
+    if stats.session_tokens:
+        print(f"\n   tokens per session: mean {statistics.mean(stats.session_tokens):.0f}, "
+              f"p95 {percentile(stats.session_tokens, 95):.0f}")
+    for endpoint, errors in stats.errors.items():
+        detail = ', '.join(f"{status}×{count}" for status, count in errors.items())
+        print(f"   ⚠️  {endpoint} errors: {detail}")
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sessions', type=int, default=100, help='interviews to run')
+    parser.add_argument('--concurrency', type=int, default=20, help='interviews in progress at once')
+    parser.add_argument('--answers', type=int, default=3, help='questions answered per interview')
+    parser.add_argument('--api-url', help='load an already running backend instead of booting one')
+    parser.add_argument('--server', choices=('wsgi', 'asgi'), default='asgi')
+    parser.add_argument('--workers', type=int, default=1)
+    parser.add_argument('--threads', type=int, default=4, help='gunicorn threads per worker')
+    parser.add_argument('--llm-latency', default='lognormal:0.8,0.5')
+    parser.add_argument('--llm-token-delay', type=float, default=0.0)
+    parser.add_argument('--llm-error-rate', type=float, default=0.0)
+    parser.add_argument('--llm-rate-limit-rate', type=float, default=0.0)
+    args = parser.parse_args()
+
+    if args.api_url:
+        print(f"🔬 {args.sessions} interviews, {args.concurrency} concurrent, against {args.api_url}\n")
+        stats, completed, elapsed = await run_load(args.api_url.rstrip('/'), args.sessions,
+                                                   args.concurrency, args.answers)
+        report(stats, completed, args.sessions, elapsed)
+        return
+
+    llm = FakeLLMServer(latency=args.llm_latency, token_delay=args.llm_token_delay,
+                        error_rate=args.llm_error_rate, rate_limit_rate=args.llm_rate_limit_rate).start()
+    port = free_port()
+    server = start_server(args.server, port, {
+        'OPENROUTER_BASE_URL': llm.base_url,
+        'LLM_POOL_MAX_CONNECTIONS': str(max(args.concurrency * 2, 100)),
+        'REQUEST_LOG_SINK': 'off',
+    }, workers=args.workers, threads=args.threads)
+
+    print(f"🔬 {args.sessions} interviews, {args.concurrency} concurrent, {args.server.upper()} "
+          f"× {args.workers} worker(s), fake LLM latency {args.llm_latency}\n")
+    try:
+        stats, completed, elapsed = await run_load(f"http://127.0.0.1:{port}", args.sessions,
+                                                   args.concurrency, args.answers)
+    finally:
+        server.terminate()
+        server.wait()
+        llm.stop()
+
+    report(stats, completed, args.sessions, elapsed)
+    llm_stats = llm.stats()
+    print(f"\n   fake LLM: {llm_stats['requests']} requests, peak {llm_stats['peak_in_flight']} in flight, "
+          f"{llm_stats['errors']} injected errors, {llm_stats['rate_limited']} rate limited")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,115 @@
+"""
+Cold-start profile: import time and time to the first successful interview
+
+1. Imports the app in fresh interpreters and reports the median import
+   time plus the slowest top-level imports (python -X importtime).
+2. Boots a worker against the fake LLM (whose new connections are slowed
+   down to stand in for DNS + TLS setup) with WARMUP_ON_START off and on,
+   and reports time until /health answers 200 and until the first
+   create + start request succeeds, and how long that first request took.
+
+Usage:
+    python benchmarks/profile_startup.py [--runs 5] [--server wsgi|asgi] [--connect-delay 0.3]
+"""
+import argparse
+import asyncio
+import os
+import re
+import statistics
+import subprocess
+import sys
+import time
+
+import httpx
+
+import _bootstrap
+from _harness import free_port, start_server
+from fake_llm_server import FakeLLMServer
+
+IMPORT_APP = "import time; t = time.perf_counter(); import run; print((time.perf_counter() - t) * 1000)"
+
+
+def import_times(runs: int) -> list:
+    env = dict(os.environ, REQUEST_LOG_SINK='off')
+    times = []
+    for _ in range(runs):
+        output = subprocess.run([sys.executable, '-c', IMPORT_APP], cwd=_bootstrap.BACKEND_DIR, env=env,
+                                capture_output=True, text=True, check=True).stdout
+        times.append(float(output.strip().splitlines()[-1]))
+    return times
+
+
+def slowest_imports(limit: int = 6) -> list:
+    """(package, cumulative ms) of the slowest packages imported while loading the app"""
+    env = dict(os.environ, REQUEST_LOG_SINK='off')
+    stderr = subprocess.run([sys.executable, '-X', 'importtime', '-c', 'import run'], cwd=_bootstrap.BACKEND_DIR,
+                            env=env, capture_output=True, text=True).stderr
+    packages = {}
+    for line in stderr.splitlines():
+        match = re.match(r'import time:\s+\d+ \|\s+(\d+) \| *(\S+)', line)
+        if match:
+            package = match.group(2).split('.')[0]
+            packages[package] = max(packages.get(package, 0), int(match.group(1)) / 1000)
+    packages.pop('run', None)
+    return sorted(packages.items(), key=lambda item: -item[1])[:limit]
+
+
+async def boot(mode: str, env: dict) -> dict:
+    port = free_port()
+    base = f"http://127.0.0.1:{port}"
+    start = time.perf_counter()
+    server = start_server(mode, port, env)
+    result = {}
+    try:
+        async with httpx.AsyncClient(timeout=60) as client:
+            while time.perf_counter() - start < 60:
+                try:
+                    if (await client.get(f"{base}/health")).status_code == 200:
+                        break
+                except httpx.TransportError:
+                    pass
+                await asyncio.sleep(0.02)
+            result['healthy'] = (time.perf_counter() - start) * 1000
+
+            request_start = time.perf_counter()
+            created = await client.post(f"{base}/api/interview/create",
+                                        json={'technology': 'Python', 'position': 'Backend Developer'})
+            started = await client.post(f"{base}/api/interview/{created.json()['session_id']}/start")
+            assert started.status_code == 200, started.text
+            result['first_request'] = (time.perf_counter() - request_start) * 1000
+            result['first_success'] = (time.perf_counter() - start) * 1000
+    finally:
+        server.terminate()
+        server.wait()
+    return result
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--server', choices=('wsgi', 'asgi'), default='wsgi')
+    parser.add_argument('--latency', default='0.05', help='fake LLM time to first token')
+    parser.add_argument('--connect-delay', type=float, default=0.3, help='seconds added to each new upstream connection')
+    args = parser.parse_args()
+
+    times = import_times(args.runs)
+    print(f"🚀 App import: median {statistics.median(times):.0f} ms over {args.runs} runs "
+          f"(min {min(times):.0f}, max {max(times):.0f})")
+    for module, ms in slowest_imports():
+        print(f"   {module:28s} {ms:7.0f} ms")
+
+    llm = FakeLLMServer(latency=args.latency, connect_delay=args.connect_delay).start()
+    print(f"\n   {args.server.upper()} boot, fake LLM connect delay {args.connect_delay * 1000:.0f} ms, "
+          f"median of {args.runs}")
+    print(f"   {'warmup':8s} {'healthy ms':>11s} {'first success ms':>17s} {'first request ms':>17s}")
+    for warm in ('False', 'True'):
+        env = {'OPENROUTER_BASE_URL': llm.base_url, 'REQUEST_LOG_SINK': 'off', 'WARMUP_ON_START': warm}
+        results = [await boot(args.server, env) for _ in range(args.runs)]
+        print(f"   {warm:8s} {statistics.median(r['healthy'] for r in results):11.0f} "
+              f"{statistics.median(r['first_success'] for r in results):17.0f} "
+              f"{statistics.median(r['first_request'] for r in results):17.0f}")
+    llm.stop()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
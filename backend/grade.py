@@ -0,0 +1,67 @@
+"""
+Bulk grading from the command line
+
+Reads JSONL records of {technology, position, question, answer} (plus an
+optional `id`) and writes one JSONL result per record, grading up to
+--concurrency records at once with the same agents as the API.
+
+Usage:
+    python grade.py answers.jsonl -o results.jsonl --concurrency 16
+    cat answers.jsonl | python grade.py - --order completion > results.jsonl
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+
+from dotenv import load_dotenv
+
+# Load environment variables
+load_dotenv()
+
+# Add the backend directory to the Python path
+sys.path.insert(0, os.path.dirname(__file__))
+
+from app.config import Config
+from app.services.bulk_grading import BulkGrader, parse_jsonl
+
+
+async def run(args) -> int:
+    source = sys.stdin if args.input == '-' else open(args.input, encoding='utf-8')
+    target = sys.stdout if args.output == '-' else open(args.output, 'w', encoding='utf-8')
+    graded = errors = 0
+    start = time.perf_counter()
+    try:
+        grader = BulkGrader(args.concurrency, args.order, args.evaluation_mode)
+        async for result in grader.grade(parse_jsonl(source)):
+            target.write(json.dumps(result) + "\n")
+            target.flush()
+            graded += 1
+            errors += 'error' in result
+    finally:
+        if source is not sys.stdin:
+            source.close()
+        if target is not sys.stdout:
+            target.close()
+
+    elapsed = time.perf_counter() - start
+    print(f"✅ Graded {graded} record(s) in {elapsed:.1f}s ({graded / elapsed if elapsed else 0:.1f}/s), "
+          f"{errors} error(s)", file=sys.stderr)
+    return 1 if errors else 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('input', help="JSONL file, or '-' for stdin")
+    parser.add_argument('-o', '--output', default='-', help="JSONL results file (default: stdout)")
+    parser.add_argument('--concurrency', type=int, default=Config.BULK_GRADING_CONCURRENCY)
+    parser.add_argument('--order', choices=('input', 'completion'), default='input')
+    parser.add_argument('--evaluation-mode', choices=('separate', 'combined'), default=None)
+    args = parser.parse_args()
+    sys.exit(asyncio.run(run(args)))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,14 @@
+"""
+Gunicorn hooks (gunicorn loads this file from the working directory)
+
+Command-line flags (bind, workers, threads, timeout) still apply.
+"""
+
+
+def post_fork(server, worker):
+    """Warm each worker right after it is forked when WARMUP_ON_START=True"""
+    from app.config import Config
+
+    if Config.WARMUP_ON_START:
+        from app.services.warmup import warmup
+        warmup.start()
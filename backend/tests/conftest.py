@@ -0,0 +1,47 @@
+"""
+Shared pytest setup
+
+Makes the backend importable, fills in the environment the app needs at
+import time and points every agent at the offline fake LLM server from
+benchmarks/, so no API key or credits are needed.
+"""
+import os
+import sys
+
+import pytest
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+for path in (BACKEND_DIR, os.path.join(BACKEND_DIR, 'benchmarks')):
+    if path not in sys.path:
+        sys.path.insert(0, path)
+
+os.environ.setdefault('SECRET_KEY', 'test-secret-key')
+os.environ.setdefault('OPENROUTER_API_KEY', 'test-key')
+os.environ.setdefault('REQUEST_LOG_SINK', 'off')
+
+from fake_llm_server import FakeLLMServer  # noqa: E402
+
+
+@pytest.fixture(scope='session')
+def llm_server():
+    server = FakeLLMServer(latency=0.05).start()
+    os.environ['OPENROUTER_BASE_URL'] = server.base_url
+    yield server
+    server.stop()
+
+
+@pytest.fixture
+def llm(llm_server):
+    """The fake provider with default latency and fresh counters"""
+    llm_server.latency = 0.05
+    llm_server.reset_counters()
+    yield llm_server
+    llm_server.latency = 0.05
+
+
+@pytest.fixture
+def run():
+    """Run a coroutine on the worker loop, as the Flask views do"""
+    from app.services.event_loop import worker_loop
+
+    return worker_loop.run
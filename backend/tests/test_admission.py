@@ -0,0 +1,96 @@
+"""
+Admission control for upstream model calls
+"""
+import asyncio
+
+import pytest
+
+from app import create_app
+from app.services import admission as admission_module
+from app.services.admission import AdmissionController, UpstreamOverloaded
+from app.services.interview_service import interview_service
+
+
+def controller(**kwargs) -> AdmissionController:
+    settings = {'max_in_flight': 1, 'max_queue': 1, 'queue_timeout': 5, 'scope': 'worker'}
+    return AdmissionController(**{**settings, **kwargs})
+
+
+async def hold(admission: AdmissionController, seconds: float, order: list = None, name: str = None):
+    async with admission.slot():
+        if order is not None:
+            order.append(name)
+        await asyncio.sleep(seconds)
+
+
+def test_full_queue_is_rejected_at_once(run):
+    admission = controller()
+
+    async def scenario():
+        running = asyncio.ensure_future(hold(admission, 0.3))
+        queued = asyncio.ensure_future(hold(admission, 0))
+        await asyncio.sleep(0.05)
+        with pytest.raises(UpstreamOverloaded) as rejected:
+            await hold(admission, 0)
+        with pytest.raises(UpstreamOverloaded):
+            admission.check()
+        await asyncio.gather(running, queued)
+        return rejected.value
+
+    rejected = run(scenario())
+    assert rejected.retry_after >= 1
+    stats = admission.stats()
+    assert stats['rejected_queue_full'] == 2 and stats['admitted'] == 2 and stats['in_flight'] == 0
+
+
+def test_queued_call_is_rejected_after_the_deadline(run):
+    admission = controller(queue_timeout=0.1)
+
+    async def scenario():
+        running = asyncio.ensure_future(hold(admission, 0.5))
+        await asyncio.sleep(0.05)
+        with pytest.raises(UpstreamOverloaded, match="No upstream slot"):
+            await hold(admission, 0)
+        await running
+
+    run(scenario())
+    assert admission.stats()['rejected_deadline'] == 1
+    assert admission.stats()['queue_depth'] == 0
+
+
+def test_slots_are_handed_over_in_arrival_order(run):
+    admission = controller(max_queue=10)
+    order = []
+
+    async def scenario():
+        tasks = []
+        for n in range(5):
+            tasks.append(asyncio.ensure_future(hold(admission, 0.02, order, n)))
+            await asyncio.sleep(0.005)
+        await asyncio.gather(*tasks)
+
+    run(scenario())
+    assert order == [0, 1, 2, 3, 4]
+    assert admission.stats()['peak_queue_depth'] >= 3
+
+
+def test_overload_is_a_503_with_retry_after(monkeypatch):
+    client = create_app().test_client()
+    session_id = interview_service.create_session("Python", "Backend Developer")
+
+    async def overloaded(*args, **kwargs):
+        raise UpstreamOverloaded("Upstream queue is full", 4)
+
+    monkeypatch.setattr(interview_service, 'start_interview', overloaded)
+    response = client.post(f"/api/interview/{session_id}/start")
+    assert response.status_code == 503
+    assert response.headers['Retry-After'] == '4'
+    assert response.get_json()['retry_after'] == 4
+
+    def full():
+        raise UpstreamOverloaded("Upstream queue is full", 2)
+
+    monkeypatch.setattr(admission_module.admission, 'check', full)
+    response = client.post(f"/api/interview/{session_id}/start/stream")
+    assert response.status_code == 503
+    assert response.headers['Retry-After'] == '2'
@@ -0,0 +1,44 @@
+"""
+Bulk grading: reading the input must not hold up the records already read
+"""
+import time
+
+from app.services.bulk_grading import BulkGrader
+
+RECORD = {'technology': 'Python', 'position': 'Backend Developer',
+          'question': 'What is a closure?', 'answer': 'A function that keeps its enclosing scope.'}
+
+
+def test_slow_input_does_not_stall_grading(llm, run):
+    resumed = []
+
+    def slow_records():
+        yield {**RECORD, 'id': 'first'}
+        # Like a client that pauses mid-upload: a blocking read on the loop would stop every worker
+        time.sleep(1.0)
+        resumed.append(time.perf_counter())
+        yield {**RECORD, 'id': 'second'}
+
+    async def grade():
+        # Warm up imports and the model client so only the input is slow
+        async for _ in BulkGrader(concurrency=1).grade(iter([RECORD])):
+            pass
+        return [(result['id'], 'error' in result, time.perf_counter())
+                async for result in BulkGrader(concurrency=2, order='completion').grade(slow_records())]
+
+    arrivals = run(grade())
+    assert [(record_id, failed) for record_id, failed, _ in arrivals] == [('first', False), ('second', False)]
+    # The first record was graded while the input was still being read
+    assert arrivals[0][2] < resumed[0]
+
+
+def test_results_follow_input_order(llm, run):
+    records = [{**RECORD, 'id': n} for n in range(5)] + [{'id': 'bad'}]
+
+    async def grade():
+        return [result async for result in BulkGrader(concurrency=3).grade(iter(records))]
+
+    results = run(grade())
+    assert [result['index'] for result in results] == list(range(6))
+    assert all('error' not in result for result in results[:5])
+    assert results[5]['error'].startswith('Missing')
@@ -0,0 +1,57 @@
+"""
+Combined single-call evaluation and its fallback to the Coach and Scorer
+"""
+import json
+
+import pytest
+
+from agents import EvaluationFormatError, InterviewAgents
+
+VALID = {
+    'strengths': 'Correct definition.',
+    'improvements': ['Add an example', 'Mention trade-offs'],
+    'ideal_answer_approach': 'Define, illustrate, compare.',
+    'score': 7.6,
+    'justification': 'Accurate but shallow.',
+}
+
+
+def test_parse_evaluation_accepts_wrapped_json():
+    reply = f"Here is the evaluation:\n```json\n{json.dumps(VALID)}\n```"
+    evaluation = InterviewAgents.parse_evaluation(reply)
+    assert evaluation['score'] == 8
+    assert evaluation['improvements'] == 'Add an example; Mention trade-offs'
+    assert evaluation['justification'] == 'Accurate but shallow.'
+
+
+@pytest.mark.parametrize('reply, message', [
+    ("SCORE: 7/10", "no JSON object"),
+    ('{"strengths": "x", }', "not valid JSON"),
+    (json.dumps({k: v for k, v in VALID.items() if k != 'justification'}), "missing justification"),
+    (json.dumps({**VALID, 'score': 'high'}), "not a number"),
+    (json.dumps({**VALID, 'score': 12}), "out of range"),
+])
+def test_parse_evaluation_rejects_incomplete_replies(reply, message):
+    with pytest.raises(EvaluationFormatError, match=message):
+        InterviewAgents.parse_evaluation(reply)
+
+
+def test_combined_mode_makes_one_call(llm, run):
+    agents = InterviewAgents("Python", "Backend Developer", evaluation_mode='combined')
+    record = run(agents.process_answer("What is a closure?", "A function plus its scope.", 1))
+    assert llm.stats()['requests'] == 1
+    assert record['feedback_available'] and record['score_available']
+    assert record['feedback'].startswith('STRENGTHS')
+
+
+def test_malformed_evaluation_falls_back_to_coach_and_scorer(llm, run):
+    agents = InterviewAgents("Python", "Backend Developer", evaluation_mode='combined')
+
+    async def malformed(question, answer, on_token=None):
+        raise EvaluationFormatError("Evaluator reply contains no JSON object")
+
+    agents.get_evaluation = malformed
+    record = run(agents.process_answer("What is a closure?", "A function plus its scope.", 1))
+    assert llm.stats()['requests'] == 2  # Coach + Scorer
+    assert record['feedback_available'] and record['score_available']
+    assert len(agents.interview_history) == 1
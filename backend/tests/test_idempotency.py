@@ -0,0 +1,130 @@
+"""
+Idempotency keys on answer and next-question requests
+"""
+import asyncio
+from datetime import timedelta
+
+import fakeredis
+import pytest
+
+from app import create_app
+from app.config import Config
+from app.services.idempotency import IdempotencyCache, IdempotencyConflict, fingerprint
+from app.services.interview_service import InterviewService, interview_service
+from app.services.session_store import MemorySessionStore, RedisSessionStore
+
+ANSWER = "A closure is a function plus the variables of the scope it was defined in."
+
+
+def make_service(store=None) -> InterviewService:
+    service = InterviewService(store=store or MemorySessionStore(timedelta(hours=1)),
+                               prefetch=False, rolling_summary=False)
+    service.question_cache = None
+    return service
+
+
+def started_session(service, run) -> str:
+    session_id = service.create_session("Python", "Backend Developer")
+    run(service.start_interview(session_id))
+    return session_id
+
+
+# -------------------- CACHE -------------------- #
+
+def test_cache_replays_and_rejects_reuse_for_another_request():
+    cache = IdempotencyCache()
+    cache.remember('answer:k1', fingerprint('a'), {'score': 7})
+    assert cache.lookup('answer:k1', fingerprint('a')) == {'score': 7}
+    assert cache.lookup('answer:k2', fingerprint('a')) is None
+    with pytest.raises(IdempotencyConflict):
+        cache.lookup('answer:k1', fingerprint('b'))
+
+
+def test_cache_expires_and_caps_entries(monkeypatch):
+    monkeypatch.setattr(Config, 'IDEMPOTENCY_MAX_KEYS', 2)
+    cache = IdempotencyCache()
+    for n in range(3):
+        cache.remember(f'k{n}', 'digest', {'n': n})
+    assert list(cache.entries) == ['k1', 'k2']
+
+    monkeypatch.setattr(Config, 'IDEMPOTENCY_TTL', -1)
+    cache.remember('k3', 'digest', {'n': 3})
+    assert cache.lookup('k3', 'digest') is None
+    assert [row[0] for row in cache.to_state()] == ['k2']  # k1 made room for k3, which expired
+
+
+def test_cache_state_round_trip():
+    cache = IdempotencyCache()
+    cache.remember('answer:k1', 'digest', {'score': 7})
+    assert IdempotencyCache(cache.to_state()).lookup('answer:k1', 'digest') == {'score': 7}
+
+
+# -------------------- SERVICE -------------------- #
+
+def test_duplicates_share_one_run(llm, run):
+    service = make_service()
+    session_id = started_session(service, run)
+    llm.reset_counters()
+
+    async def duplicates():
+        results = await asyncio.gather(*(service.submit_answer(session_id, ANSWER, idempotency_key='k1')
+                                         for _ in range(3)))
+        results.append(await service.submit_answer(session_id, ANSWER, idempotency_key='k1'))
+        return results
+
+    results = run(duplicates())
+    assert llm.stats()['requests'] == 2  # one Coach + one Scorer call
+    assert all(result == results[0] for result in results)
+    assert len(service.get_session(session_id).agents.interview_history) == 1
+
+
+def test_next_question_retry_does_not_skip_a_question(llm, run):
+    service = make_service()
+    session_id = started_session(service, run)
+    run(service.submit_answer(session_id, ANSWER))
+
+    first = run(service.get_next_question(session_id, idempotency_key='n1'))
+    retry = run(service.get_next_question(session_id, idempotency_key='n1'))
+    assert first == retry and first['question_number'] == 2
+    assert service.get_session(session_id).current_question_number == 2
+
+
+def test_key_reused_for_another_answer_conflicts(llm, run):
+    service = make_service()
+    session_id = started_session(service, run)
+    run(service.submit_answer(session_id, ANSWER, idempotency_key='k1'))
+    with pytest.raises(IdempotencyConflict):
+        run(service.submit_answer(session_id, "A different answer", idempotency_key='k1'))
+
+
+def test_replay_on_another_worker(llm, run):
+    server = fakeredis.FakeServer()
+    worker_a = make_service(RedisSessionStore(timedelta(hours=1), client=fakeredis.FakeRedis(server=server)))
+    worker_b = make_service(RedisSessionStore(timedelta(hours=1), client=fakeredis.FakeRedis(server=server)))
+    session_id = started_session(worker_a, run)
+
+    first = run(worker_a.submit_answer(session_id, ANSWER, idempotency_key='k1'))
+    llm.reset_counters()
+    retry = run(worker_b.submit_answer(session_id, ANSWER, idempotency_key='k1'))
+    assert retry == first
+    assert llm.stats()['requests'] == 0
+
+
+# -------------------- ROUTES -------------------- #
+
+def test_idempotency_key_header(llm, run):
+    client = create_app().test_client()
+    session_id = started_session(interview_service, run)
+    url = f"/api/interview/{session_id}/answer"
+
+    first = client.post(url, json={'answer': ANSWER}, headers={'Idempotency-Key': 'k1'})
+    retry = client.post(url, json={'answer': ANSWER}, headers={'Idempotency-Key': 'k1'})
+    assert first.status_code == retry.status_code == 200
+    assert first.get_json() == retry.get_json()
+
+    conflict = client.post(url, json={'answer': "Something else"}, headers={'Idempotency-Key': 'k1'})
+    assert conflict.status_code == 400
+
+    too_long = client.post(url, json={'answer': ANSWER}, headers={'Idempotency-Key': 'k' * 256})
+    assert too_long.status_code == 400
+    assert 'longer than 255' in too_long.get_json()['error']
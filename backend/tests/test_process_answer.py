@@ -0,0 +1,57 @@
+"""
+Coach and Scorer evaluation in InterviewAgents.process_answer
+"""
+import time
+
+import pytest
+
+from agents import InterviewAgents
+
+QUESTION = "What is a closure?"
+ANSWER = "A function together with the variables of the scope it was defined in."
+
+
+def timed_answer(run, concurrent: bool) -> float:
+    agents = InterviewAgents("Python", "Backend Developer", concurrent_evaluation=concurrent)
+    run(agents.process_answer(QUESTION, ANSWER, 1))  # warm up connections
+    start = time.perf_counter()
+    record = run(agents.process_answer(QUESTION, ANSWER, 2))
+    elapsed = time.perf_counter() - start
+    assert record['feedback_available'] and record['score_available']
+    return elapsed
+
+
+def test_concurrent_evaluation_overlaps_coach_and_scorer(llm, run):
+    llm.latency = 0.4
+    sequential = timed_answer(run, concurrent=False)
+    concurrent = timed_answer(run, concurrent=True)
+
+    assert sequential >= 0.8
+    assert concurrent < sequential * 0.75
+
+
+def test_scorer_failure_still_returns_feedback(llm, run):
+    agents = InterviewAgents("Python", "Backend Developer", concurrent_evaluation=True)
+
+    async def failing_score(question, answer, on_token=None):
+        raise RuntimeError("scorer upstream error")
+
+    agents.get_score = failing_score
+    record = run(agents.process_answer(QUESTION, ANSWER, 1))
+
+    assert record['feedback_available'] and record['feedback'].startswith('STRENGTHS')
+    assert not record['score_available'] and record['score'] is None
+    assert len(agents.interview_history) == 1
+    assert agents.scored_count == 0
+
+
+def test_both_agents_failing_raises(llm, run):
+    agents = InterviewAgents("Python", "Backend Developer", concurrent_evaluation=True)
+
+    async def fail(question, answer, on_token=None):
+        raise RuntimeError("upstream error")
+
+    agents.get_feedback = agents.get_score = fail
+    with pytest.raises(RuntimeError):
+        run(agents.process_answer(QUESTION, ANSWER, 1))
+    assert agents.interview_history == []
@@ -0,0 +1,69 @@
+"""
+Rolling summary refreshed in the background after each answer
+"""
+import asyncio
+import time
+from datetime import timedelta
+
+from app.services.interview_service import InterviewService
+from app.services.metrics import sessions_ended
+from app.services.session_store import MemorySessionStore
+
+ANSWER = "A closure is a function plus the variables of the scope it was defined in."
+
+
+def make_service() -> InterviewService:
+    service = InterviewService(store=MemorySessionStore(timedelta(hours=1)), prefetch=False, rolling_summary=True)
+    service.question_cache = None
+    return service
+
+
+def test_summary_is_ready_when_the_interview_ends(llm, run):
+    service = make_service()
+    session_id = service.create_session("Python", "Backend Developer")
+    run(service.start_interview(session_id))
+    run(service.submit_answer(session_id, ANSWER))
+    run(asyncio.wait_for(asyncio.shield(service.get_session(session_id).summary_task), 5))
+
+    llm.reset_counters()
+    result = run(service.end_interview(session_id))
+    assert result['summary']['summary_current']
+    assert llm.stats()['requests'] == 0
+
+
+def test_repeat_end_counts_the_interview_once(llm, run):
+    service = make_service()
+    session_id = service.create_session("Python", "Backend Developer")
+    run(service.start_interview(session_id))
+    run(service.submit_answer(session_id, ANSWER))
+
+    ended = sessions_ended.value()
+    first = run(service.end_interview(session_id))
+    again = run(service.end_interview(session_id))
+    assert sessions_ended.value() == ended + 1
+    assert again['summary'] == first['summary']
+    assert not service.get_session(session_id).is_active
+
+
+def test_delete_cancels_a_running_refresh_from_a_request_thread(llm, run):
+    service = make_service()
+    session_id = service.create_session("Python", "Backend Developer")
+    run(service.start_interview(session_id))
+    llm.latency = 3.0
+    run(service.submit_answer(session_id, ANSWER))  # the refresh is now waiting on the model
+    task = service.get_session(session_id).summary_task
+    assert not task.done()
+
+    # Flask's sync views call delete_session on a request thread, not on the worker loop.
+    # In debug mode the loop raises if a non-thread-safe call reaches it from here.
+    loop = task.get_loop()
+    loop.set_debug(True)
+    try:
+        assert service.delete_session(session_id)
+    finally:
+        loop.set_debug(False)
+    deadline = time.monotonic() + 0.5
+    while not task.done() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert task.cancelled()
+    assert service.get_session(session_id) is None
@@ -0,0 +1,150 @@
+"""
+Session versions, ETags and long-polling on GET /api/interview/<id>
+"""
+import asyncio
+import threading
+import time
+from datetime import timedelta
+
+import fakeredis
+import pytest
+
+from app import create_app
+from app.config import Config
+from app.services.interview_service import InterviewService, interview_service
+from app.services.session_store import MemorySessionStore, RedisSessionStore
+
+
+@pytest.fixture(scope='module')
+def client():
+    return create_app().test_client()
+
+
+def redis_service(server) -> InterviewService:
+    """One worker's service on a Redis store shared through `server`"""
+    store = RedisSessionStore(timedelta(hours=1), client=fakeredis.FakeRedis(server=server))
+    return InterviewService(store=store, prefetch=False, rolling_summary=False)
+
+
+def test_etag_and_not_modified(client, llm, run):
+    session_id = interview_service.create_session("Python", "Backend Developer")
+    url = f"/api/interview/{session_id}"
+
+    response = client.get(url)
+    assert response.status_code == 200
+    etag = response.headers['ETag']
+    assert etag == f'W/"{response.get_json()["version"]}"'
+    assert response.headers['Cache-Control'] == 'no-cache'
+
+    response = client.get(url, headers={'If-None-Match': etag})
+    assert response.status_code == 304 and response.data == b''
+    assert response.headers['ETag'] == etag
+
+    run(interview_service.start_interview(session_id))
+    response = client.get(url, headers={'If-None-Match': etag})
+    assert response.status_code == 200
+    assert response.headers['ETag'] != etag
+    assert response.get_json()['current_question_number'] == 1
+
+
+def test_long_poll_answers_on_change(client, llm, run):
+    session_id = interview_service.create_session("Python", "Backend Developer")
+    url = f"/api/interview/{session_id}"
+    etag = client.get(url).headers['ETag']
+
+    def change_later():
+        time.sleep(0.3)
+        run(interview_service.start_interview(session_id))
+
+    threading.Thread(target=change_later).start()
+    start = time.perf_counter()
+    response = client.get(f"{url}?wait=10", headers={'If-None-Match': etag})
+    elapsed = time.perf_counter() - start
+
+    assert response.status_code == 200
+    assert response.get_json()['current_question_number'] == 1
+    assert 0.3 <= elapsed < 5
+
+
+def test_long_poll_times_out_with_not_modified(client):
+    session_id = interview_service.create_session("Python", "Backend Developer")
+    url = f"/api/interview/{session_id}"
+    etag = client.get(url).headers['ETag']
+
+    start = time.perf_counter()
+    response = client.get(f"{url}?wait=0.3", headers={'If-None-Match': etag})
+    assert response.status_code == 304
+    assert time.perf_counter() - start >= 0.3
+
+
+def test_long_poll_of_missing_session_fails_at_once(client):
+    start = time.perf_counter()
+    response = client.get("/api/interview/no-such-session?wait=5", headers={'If-None-Match': 'W/"1"'})
+    assert response.status_code == 400
+    assert response.get_json()['error'] == 'Session not found'
+    assert time.perf_counter() - start < 1
+
+
+def test_versions_come_from_the_shared_store():
+    server = fakeredis.FakeServer()
+    worker_a, worker_b = redis_service(server), redis_service(server)
+    session_id = worker_a.create_session("Python", "Backend Developer")
+    copy_a = worker_a.get_session(session_id)
+    copy_b = worker_b.get_session(session_id)
+    assert copy_a.version == copy_b.version == 1
+
+    # Both workers save their own copy; each gets a distinct version from Redis
+    worker_a._commit(copy_a)
+    worker_b._commit(copy_b)
+    assert (copy_a.version, copy_b.version) == (2, 3)
+    assert worker_a.session_version(session_id) == worker_b.session_version(session_id) == 3
+
+
+def test_wait_for_change_sees_other_workers(run, monkeypatch):
+    monkeypatch.setattr(Config, 'LONG_POLL_INTERVAL', 0.1)
+    server = fakeredis.FakeServer()
+    worker_a, worker_b = redis_service(server), redis_service(server)
+    session_id = worker_a.create_session("Python", "Backend Developer")
+    version = worker_b.session_version(session_id)
+
+    async def change_on_a():
+        await asyncio.sleep(0.2)
+        worker_a._commit(worker_a.get_session(session_id))
+
+    async def scenario():
+        changer = asyncio.ensure_future(change_on_a())
+        current = await worker_b.wait_for_change(session_id, version, timeout=5)
+        await changer
+        return current
+
+    assert run(scenario()) == version + 1
+
+
+class SlowStore(MemorySessionStore):
+    """A store whose reads take a network round trip"""
+
+    def get(self, session_id):
+        time.sleep(0.2)
+        return super().get(session_id)
+
+
+def test_wait_for_change_keeps_the_loop_free(run, monkeypatch):
+    monkeypatch.setattr(Config, 'LONG_POLL_INTERVAL', 0.05)
+    service = InterviewService(store=SlowStore(timedelta(hours=1)), prefetch=False, rolling_summary=False)
+    session_id = service.create_session("Python", "Backend Developer")
+
+    async def scenario():
+        lags = []
+
+        async def ticker():
+            while True:
+                start = time.perf_counter()
+                await asyncio.sleep(0.01)
+                lags.append(time.perf_counter() - start - 0.01)
+
+        ticks = asyncio.ensure_future(ticker())
+        await service.wait_for_change(session_id, 1, timeout=0.6)
+        ticks.cancel()
+        return max(lags)
+
+    assert run(scenario()) < 0.1
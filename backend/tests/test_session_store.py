@@ -0,0 +1,342 @@
+"""
+Session store backends
+"""
+import time
+from datetime import datetime, timedelta
+
+import fakeredis
+import pytest
+
+from app.services.interview_service import InterviewService, InterviewSession
+from app.services.session_store import (
+    MemorySessionStore, RedisSessionStore, SessionConflict, SQLiteSessionStore,
+)
+
+TIMEOUT = timedelta(hours=1)
+
+
+def make_session(session_id: str = 'session-1', answers: int = 0) -> InterviewSession:
+    session = InterviewSession(session_id, "Python", "Backend Developer")
+    for n in range(1, answers + 1):
+        session.current_question_number = n
+        session.agents._record_answer(f"Question {n}", f"Answer {n}", n, "Feedback", True, 7, "SCORE: 7/10", True)
+    return session
+
+
+class CountingRedis(fakeredis.FakeRedis):
+    """fakeredis client that counts EXPIRE commands"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.expires = 0
+
+    def expire(self, *args, **kwargs):
+        self.expires += 1
+        return super().expire(*args, **kwargs)
+
+
+@pytest.fixture
+def server():
+    return fakeredis.FakeServer()
+
+
+def redis_store(server, **kwargs) -> RedisSessionStore:
+    return RedisSessionStore(TIMEOUT, client=CountingRedis(server=server), **kwargs)
+
+
+def redis_service(server) -> InterviewService:
+    return InterviewService(store=redis_store(server), prefetch=False, rolling_summary=False)
+
+
+# -------------------- MEMORY -------------------- #
+
+def test_memory_store_round_trip():
+    store = MemorySessionStore(TIMEOUT, reaper_interval=0)
+    session = make_session()
+    store.save(session)
+    assert store.get('session-1') is session
+    assert session.version == 1
+    assert store.count() == 1
+    assert store.delete('session-1') and store.get('session-1') is None
+    assert not store.delete('session-1')
+
+
+def test_memory_store_reaps_expired_sessions_only():
+    store = MemorySessionStore(timedelta(seconds=60), reaper_interval=0)
+    stale, fresh = make_session('stale'), make_session('fresh')
+    stale.last_activity = fresh.last_activity = datetime.now() - timedelta(seconds=120)
+    store.save(stale)
+    store.save(fresh)
+    store.touch(fresh)  # refreshed after its heap entry was pushed
+
+    assert store.reap() == 1
+    assert store.get('stale') is None and store.get('fresh') is fresh
+
+
+# -------------------- REDIS -------------------- #
+
+def test_redis_store_round_trip_and_compression(server):
+    store = redis_store(server)
+    session = make_session()
+    session.current_question = "Explain closures. " * 200  # large enough to be compressed
+    store.save(session)
+    assert RedisSessionStore.encode(session)[:1] == b'z'
+
+    loaded = redis_store(server).get('session-1')
+    assert loaded is not session
+    assert loaded.current_question == session.current_question
+    assert loaded.version == session.version == 1
+    assert store.count() == 1
+
+
+def test_redis_store_reuses_cached_copy_until_changed_elsewhere(server):
+    store, other = redis_store(server), redis_store(server)
+    session = make_session()
+    store.save(session)
+    assert store.get('session-1') is session
+
+    changed = other.get('session-1')
+    changed.current_question_number = 3
+    other.save(changed)
+
+    reloaded = store.get('session-1')
+    assert reloaded is not session
+    assert reloaded.current_question_number == 3 and reloaded.version == 2
+
+
+def test_redis_save_of_stale_copy_conflicts(server):
+    store, other = redis_store(server), redis_store(server)
+    store.save(make_session())
+    copy_a, copy_b = store.get('session-1'), other.get('session-1')
+
+    copy_a.current_question_number = 2
+    store.save(copy_a)
+    copy_b.current_question_number = 5
+    with pytest.raises(SessionConflict):
+        other.save(copy_b)
+    assert redis_store(server).get('session-1').current_question_number == 2
+
+
+def test_redis_stale_save_does_not_resurrect_deleted_session(server):
+    store = redis_store(server)
+    session = make_session()
+    store.save(session)
+    store.delete('session-1')
+    with pytest.raises(SessionConflict):
+        store.save(session)
+    assert store.get('session-1') is None
+
+
+def test_redis_touch_refreshes_ttl_only_after_interval(server):
+    store = redis_store(server)
+    session = make_session()
+    store.save(session)
+    client = store.redis
+    expires = client.expires
+
+    for _ in range(20):
+        store.touch(store.get('session-1'))
+    assert client.expires == expires
+
+    store.touch_interval = 0.05
+    time.sleep(0.06)
+    store.touch(store.get('session-1'))
+    assert client.expires == expires + 1
+    assert 0 < client.ttl(store._key('session-1')) <= store.ttl_seconds
+
+
+def test_request_write_keeps_background_summary_from_other_worker(server):
+    worker_a, worker_b = redis_service(server), redis_service(server)
+    session_id = worker_a.create_session("Python", "Backend Developer")
+    copy_a, copy_b = worker_a.get_session(session_id), worker_b.get_session(session_id)
+
+    # Worker A's rolling summary refresh saves first...
+    copy_a.agents.summary_cache = (0, "Solid fundamentals.")
+    assert worker_a._commit(copy_a, background=True)
+    # ...then worker B saves the next question from its older copy
+    copy_b.current_question_number = 2
+    copy_b.current_question = "How does a hash map handle collisions?"
+    assert worker_b._commit(copy_b)
+
+    stored = redis_service(server).get_session(session_id)
+    assert stored.current_question_number == 2
+    assert stored.agents.summary_cache == (0, "Solid fundamentals.")
+    assert stored.version == 3
+
+
+def test_background_write_of_stale_copy_is_dropped(server):
+    worker_a, worker_b = redis_service(server), redis_service(server)
+    session_id = worker_a.create_session("Python", "Backend Developer")
+    copy_a, copy_b = worker_a.get_session(session_id), worker_b.get_session(session_id)
+
+    copy_b.current_question_number = 2
+    assert worker_b._commit(copy_b)
+    copy_a.prefetched_question, copy_a.prefetched_for = "Stale question", 1
+    assert not worker_a._commit(copy_a, background=True)
+
+    stored = redis_service(server).get_session(session_id)
+    assert stored.current_question_number == 2 and stored.prefetched_question is None
+
+
+def test_request_write_to_deleted_session_fails(server):
+    worker_a, worker_b = redis_service(server), redis_service(server)
+    session_id = worker_a.create_session("Python", "Backend Developer")
+    session = worker_a.get_session(session_id)
+    worker_b.delete_session(session_id)
+
+    with pytest.raises(ValueError, match="Session not found"):
+        worker_a._commit(session)
+
+
+# -------------------- SQLITE -------------------- #
+
+def sqlite_store(path) -> SQLiteSessionStore:
+    # The writer thread never flushes on its own during a test; flush() is called explicitly
+    return SQLiteSessionStore(TIMEOUT, path=str(path), flush_interval=3600, reaper_interval=0)
+
+
+def test_sqlite_store_survives_restart(tmp_path):
+    path = tmp_path / 'sessions.db'
+    store = sqlite_store(path)
+    session = make_session(answers=2)
+    store.save(session)
+    assert store.flush() == 1
+
+    loaded = sqlite_store(path).get('session-1')
+    assert loaded is not None and loaded.version == session.version == 1
+    assert [item.answer for item in loaded.agents.interview_history] == ["Answer 1", "Answer 2"]
+    assert loaded.agents.scored_count == 2
+
+
+def test_sqlite_store_appends_only_new_records(tmp_path):
+    store = sqlite_store(tmp_path / 'sessions.db')
+    session = make_session(answers=2)
+    store.save(session)
+    store.flush()
+    session.agents._record_answer("Question 3", "Answer 3", 3, "Feedback", True, 5, "SCORE: 5/10", True)
+    store.save(session)
+    store.flush()
+
+    assert store.stats()['records_written'] == 3
+    assert len(sqlite_store(tmp_path / 'sessions.db').get('session-1').agents.interview_history) == 3
+
+
+def test_sqlite_touch_updates_only_last_activity(tmp_path):
+    path = tmp_path / 'sessions.db'
+    store = sqlite_store(path)
+    session = make_session(answers=1)
+    store.save(session)
+    store.flush()
+
+    for _ in range(50):
+        store.touch(store.get('session-1'))
+    stats = store.stats()
+    assert stats['pending'] == 0 and stats['touched'] == 1
+
+    store.flush()
+    stats = store.stats()
+    assert stats['sessions_written'] == 1 and stats['touches_written'] == 1
+    loaded = sqlite_store(path).get('session-1')
+    assert loaded.last_activity.timestamp() == pytest.approx(session.last_activity.timestamp())
+
+
+def test_sqlite_store_delete_and_purge(tmp_path):
+    path = tmp_path / 'sessions.db'
+    store = SQLiteSessionStore(timedelta(seconds=60), path=str(path), flush_interval=3600, reaper_interval=0)
+    kept, deleted, expired = make_session('kept'), make_session('deleted'), make_session('expired')
+    expired.last_activity = datetime.now() - timedelta(seconds=120)
+    for session in (kept, deleted, expired):
+        store.save(session)
+    store.flush()
+
+    store.delete('deleted')
+    assert store.get('deleted') is None  # before the delete is flushed too
+    store.reap()
+    store.flush()
+
+    restarted = SQLiteSessionStore(timedelta(seconds=60), path=str(path), flush_interval=3600, reaper_interval=0)
+    assert restarted.get('kept') is not None
+    assert restarted.get('deleted') is None and restarted.get('expired') is None
+
+
+def answer(session, n: int):
+    session.current_question_number = n
+    session.agents._record_answer(f"Question {n}", f"Answer {n}", n, "Feedback", True, 7, "SCORE: 7/10", True)
+
+
+def test_sqlite_workers_sharing_a_file_never_mix_copies(tmp_path):
+    path = tmp_path / 'sessions.db'
+    worker_a, worker_b = sqlite_store(path), sqlite_store(path)
+    worker_a.save(make_session(answers=2))
+    worker_a.flush()
+
+    # Both workers hold the session at the same version and answer question 3 within one flush interval
+    copy_a, copy_b = worker_a.get('session-1'), worker_b.get('session-1')
+    answer(copy_a, 3)
+    worker_a.save(copy_a)
+    answer(copy_b, 3)
+    copy_b.current_question = "B's question"
+    worker_b.save(copy_b)
+    worker_a.flush()
+    worker_b.flush()
+
+    assert worker_b.stats()['conflicts'] == 1
+    stored = sqlite_store(path).get('session-1')
+    # The row and its records are A's, consistently
+    assert stored.current_question != "B's question"
+    assert len(stored.agents.interview_history) == 3
+    assert stored.version == copy_a.version
+    # B dropped its copy and now serves A's
+    reloaded = worker_b.get('session-1')
+    assert reloaded is not copy_b and reloaded.version == copy_a.version
+
+
+def test_sqlite_save_of_copy_changed_by_another_worker_conflicts(tmp_path):
+    path = tmp_path / 'sessions.db'
+    worker_a, worker_b = sqlite_store(path), sqlite_store(path)
+    worker_a.save(make_session(answers=1))
+    worker_a.flush()
+    copy_a, copy_b = worker_a.get('session-1'), worker_b.get('session-1')
+
+    answer(copy_a, 2)
+    worker_a.save(copy_a)
+    worker_a.flush()
+
+    answer(copy_b, 2)
+    with pytest.raises(SessionConflict):
+        worker_b.save(copy_b)
+    reloaded = worker_b.get('session-1')
+    assert reloaded is not copy_b
+    assert reloaded.version == copy_a.version and len(reloaded.agents.interview_history) == 2
+
+
+def test_sqlite_get_sees_deletes_by_another_worker(tmp_path):
+    path = tmp_path / 'sessions.db'
+    worker_a, worker_b = sqlite_store(path), sqlite_store(path)
+    worker_a.save(make_session())
+    worker_a.flush()
+    assert worker_b.get('session-1') is not None
+
+    worker_a.delete('session-1')
+    worker_a.flush()
+    assert worker_b.get('session-1') is None
+
+
+def test_sqlite_service_merges_on_conflict(tmp_path):
+    path = tmp_path / 'sessions.db'
+    worker_a = InterviewService(store=sqlite_store(path), prefetch=False, rolling_summary=False)
+    worker_b = InterviewService(store=sqlite_store(path), prefetch=False, rolling_summary=False)
+    session_id = worker_a.create_session("Python", "Backend Developer")
+    worker_a.store.flush()
+    copy_a, copy_b = worker_a.get_session(session_id), worker_b.get_session(session_id)
+
+    copy_a.agents.summary_cache = (0, "Solid fundamentals.")
+    worker_a._commit(copy_a, background=True)
+    worker_a.store.flush()
+    copy_b.current_question_number = 2
+    assert worker_b._commit(copy_b)
+    worker_b.store.flush()
+
+    stored = sqlite_store(path).get(session_id)
+    assert stored.current_question_number == 2
+    assert stored.agents.summary_cache == (0, "Solid fundamentals.")
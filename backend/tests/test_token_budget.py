@@ -0,0 +1,29 @@
+"""
+Token estimates and budgets
+"""
+import pytest
+
+from agents import InterviewAgents
+from app.services.token_budget import TokenBudgetExceeded, TokenUsage, estimate_tokens
+
+
+def test_system_prompts_count_towards_prompt_estimates():
+    agents = InterviewAgents("Python", "Backend Developer")
+    built = {agent.name for agent in (agents.interviewer, agents.coach, agents.scorer, agents.summarizer)}
+    assert built <= set(agents.system_prompts)
+
+    prompt = "Question: What is a closure?\nAnswer: A function plus its scope."
+    expected = estimate_tokens(agents.system_prompts["Coach"]) + estimate_tokens(prompt)
+    assert agents._estimate_prompt_tokens(agents.coach, prompt) == expected > estimate_tokens(prompt)
+
+
+def test_usage_budget_rejects_calls_past_the_limit():
+    usage = TokenUsage(max_prompt_tokens=100, max_total_tokens=500)
+    usage.check('coach', 90)
+    usage.record('coach', 300, 150)
+    assert usage.total_tokens == 450
+
+    with pytest.raises(TokenBudgetExceeded, match="too long"):
+        usage.check('coach', 101)
+    with pytest.raises(TokenBudgetExceeded, match="token budget"):
+        usage.check('coach', 60)
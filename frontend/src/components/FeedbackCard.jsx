@@ -2,6 +2,7 @@ import './FeedbackCard.css';
 
 function FeedbackCard({ result }) {
   const getScoreColor = (score) => {
+    if (score === null || score === undefined) return 'average';
     if (score >= 8) return 'excellent';
     if (score >= 6) return 'good';
     if (score >= 4) return 'average';
@@ -33,7 +34,7 @@ function FeedbackCard({ result }) {
         <div className="score-box">
           <h3>📊 Score</h3>
           <div className={`score-display ${getScoreColor(result.score)}`}>
-            <div className="score-number">{result.score}</div>
+            <div className="score-number">{result.score ?? 'N/A'}</div>
             <div className="score-label">out of 10</div>
           </div>
           <div className="score-details">
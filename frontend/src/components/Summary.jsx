@@ -52,7 +52,7 @@ function Summary({ summary, technology, position, onReset }) {
           <details key={qa.question_number} className="qa-accordion">
             <summary>
               <span className="qa-title">Question {qa.question_number}</span>
-              <span className="qa-score">Score: {qa.score}/10</span>
+              <span className="qa-score">Score: {qa.score ?? 'N/A'}/10</span>
             </summary>
             <div className="qa-details">
               <div className="qa-section">